@@ -0,0 +1,4 @@
+"""Performance benchmarks for `vizstack-py`.
+
+Run `python -m benchmarks --help` from `bindings/python` for usage.
+"""
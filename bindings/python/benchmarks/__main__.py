@@ -0,0 +1,115 @@
+"""Command-line entry point for the benchmark suite.
+
+Examples::
+
+    python -m benchmarks run --scale small --output before.json
+    python -m benchmarks run --scale small --output after.json
+    python -m benchmarks compare before.json after.json --threshold 0.1
+    python -m benchmarks imports --budget-ms 10
+    python -m benchmarks transport --workers 8
+
+`compare` exits with status 1 if any metric regressed by more than the threshold, and `imports`
+exits with status 1 if `import vizstack` is over budget or eagerly imports a lazily-loaded module.
+"""
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+from benchmarks.cases import SCALES
+from benchmarks.imports import DEFAULT_BUDGET_MS, check_budget, format_import_result, measure_import
+from benchmarks.runner import compare, run
+
+
+def _run(args: argparse.Namespace) -> int:
+    results = run(
+        scale=args.scale,
+        pattern=args.filter,
+        repeat=args.repeat,
+        log=lambda line: print(line, file=sys.stderr),
+    )
+    if args.output is None:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, threshold=args.threshold)
+    for r in regressions:
+        print(
+            'REGRESSION {:<28} {:<18} {:>14.6g} -> {:<14.6g} ({:+.1%})'.format(
+                r.case, r.metric, r.baseline, r.current, r.change
+            )
+        )
+    if not regressions:
+        print('No regressions beyond {:.0%}.'.format(args.threshold))
+    return 1 if regressions else 0
+
+
+def _imports(args: argparse.Namespace) -> int:
+    result = measure_import(repeat=args.repeat)
+    print(format_import_result(result))
+    violations = check_budget(result, budget_ms=args.budget_ms)
+    if 'import_seconds' in violations:
+        print('OVER BUDGET: import took {:.2f} ms, budget is {:.2f} ms.'.format(
+            result['import_seconds'] * 1000, args.budget_ms))
+    if 'eagerly_loaded' in violations:
+        print('OVER BUDGET: import eagerly loaded {}.'.format(', '.join(result['eagerly_loaded'])))
+    return 1 if violations else 0
+
+
+def _transport(args: argparse.Namespace) -> int:
+    # Imported here, since it requires Python 3.8+ and starts worker processes
+    from benchmarks.transport import format_transport_result, measure_transport
+    result = measure_transport(args.workers, args.views, args.items)
+    print(format_transport_result(result))
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+
+    run_parser = subparsers.add_parser('run', help='Run the benchmark cases.')
+    run_parser.add_argument('--scale', choices=SCALES, default='small')
+    run_parser.add_argument('--filter', default=None, help='Only run cases containing this string.')
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--output', '-o', default=None, help='Defaults to stdout.')
+    run_parser.set_defaults(func=_run)
+
+    compare_parser = subparsers.add_parser('compare', help='Flag regressions between two runs.')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.1)
+    compare_parser.set_defaults(func=_compare)
+
+    imports_parser = subparsers.add_parser(
+        'imports', help='Check `import vizstack` against a budget.'
+    )
+    imports_parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS)
+    imports_parser.add_argument('--repeat', type=int, default=5)
+    imports_parser.set_defaults(func=_imports)
+
+    transport_parser = subparsers.add_parser(
+        'transport', help='Compare the shared-memory transport with a multiprocessing.Queue.')
+    transport_parser.add_argument('--workers', type=int, default=8)
+    transport_parser.add_argument('--views', type=int, default=500, help='Views per worker.')
+    transport_parser.add_argument('--items', type=int, default=100, help='List items per View.')
+    transport_parser.set_defaults(func=_transport)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
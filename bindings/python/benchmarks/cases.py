@@ -0,0 +1,153 @@
+"""Benchmark cases, each of which builds an object to be passed to `assemble()`.
+
+Every case is registered with a size for each scale. The "small" scale is fast enough to run on
+every change; "medium" and "large" exercise the sizes seen in production.
+"""
+import functools
+import types
+from typing import Any, Callable, Dict, List, NamedTuple
+
+from vizstack import Dag, Grid, Image, Sequence, Text
+
+__all__ = ['Case', 'SCALES', 'get_cases']
+
+SCALES = ['small', 'medium', 'large']
+
+Case = NamedTuple('Case', [
+    ('name', str),
+    ('build', Callable[[], Any]),
+])
+
+# Maps a case family name to its builder and the size to use at each scale. A size of `None` means
+# the case is skipped at that scale.
+_FAMILIES: Dict[str, Any] = {}
+
+
+def _register(name: str, **sizes: Any) -> Callable[[Callable[[int], Any]], Callable[[int], Any]]:
+
+    def decorator(builder: Callable[[int], Any]) -> Callable[[int], Any]:
+        _FAMILIES[name] = (builder, sizes)
+        return builder
+
+    return decorator
+
+
+# ==================================================================================================
+# Language defaults.
+
+
+@_register('deep_list', small=200, medium=500, large=900)
+def _deep_list(n: int) -> Any:
+    obj: List[Any] = [0]
+    for i in range(n):
+        obj = [i, obj]
+    return obj
+
+
+@_register('wide_list', small=10000, medium=100000, large=1000000)
+def _wide_list(n: int) -> Any:
+    return list(range(n))
+
+
+@_register('deep_dict', small=200, medium=500, large=900)
+def _deep_dict(n: int) -> Any:
+    obj: Dict[str, Any] = {'leaf': 0}
+    for i in range(n):
+        obj = {'depth': i, 'child': obj}
+    return obj
+
+
+@_register('wide_dict', small=5000, medium=50000, large=500000)
+def _wide_dict(n: int) -> Any:
+    return {'key{}'.format(i): i for i in range(n)}
+
+
+class _Record:
+
+    def __init__(self, i: int) -> None:
+        self.index = i
+        self.name = 'record{}'.format(i)
+        self.score = i * 0.5
+        self.active = i % 2 == 0
+        self.tags = ['a', 'b']
+
+
+@_register('object_list', small=500, medium=5000, large=50000)
+def _object_list(n: int) -> Any:
+    return [_Record(i) for i in range(n)]
+
+
+@_register('module', small=50, medium=500, large=5000)
+def _module(n: int) -> Any:
+    # A synthetic module keeps the case stable across Python versions, unlike a stdlib module.
+    module = types.ModuleType('bench_module')
+    for i in range(n):
+        setattr(module, 'CONSTANT{}'.format(i), i)
+        setattr(module, 'func{}'.format(i), _make_function(i))
+        setattr(module, 'Class{}'.format(i), type('Class{}'.format(i), (_Record, ), {}))
+    return module
+
+
+def _make_function(i: int) -> Callable[..., Any]:
+
+    def func(a: Any, b: Any, c: int = i, d: str = 'd') -> Any:
+        return a
+
+    func.__name__ = 'func{}'.format(i)
+    return func
+
+
+# ==================================================================================================
+# Assemblers.
+
+
+@_register('dag', small=1000, medium=10000, large=1000000)
+def _dag(n: int) -> Any:
+    dag = Dag(flow_direction='south')
+    for i in range(n):
+        dag.node(str(i), item=Text(str(i)), parent=None if i < 10 else str(i % 10))
+        if i > 10:
+            dag.edge(str(i - 1), str(i))
+    return dag
+
+
+@_register('grid', small=50, medium=200, large=1000)
+def _grid(n: int) -> Any:
+    # An `n`x`n` grid with one named cell per position.
+    grid = Grid(cells=[{
+        'name': '{}_{}'.format(r, c),
+        'row': r,
+        'col': c,
+        'width': 1,
+        'height': 1,
+    } for r in range(n) for c in range(n)])
+    for r in range(n):
+        for c in range(n):
+            grid.item('{}_{}'.format(r, c), Text('{},{}'.format(r, c)))
+    return grid
+
+
+@_register('images', small=100, medium=1000, large=5000)
+def _images(n: int) -> Any:
+    # Each image is a distinct ~48KB base64 payload.
+    return Sequence([Image(('{:08d}'.format(i) * 6000)) for i in range(n)])
+
+
+def get_cases(scale: str) -> List[Case]:
+    """Returns the benchmark cases to run at a given scale.
+
+    Args:
+        scale: One of `SCALES`.
+
+    Returns:
+        A `list` of `Case`s, named like "wide_list[10000]".
+    """
+    if scale not in SCALES:
+        raise ValueError('Unknown scale "{}"; expected one of {}.'.format(scale, SCALES))
+    cases = []
+    for name, (builder, sizes) in _FAMILIES.items():
+        size = sizes.get(scale)
+        if size is None:
+            continue
+        cases.append(Case('{}[{}]'.format(name, size), functools.partial(builder, size)))
+    return cases
@@ -0,0 +1,93 @@
+"""Import-time benchmark for `import vizstack`.
+
+Each measurement runs in a fresh interpreter, since a module is only really imported once per
+process. Besides the time taken, the measurement records which of the modules that `vizstack` is
+meant to load lazily were imported anyway.
+"""
+import ast
+import os
+import subprocess
+import sys
+from typing import Any, Dict
+
+import vizstack
+
+__all__ = ['DEFAULT_BUDGET_MS', 'LAZY_MODULES', 'measure_import', 'check_budget']
+
+# The budget for `import vizstack`, beyond the cost of starting the interpreter.
+DEFAULT_BUDGET_MS = 10.0
+
+# Modules which `import vizstack` must not import; they are loaded on first use instead.
+LAZY_MODULES = [
+    'base64',
+    'hashlib',
+    'inspect',
+    'json',
+    'mypy_extensions',
+    'typing_extensions',
+    'vizstack.assemblers',
+    'vizstack.lang',
+    'vizstack.view_assembler',
+]
+
+_SNIPPET = '''
+import sys, time
+start = time.perf_counter()
+import vizstack
+elapsed = time.perf_counter() - start
+loaded = [name for name in {lazy!r} if name in sys.modules]
+print(repr((elapsed, loaded)))
+'''
+
+
+def measure_import(repeat: int = 5) -> Dict[str, Any]:
+    """Returns the time taken by `import vizstack` and the lazily-loaded modules it imported.
+
+    Args:
+        repeat: The number of fresh interpreters to measure in; the fastest import is reported.
+
+    Returns:
+        A `dict` with "import_seconds" and "eagerly_loaded" keys.
+    """
+    env = dict(os.environ)
+    # Import the same `vizstack` as this process, even if it is not installed.
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(vizstack.__file__)))
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [package_root, env.get('PYTHONPATH')]))
+    snippet = _SNIPPET.format(lazy=LAZY_MODULES)
+
+    best = float('inf')
+    loaded = []
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, '-c', snippet], env=env)
+        elapsed, loaded = ast.literal_eval(output.decode())
+        best = min(best, elapsed)
+    return {'import_seconds': best, 'eagerly_loaded': loaded}
+
+
+def check_budget(result: Dict[str, Any], budget_ms: float = DEFAULT_BUDGET_MS) -> Dict[str, Any]:
+    """Returns a `dict` of the ways in which an import measurement violates the budget.
+
+    Args:
+        result: A `dict` returned by `measure_import()`.
+        budget_ms: The maximum allowed import time, in milliseconds.
+
+    Returns:
+        An empty `dict` if the import is within budget; otherwise, a `dict` with an "import_seconds"
+        key if the import was too slow and an "eagerly_loaded" key if lazy modules were imported.
+    """
+    violations: Dict[str, Any] = {}
+    if result['import_seconds'] * 1000 > budget_ms:
+        violations['import_seconds'] = result['import_seconds']
+    if result['eagerly_loaded']:
+        violations['eagerly_loaded'] = result['eagerly_loaded']
+    return violations
+
+
+def format_import_result(result: Dict[str, Any]) -> str:
+    """Returns a one-line human-readable summary of an import measurement."""
+    return '{:<28} {:>9.2f} ms{}'.format(
+        'import vizstack',
+        result['import_seconds'] * 1000,
+        '  (eagerly loaded: {})'.format(', '.join(result['eagerly_loaded']))
+        if result['eagerly_loaded'] else '',
+    )
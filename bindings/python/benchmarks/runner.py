@@ -0,0 +1,186 @@
+"""Measurement and comparison of benchmark runs.
+
+A run is recorded as a JSON document of the form::
+
+    {
+        "version": 1,
+        "environment": {"python": "3.7.3", "platform": "...", "scale": "small"},
+        "results": {
+            "wide_list[10000]": {
+                "fragments": 10001,
+                "seconds": 0.021,
+                "fragments_per_sec": 476238.1,
+                "peak_bytes": 5123456,
+                "serialized_bytes": 389012
+            },
+            "import[vizstack]": {"import_seconds": 0.003, "eagerly_loaded": []},
+            ...
+        }
+    }
+
+`compare()` takes two such documents and reports every metric that got worse by more than a
+threshold.
+"""
+import gc
+import json
+import platform
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from vizstack import assemble
+
+from benchmarks.cases import Case, get_cases
+from benchmarks.imports import format_import_result, measure_import
+
+__all__ = ['FORMAT_VERSION', 'measure', 'run', 'compare', 'Regression']
+
+FORMAT_VERSION = 1
+
+# For each metric, whether a larger value is better. Metrics not listed here are informational.
+_METRIC_HIGHER_IS_BETTER = {
+    'fragments_per_sec': True,
+    'peak_bytes': False,
+    'serialized_bytes': False,
+    'import_seconds': False,
+}
+
+# The name under which the import-time measurement is recorded in the results.
+_IMPORT_CASE = 'import[vizstack]'
+
+Regression = NamedTuple('Regression', [
+    ('case', str),
+    ('metric', str),
+    ('baseline', float),
+    ('current', float),
+    ('change', float),
+])
+
+
+def measure(case: Case, repeat: int = 3) -> Dict[str, Any]:
+    """Returns the metrics of a single benchmark case.
+
+    Timing and memory are measured in separate runs, since `tracemalloc` slows down allocation-heavy
+    code by several times.
+
+    Args:
+        case: The `Case` to measure.
+        repeat: The number of timed runs; the fastest is reported.
+
+    Returns:
+        A `dict` of metric names to values.
+    """
+    obj = case.build()
+
+    best = float('inf')
+    view: Optional[Dict[str, Any]] = None
+    for _ in range(repeat):
+        view = None
+        gc.collect()
+        start = time.perf_counter()
+        view = assemble(obj)
+        best = min(best, time.perf_counter() - start)
+    assert view is not None
+    num_fragments = len(view['fragments'])
+    serialized_bytes = len(json.dumps(view).encode())
+    del view
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        assemble(obj)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'fragments': num_fragments,
+        'seconds': best,
+        'fragments_per_sec': num_fragments / best if best > 0 else float('inf'),
+        'peak_bytes': peak_bytes,
+        'serialized_bytes': serialized_bytes,
+    }
+
+
+def run(
+        scale: str = 'small',
+        pattern: Optional[str] = None,
+        repeat: int = 3,
+        log: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """Runs all benchmark cases at the given scale and returns the machine-readable results.
+
+    Args:
+        scale: The size of the benchmark cases; see `benchmarks.cases.SCALES`.
+        pattern: If given, only cases whose name contains this substring are run.
+        repeat: The number of timed runs per case.
+        log: An optional function called with a human-readable line after each case.
+
+    Returns:
+        A results document, as described in the module docstring.
+    """
+    results: Dict[str, Any] = {}
+    if pattern is None or pattern in _IMPORT_CASE:
+        results[_IMPORT_CASE] = measure_import(repeat=max(repeat, 5))
+        if log is not None:
+            log(format_import_result(results[_IMPORT_CASE]))
+    for case in get_cases(scale):
+        if pattern is not None and pattern not in case.name:
+            continue
+        results[case.name] = measure(case, repeat=repeat)
+        if log is not None:
+            log(format_result(case.name, results[case.name]))
+    return {
+        'version': FORMAT_VERSION,
+        'environment': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'scale': scale,
+        },
+        'results': results,
+    }
+
+
+def format_result(name: str, result: Dict[str, Any]) -> str:
+    """Returns a one-line human-readable summary of a case's metrics."""
+    return '{:<28} {:>9} frags {:>12,.0f} frags/s {:>10.1f} MiB peak {:>10.1f} KiB json'.format(
+        name,
+        result['fragments'],
+        result['fragments_per_sec'],
+        result['peak_bytes'] / 2**20,
+        result['serialized_bytes'] / 2**10,
+    )
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any],
+            threshold: float = 0.1) -> List[Regression]:
+    """Returns the metrics which regressed between two runs.
+
+    Only cases present in both runs are compared.
+
+    Args:
+        baseline: A results document from an earlier run.
+        current: A results document from a later run.
+        threshold: The relative change, as a fraction of the baseline value, beyond which a metric
+            is considered to have regressed.
+
+    Returns:
+        A `list` of `Regression`s, ordered by case name.
+    """
+    for doc in (baseline, current):
+        if doc.get('version') != FORMAT_VERSION:
+            raise ValueError('Unsupported results version: {}'.format(doc.get('version')))
+
+    regressions = []
+    for name in sorted(set(baseline['results']) & set(current['results'])):
+        for metric, higher_is_better in _METRIC_HIGHER_IS_BETTER.items():
+            old = baseline['results'][name].get(metric)
+            new = current['results'][name].get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (higher_is_better and change < -threshold) or (
+                    not higher_is_better and change > threshold):
+                regressions.append(Regression(name, metric, old, new, change))
+    return regressions
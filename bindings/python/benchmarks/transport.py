@@ -0,0 +1,116 @@
+"""Multi-worker throughput benchmark for `vizstack.transport`.
+
+Each of `num_workers` processes sends the same `View` `views_per_worker` times, either through its
+`RingBuffer` or through a shared `multiprocessing.Queue`, and the parent receives every `View`. The
+throughput is the number of `View`s received per second, from the start of the workers until the
+last `View` arrives. `View`s are assembled once, up front, so that only the transport is measured.
+"""
+import multiprocessing
+import time
+from typing import Any, Callable, Dict, cast
+
+from vizstack.schema import View
+from vizstack.transport import ViewCollector, ViewPublisher
+from vizstack.view_assembler import ViewAssembler
+
+__all__ = ['measure_transport', 'format_transport_result']
+
+
+def _make_view(num_items: int) -> Dict[str, Any]:
+    obj = {'step': 0, 'values': list(range(num_items)), 'name': 'batch'}
+    return cast(Dict[str, Any], ViewAssembler.assemble(obj))
+
+
+def _publish_ring(ring_name: str, count: int, num_items: int) -> None:
+    view = _make_view(num_items)
+    publisher = ViewPublisher(ring_name)
+    for _ in range(count):
+        publisher.publish_view(cast(View, view))
+    publisher.close()
+
+
+def _publish_queue(queue: Any, index: int, count: int, num_items: int) -> None:
+    view = _make_view(num_items)
+    for _ in range(count):
+        queue.put((index, view))
+
+
+def _time(start_workers: Callable[[], Any], receive: Callable[[], int], expected: int) -> float:
+    start = time.perf_counter()
+    processes = start_workers()
+    received = receive()
+    elapsed = time.perf_counter() - start
+    for process in processes:
+        process.join()
+    if received != expected:
+        raise RuntimeError('Received {} of {} Views.'.format(received, expected))
+    return elapsed
+
+
+def measure_transport(
+    num_workers: int = 8, views_per_worker: int = 500, num_items: int = 100
+) -> Dict[str, Any]:
+    """Returns the throughput of the ring buffer transport and of a `multiprocessing.Queue`.
+
+    Args:
+        num_workers: The number of worker processes.
+        views_per_worker: The number of `View`s each worker sends.
+        num_items: The number of list items in each `View`'s object, which has `num_items + 5`
+            `Fragment`s.
+
+    Returns:
+        {"views": <total>, "ring_views_per_sec": <float>, "queue_views_per_sec": <float>}.
+    """
+    expected = num_workers * views_per_worker
+
+    with ViewCollector(num_workers=num_workers, remap_ids=False) as collector:
+
+        def start_ring_workers() -> Any:
+            processes = [
+                multiprocessing.Process(
+                    target=_publish_ring, args=(name, views_per_worker, num_items)
+                ) for name in collector.ring_names
+            ]
+            for process in processes:
+                process.start()
+            return processes
+
+        def receive_ring() -> int:
+            received = 0
+            for _ in collector.iter_views(timeout=5.0):
+                received += 1
+                if received == expected:
+                    break
+            return received
+
+        ring_seconds = _time(start_ring_workers, receive_ring, expected)
+
+    queue: Any = multiprocessing.Queue()
+
+    def start_queue_workers() -> Any:
+        processes = [
+            multiprocessing.Process(
+                target=_publish_queue, args=(queue, i, views_per_worker, num_items)
+            ) for i in range(num_workers)
+        ]
+        for process in processes:
+            process.start()
+        return processes
+
+    def receive_queue() -> int:
+        for _ in range(expected):
+            queue.get(timeout=5.0)
+        return expected
+
+    queue_seconds = _time(start_queue_workers, receive_queue, expected)
+    return {
+        'views': expected,
+        'ring_views_per_sec': expected / ring_seconds,
+        'queue_views_per_sec': expected / queue_seconds,
+    }
+
+
+def format_transport_result(result: Dict[str, Any]) -> str:
+    return '{} Views: ring buffers {:,.0f}/s, multiprocessing.Queue {:,.0f}/s ({:.1f}x)'.format(
+        result['views'], result['ring_views_per_sec'], result['queue_views_per_sec'],
+        result['ring_views_per_sec'] / result['queue_views_per_sec'])
@@ -0,0 +1,2 @@
+source venv/bin/activate
+python -m benchmarks "$@"
\ No newline at end of file
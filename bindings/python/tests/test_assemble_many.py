@@ -0,0 +1,95 @@
+import threading
+import time
+
+from vizstack import *
+
+
+class _Record:
+    def __init__(self, i):
+        self.i = i
+        self.name = 'record{}'.format(i)
+        self.tags = ['a', 'b', i]
+
+
+class _GridView:
+    def __init__(self, i):
+        self.i = i
+
+    def __view__(self):
+        return Grid('AB|CC', items={'A': self.i, 'B': [self.i], 'C': {'i': self.i}})
+
+
+class _SlowView:
+    def __init__(self, i):
+        self.i = i
+
+    def __view__(self):
+        # Stands in for a `__view__()` which releases the GIL, e.g. to wait on I/O
+        time.sleep(0.02)
+        return Text(str(self.i))
+
+
+def _function(a, b=1, *, c=None):
+    pass
+
+
+def _make_objects(n):
+    objs = []
+    for i in range(n):
+        kind = i % 6
+        if kind == 0:
+            objs.append([i, str(i), {'k': i}])
+        elif kind == 1:
+            objs.append(_Record(i))
+        elif kind == 2:
+            objs.append(_GridView(i))
+        elif kind == 3:
+            objs.append({'fn': _function, 'values': (i, i + 1), 'set': {i}})
+        elif kind == 4:
+            objs.append([_Record(i), _Record(i + 1)])
+        else:
+            objs.append(Sequence([i, Text('x'), KeyValue({'y': i})]))
+    return objs
+
+
+def test_assemble_many_should_return_views_in_input_order():
+    objs = _make_objects(60)
+    assert assemble_many(objs, max_workers=4) == [assemble(obj) for obj in objs]
+
+
+def test_assemble_many_should_be_correct_under_contention():
+    objs = _make_objects(300)
+    expected = [assemble(obj) for obj in objs]
+    results = [None] * 8
+    barrier = threading.Barrier(len(results))
+
+    def run(index):
+        barrier.wait()
+        results[index] = assemble_many(objs, max_workers=8)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(results))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(result == expected for result in results)
+
+
+def test_assemble_many_should_reuse_given_executor():
+    from concurrent.futures import ThreadPoolExecutor
+    objs = _make_objects(12)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        assert assemble_many(objs, executor=executor) == [assemble(obj) for obj in objs]
+        assert assemble_many([], executor=executor) == []
+
+
+def test_assemble_many_should_be_faster_when_views_release_gil():
+    objs = [_SlowView(i) for i in range(16)]
+    start = time.perf_counter()
+    serial = [assemble(obj) for obj in objs]
+    serial_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    parallel = assemble_many(objs, max_workers=8)
+    parallel_seconds = time.perf_counter() - start
+    assert parallel == serial
+    assert parallel_seconds < serial_seconds / 2
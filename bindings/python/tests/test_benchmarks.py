@@ -0,0 +1,52 @@
+from benchmarks.cases import get_cases
+from benchmarks.imports import check_budget, measure_import
+from benchmarks.runner import FORMAT_VERSION, compare, measure
+
+
+def _results(**metrics):
+    return {'version': FORMAT_VERSION, 'environment': {}, 'results': {'case': metrics}}
+
+
+def test_measure_should_report_all_metrics():
+    case = next(case for case in get_cases('small') if case.name.startswith('wide_list'))
+    result = measure(case, repeat=1)
+    assert result['fragments'] == 10001
+    assert result['fragments_per_sec'] > 0
+    assert result['peak_bytes'] > 0
+    assert result['serialized_bytes'] > 0
+
+
+def test_compare_should_flag_only_changes_beyond_threshold():
+    baseline = _results(fragments_per_sec=1000, peak_bytes=100, serialized_bytes=100)
+    current = _results(fragments_per_sec=800, peak_bytes=105, serialized_bytes=150)
+    regressions = compare(baseline, current, threshold=0.1)
+    assert [r.metric for r in regressions] == ['fragments_per_sec', 'serialized_bytes']
+
+
+def test_compare_should_ignore_improvements():
+    baseline = _results(fragments_per_sec=1000, peak_bytes=100, serialized_bytes=100)
+    current = _results(fragments_per_sec=2000, peak_bytes=50, serialized_bytes=50)
+    assert compare(baseline, current) == []
+
+
+def test_import_should_not_eagerly_load_lazy_modules():
+    result = measure_import(repeat=1)
+    assert result['eagerly_loaded'] == []
+    assert check_budget(result, budget_ms=float('inf')) == {}
+
+
+def test_lazy_attributes_should_resolve_every_public_name():
+    import vizstack
+    for name in vizstack._ATTRIBUTES:
+        assert getattr(vizstack, name) is not None
+        assert name in dir(vizstack)
+    # The tools are attributes only, so that `from vizstack import *` does not shadow generic names
+    assert set(vizstack.__all__) <= set(vizstack._ATTRIBUTES)
+    assert 'log' not in vizstack.__all__ and 'FragmentServer' not in vizstack.__all__
+
+
+def test_measure_transport_should_receive_every_view():
+    from benchmarks.transport import measure_transport
+    result = measure_transport(num_workers=2, views_per_worker=20, num_items=5)
+    assert result['views'] == 40
+    assert result['ring_views_per_sec'] > 0 and result['queue_views_per_sec'] > 0
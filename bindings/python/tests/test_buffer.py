@@ -0,0 +1,59 @@
+from array import array
+
+import pytest
+
+from vizstack import *
+from vizstack.validation import validate
+
+
+def _contents(obj):
+    view = assemble(obj)
+    assert validate(view) == []
+    return view['fragments']['root']['contents']
+
+
+def test_short_bytes_should_be_shown_in_full():
+    contents = _contents(b'\x00\x01ab')
+    assert contents['length'] == 4 and contents['format'] == 'B'
+    assert contents['head'] == {'start': 0, 'end': 4, 'hex': '00016162'}
+    assert 'tail' not in contents
+
+
+def test_long_buffer_should_show_head_and_tail():
+    data = bytearray(range(256)) * 4096
+    contents = _contents(Buffer(data, window=4))
+    assert contents['head']['hex'] == '00010203'
+    assert contents['tail'] == {'start': len(data) - 4, 'end': len(data), 'hex': 'fcfdfeff'}
+    # No `memoryview` is held, so the `bytearray` can still be resized
+    data.extend(b'\x00')
+
+
+def test_typed_array_should_show_values():
+    contents = _contents(array('d', [1.5, float('nan'), 3.0]))
+    assert contents['itemSize'] == 8 and contents['format'] == 'd'
+    assert contents['head']['values'] == [1.5, 'nan', 3.0]
+
+
+def test_buffer_should_expand_windows():
+    buffer = Buffer(array('i', range(10000)), window=16)
+    window = buffer.expand({'start': '4001', 'end': '4010'})
+    assert (window['start'], window['end'], window['values']) == (4000, 4008, [1000, 1001])
+    with pytest.raises(ValueError):
+        buffer.expand({'start': 10})
+
+
+def test_memoryview_should_use_buffer_by_default():
+    contents = _contents(memoryview(b'abcdef')[::2])
+    assert contents['head']['hex'] == '616365'
+
+
+def test_non_contiguous_buffer_should_expand_windows():
+    data = memoryview(array('i', range(30000)))[::3]
+    window = Buffer(data).expand({'start': 4000, 'end': 4012})
+    assert window['values'] == [3000, 3003, 3006]
+
+    np = pytest.importorskip('numpy')
+    matrix = np.arange(60000, dtype='int32').reshape(300, 200)[:, ::2]
+    buffer = Buffer(matrix, window=8)
+    assert buffer.expand({'start': 396, 'end': 408})['values'] == [198, 200, 202]
+    assert buffer.assemble(None)[0]['contents']['tail']['values'] == [59996, 59998]
@@ -0,0 +1,105 @@
+import io
+import json
+
+from vizstack import *
+from vizstack.__main__ import main
+from vizstack import viewfile
+from vizstack.validation import validate
+from vizstack.viewfile import ViewFileWriter, compute_stats, get_subtree_ids, iter_view_items
+
+
+def _write_view(tmp_path, view, name='view.json'):
+    path = tmp_path / name
+    path.write_text(json.dumps(view, indent=2))
+    return str(path)
+
+
+def _read_view(fp, fmt='json'):
+    view = {'fragments': {}}
+    for kind, key, value, _ in iter_view_items(fp, fmt):
+        if kind == 'fragment':
+            view['fragments'][key] = value
+        else:
+            view[key] = value
+    return view
+
+
+def test_iter_view_items_should_read_fragments_across_chunks(monkeypatch):
+    monkeypatch.setattr(viewfile, '_CHUNK_SIZE', 7)
+    view = assemble({'a': [1, 2.5, 'three'], 'b': {'c': None}})
+    assert _read_view(io.StringIO(json.dumps(view, indent=2))) == view
+
+
+def test_convert_should_round_trip_between_formats(tmp_path):
+    view = assemble([1, [2, 3], {'x': 'y'}])
+    source = _write_view(tmp_path, view)
+    assert main(['convert', source, str(tmp_path / 'view.ndjson')]) == 0
+    assert main(['convert', str(tmp_path / 'view.ndjson'), str(tmp_path / 'back.json')]) == 0
+    with open(str(tmp_path / 'back.json')) as f:
+        assert json.load(f) == view
+    with open(str(tmp_path / 'view.ndjson')) as f:
+        assert len(f.readlines()) == len(view['fragments']) + 1
+
+
+def test_convert_to_compact_should_shorten_ids(tmp_path):
+    view = assemble({'key': [1, 2]})
+    source = _write_view(tmp_path, view)
+    target = str(tmp_path / 'compact.json')
+    assert main(['convert', source, target, '--to', 'compact']) == 0
+    with open(target) as f:
+        text = f.read()
+    compact = json.loads(text)
+    assert validate(compact) == []
+    assert len(compact['fragments']) == len(view['fragments'])
+    assert all(len(frag_id) == 1 for frag_id in compact['fragments'])
+    assert ' ' not in text.replace('" "', '')
+
+
+def test_writer_should_allow_header_after_fragments():
+    out = io.StringIO()
+    writer = ViewFileWriter(out)
+    writer.write_fragment('a', {'type': 'TextPrimitive', 'contents': {'text': 'a'}, 'meta': {}})
+    writer.write_header('rootId', 'a')
+    writer.close()
+    assert validate(json.loads(out.getvalue())) == []
+
+
+def test_stats_should_count_types_depths_and_subtrees():
+    view = assemble([[1, 2], 3])
+    stats = compute_stats(iter_view_items(io.StringIO(json.dumps(view))), top=2)
+    assert stats['numFragments'] == 5
+    assert stats['types']['SequenceLayout']['count'] == 2
+    assert stats['depths'] == {0: 1, 1: 2, 2: 2}
+    assert stats['unreachable'] == 0
+    assert stats['largestSubtrees'][0]['id'] == 'root'
+    assert stats['largestSubtrees'][0]['fragments'] == 5
+    assert stats['largestSubtrees'][0]['bytes'] == stats['bytes']
+    assert stats['largestSubtrees'][1]['fragments'] == 3
+
+
+def test_stats_command_should_print_json(tmp_path, capsys):
+    source = _write_view(tmp_path, assemble(['a', 'b']))
+    assert main(['stats', source, '--json']) == 0
+    assert json.loads(capsys.readouterr().out)['numFragments'] == 3
+
+
+def test_extract_should_write_only_the_subtree(tmp_path):
+    view = assemble({'inner': [1, 2], 'other': 'x'})
+    source = _write_view(tmp_path, view)
+    inner_id = next(frag_id for frag_id, fragment in view['fragments'].items()
+                    if fragment['type'] == 'SequenceLayout')
+    target = str(tmp_path / 'inner.ndjson')
+    assert main(['extract', source, inner_id, '-o', target]) == 0
+    with open(target) as f:
+        extracted = _read_view(f, 'ndjson')
+    assert extracted['rootId'] == inner_id
+    subtree_ids = get_subtree_ids(iter_view_items(io.StringIO(json.dumps(view))), inner_id)
+    assert set(extracted['fragments']) == subtree_ids
+    assert len(extracted['fragments']) == 3
+    assert validate(extracted) == []
+
+
+def test_extract_should_fail_for_unknown_id(tmp_path, capsys):
+    source = _write_view(tmp_path, assemble([1]))
+    assert main(['extract', source, 'missing']) == 1
+    assert 'missing' in capsys.readouterr().err
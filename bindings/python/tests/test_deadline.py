@@ -0,0 +1,85 @@
+import time
+
+from vizstack import *
+from vizstack.instrument import AssemblyHook
+
+
+def _nested(depth):
+    obj = ['leaf']
+    for i in range(depth):
+        obj = [i, obj]
+    return obj
+
+
+def test_passed_deadline_should_return_valid_view_of_stub_root():
+    view = assemble(_nested(3), deadline=time.monotonic() - 1)
+    assert view['rootId'] == 'root'
+    assert list(view['fragments']) == ['root']
+    assert is_stub(view['fragments']['root'])
+
+
+def test_interrupted_view_should_reference_only_existing_fragments():
+    now = [0.0]
+
+    class SlowView:
+
+        def __view__(self):
+            now[0] += 1
+            return Sequence([SlowView(), SlowView()])
+
+    # Each `__view__()` advances the clock by one, so three objects fit before the deadline
+    view = Assembly(SlowView(), breadth_first=True, clock=lambda: now[0]).run(deadline=2.5)
+    fragments = view['fragments']
+    assert not is_stub(fragments['root'])
+    assert sum(1 for frag in fragments.values() if not is_stub(frag)) == 3
+    assert sum(1 for frag in fragments.values() if is_stub(frag)) == 4
+    for frag in fragments.values():
+        for child_id in frag['contents'].get('elements', []):
+            assert child_id in fragments
+
+
+def test_stubs_should_record_pending_ids_for_resuming():
+    obj = _nested(5)
+    view, assembly = assemble_partial(obj, deadline=time.monotonic() - 1)
+    assert not assembly.done
+    assert view['fragments']['root']['meta']['pendingId'] == 'root'
+
+    full = assembly.run()
+    assert full == assemble(obj)
+    for frag_id, frag in view['fragments'].items():
+        assert frag['meta']['pendingId'] == frag_id
+
+
+def test_assembly_should_assemble_shallowest_first_and_resume_to_full_view():
+    obj = _nested(5)
+    assembly = Assembly(obj)
+    partial = assembly.run(deadline=time.monotonic() - 1)
+    assert not assembly.done
+    assert is_stub(partial['fragments']['root'])
+
+    full = assembly.run()
+    assert assembly.done
+    assert not any(is_stub(frag) for frag in full['fragments'].values())
+    assert full == assemble(obj)
+
+
+def test_assembly_should_visit_objects_in_order_of_depth():
+    depths = []
+
+    class Recorder(AssemblyHook):
+
+        def post_fragment(self, event):
+            depths.append(event.depth)
+
+    Assembly([[[1], 2], [3, [4, [5]]], 6], hooks=[Recorder()]).run()
+    assert depths == sorted(depths)
+
+
+def test_returned_view_should_not_change_with_later_assembly():
+    switch = Switch(lazy=True).mode('a', 'first').mode('b', ['x'])
+    assembly = Assembly(switch)
+    view = assembly.run()
+    fragments = dict(view['fragments'])
+    assembly.resolve(view['fragments']['root']['contents']['modes'][1])
+    assembly.assemble_fragment('root')
+    assert view['fragments'] == fragments
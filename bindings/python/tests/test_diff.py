@@ -0,0 +1,81 @@
+import copy
+
+from vizstack import *
+from vizstack.diffing import diff_view
+from vizstack.validation import validate
+
+
+def _tokens(view):
+    return {(f['contents']['text'], f['contents']['color'])
+            for f in view['fragments'].values() if f['type'] == 'TokenPrimitive'}
+
+
+def _texts(view):
+    return [f['contents']['text'] for f in view['fragments'].values()
+            if f['type'] == 'TextPrimitive']
+
+
+def test_diff_view_should_report_no_differences():
+    obj = {'a': [1, 2, {'b': 3}]}
+    view = diff_view(obj, copy.deepcopy(obj))
+    assert _texts(view) == ['No differences']
+
+
+def test_diff_view_should_mark_added_removed_and_changed_keys():
+    old = {'same': 1, 'changed': 'x', 'removed': 2}
+    new = {'same': 1, 'changed': 'y', 'added': 3}
+    view = diff_view(old, new)
+    assert validate(view) == []
+    tokens = _tokens(view)
+    assert ("'changed'", 'yellow') in tokens
+    assert ("'removed'", 'red') in tokens
+    assert ("'added'", 'green') in tokens
+    assert ("'x'", 'red') in tokens and ("'y'", 'green') in tokens
+    assert '1 unchanged' in _texts(view)
+
+
+def test_diff_view_should_collapse_unchanged_entries_of_large_dicts():
+    old = {i: {'value': i} for i in range(100000)}
+    new = copy.copy(old)
+    new[50000] = {'value': -1}
+    view = diff_view(old, new)
+    assert validate(view) == []
+    assert {'50000 unchanged', '49999 unchanged'} <= set(_texts(view))
+    assert len(view['fragments']) < 20
+
+
+def test_diff_view_should_align_insertions_in_lists():
+    old = list(range(1000))
+    new = old[:500] + ['inserted'] + old[500:]
+    view = diff_view(old, new)
+    assert ('500', 'green') in _tokens(view)
+    assert not any(color == 'yellow' for _, color in _tokens(view))
+    assert '500 unchanged' in _texts(view)
+
+
+def test_diff_view_should_diff_sets_and_type_changes():
+    view = diff_view({'s': {1, 2, 3}, 't': 1}, {'s': {2, 3, 4}, 't': 'one'})
+    tokens = _tokens(view)
+    assert ('1', 'red') in tokens and ('4', 'green') in tokens
+    assert ("'one'", 'green') in tokens
+
+
+def test_diff_view_should_limit_changes():
+    old = {i: i for i in range(100)}
+    new = {i: -i - 1 for i in range(100)}
+    view = diff_view(old, new, max_changes=5)
+    assert validate(view) == []
+    assert ('95 more differences not shown', 'gray') in _tokens(view)
+    assert sum(1 for _, color in _tokens(view) if color == 'yellow') == 5
+
+
+def test_diff_view_should_distinguish_values_of_different_types():
+    assert ('True', 'green') in _tokens(diff_view(1, True))
+    assert ('1.0', 'green') in _tokens(diff_view({'a': 1, 'b': 2}, {'a': 1.0, 'b': 3}))
+    view = diff_view([[1, 2, 'x']], [[1, 2.0, 'y']])
+    assert ('1', 'yellow') in _tokens(view) and ('2.0', 'green') in _tokens(view)
+    # Containers which compare equal are only walked with `strict_types`
+    assert _texts(diff_view({'a': [1, 2]}, {'a': [1, 2.0]})) == ['No differences']
+    assert ('2.0', 'green') in _tokens(diff_view({'a': [1, 2]}, {'a': [1, 2.0]}, strict_types=True))
+    same = diff_view({'a': [1, 2.0]}, {'a': [1, 2.0]}, strict_types=True)
+    assert _texts(same) == ['No differences']
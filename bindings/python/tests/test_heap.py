@@ -0,0 +1,39 @@
+from vizstack import *
+from vizstack.heap import summarize, view as heap_view
+from vizstack.validation import validate
+
+
+class _Node:
+    def __init__(self, children=()):
+        self.children = list(children)
+
+
+def test_summarize_should_aggregate_referents_by_type():
+    root = _Node([_Node() for _ in range(10)])
+    summary = summarize(root)
+    assert summary.types[_Node][0] == 11
+    assert not summary.truncated
+    assert summary.retention[(list, _Node)] == 10
+
+
+def test_summarize_should_stop_at_max_objects():
+    summary = summarize([[i] for i in range(1000)], max_objects=100)
+    assert summary.truncated and summary.num_objects == 100
+
+
+def test_summarize_should_find_referrers():
+    leaked = _Node()
+    holder = {'cache': [leaked]}
+    summary = summarize(leaked, max_objects=50, direction='referrers')
+    assert summary.retention[(list, _Node)] == 1
+    assert summary.retention[(dict, list)] >= 1
+    del holder
+
+
+def test_heap_view_should_summarize_instead_of_emitting_one_fragment_per_object():
+    root = [_Node([_Node() for _ in range(100)]) for _ in range(100)]
+    view = assemble(heap_view(root))
+    assert validate(view) == []
+    assert len(view['fragments']) < 100
+    all_view = assemble(heap_view(max_objects=10000))
+    assert validate(all_view) == []
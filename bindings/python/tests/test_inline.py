@@ -0,0 +1,65 @@
+from vizstack import *
+from vizstack.traversal import expand_inline_fragments, get_child_ids
+
+
+class _Custom:
+    def __view__(self):
+        return Text('custom')
+
+
+def test_inline_primitives_should_embed_dict_keys_and_values():
+    config = {'key{}'.format(i): i for i in range(100)}
+    view = assemble(config, inline_primitives=True)
+    assert len(view['fragments']) == 1
+    entries = view['fragments']['root']['contents']['entries']
+    assert entries[0] == {
+        'key': {'type': 'TextPrimitive', 'contents': {'text': '"key0"'}, 'meta': {}},
+        'value': {'type': 'TextPrimitive', 'contents': {'text': '0'}, 'meta': {}},
+    }
+    assert len(assemble(config)['fragments']) == 201
+
+
+def test_inline_primitives_should_keep_references_to_other_objects():
+    long_text = 'x' * 1000
+    obj = [1, long_text, _Custom(), [2], Token('t', color='red')]
+    view = assemble(obj, inline_primitives=True)
+    elements = view['fragments']['root']['contents']['elements']
+    assert elements[0]['contents']['text'] == '1'
+    assert all(isinstance(element, str) for element in elements[1:4])
+    assert elements[4] == {
+        'type': 'TokenPrimitive', 'contents': {'text': 't', 'color': 'red'}, 'meta': {}
+    }
+    assert set(get_child_ids(view['fragments']['root'])) <= set(view['fragments'])
+    assert len(view['fragments']) == 4
+
+
+def test_inline_primitives_should_embed_grid_and_dag_items():
+    grid = Grid('AB', items={'A': 'a', 'B': ['b']})
+    view = assemble(grid, inline_primitives=True)
+    cells = view['fragments']['root']['contents']['cells']
+    assert cells[0]['fragment']['contents']['text'] == '"a"' and 'fragmentId' not in cells[0]
+    assert 'fragmentId' in cells[1] and 'fragment' not in cells[1]
+
+    dag = Dag().node('x', item='x').node('y', item=Flow('y', 'z')).edge('x', 'y')
+    view = assemble(dag, inline_primitives=True)
+    nodes = view['fragments']['root']['contents']['nodes']
+    assert nodes['x']['fragment']['contents']['text'] == '"x"'
+    flow = view['fragments'][nodes['y']['fragmentId']]
+    assert [elem['contents']['text'] for elem in flow['contents']['elements']] == ['"y"', '"z"']
+
+
+def test_switch_and_root_primitives_should_not_be_inlined():
+    view = assemble(Switch().mode('a', 'x').mode('b', 'y'), inline_primitives=True)
+    assert len(view['fragments']) == 3
+    assert assemble('a', inline_primitives=True) == assemble('a')
+
+
+def test_expand_inline_fragments_should_restore_references():
+    obj = {'a': [1, 2], 'b': Grid('A', items={'A': 3})}
+    view = expand_inline_fragments(assemble(obj, inline_primitives=True))
+    assert len(view['fragments']) == len(assemble(obj)['fragments'])
+    for fragment in view['fragments'].values():
+        for child_id in get_child_ids(fragment):
+            assert child_id in view['fragments']
+    plain = assemble([1, 2])
+    assert expand_inline_fragments(plain) is plain
@@ -0,0 +1,46 @@
+from vizstack import *
+from vizstack.instrument import AssemblyHook, MetricsCollector
+
+
+class _Custom:
+
+    def __view__(self):
+        return Sequence([1, 'two'])
+
+
+def test_hooks_should_be_called_once_per_fragment_in_order():
+    calls = []
+
+    class Recorder(AssemblyHook):
+
+        def pre_fragment(self, event):
+            calls.append(('pre', event.fragment_id, event.fragment))
+
+        def post_fragment(self, event):
+            calls.append(('post', event.fragment_id, event.fragment['type']))
+
+    view = assemble([1, 2], hooks=[Recorder()])
+    assert len(calls) == 2 * len(view['fragments'])
+    assert calls[0] == ('pre', 'root', None)
+    assert calls[1] == ('post', 'root', 'SequenceLayout')
+
+
+def test_metrics_collector_should_aggregate_by_type_and_view_class():
+    metrics = MetricsCollector()
+    view = assemble({'a': [_Custom()]}, hooks=[metrics])
+    report = metrics.to_dict()
+    assert report['totals']['fragments'] == len(view['fragments'])
+    assert report['byType']['KeyValueLayout']['count'] == 1
+    assert report['byType']['SequenceLayout']['count'] == 2
+    assert report['byType']['TextPrimitive']['count'] == 3
+    assert report['byViewClass']['_Custom']['count'] == 1
+    assert report['totals']['bytes'] > 0
+    assert report['maxDepth'] == 3
+    assert report['deepestPath'][0] == 'root'
+    assert len(report['deepestPath']) == 4
+    assert 'KeyValueLayout' in metrics.report()
+
+
+def test_assemble_with_hooks_should_produce_same_view_as_without():
+    obj = {'a': [1, 2, {'b': (3, 4)}], 'c': _Custom()}
+    assert assemble(obj, hooks=[MetricsCollector()]) == assemble(obj)
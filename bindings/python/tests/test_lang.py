@@ -1,3 +1,6 @@
+import gc
+import weakref
+
 from .utils import hash_ids, match_object
 from vizstack import *
 
@@ -168,3 +171,60 @@ def test_class_without_custom_view_should_produce_default_view():
             }
         )
     )
+
+
+def test_proxies_should_not_share_default_view_of_their_referents():
+
+    class ListSubclass(list):
+        pass
+
+    class DictSubclass(dict):
+        pass
+
+    items, mapping = ListSubclass([1, 2]), DictSubclass(a=1)
+    assert assemble(weakref.proxy(items))['fragments']['root']['type'] == 'SequenceLayout'
+    assert assemble(weakref.proxy(mapping))['fragments']['root']['type'] == 'KeyValueLayout'
+
+
+def test_bound_method_should_not_be_kept_alive_by_view():
+
+    class Instance:
+
+        def method(self, a, b=1):
+            pass
+
+    instance = Instance()
+    view = assemble(instance.method)
+    texts = {
+        frag['contents']['text']
+        for frag in view['fragments'].values()
+        if frag['type'] == 'TextPrimitive'
+    }
+    assert {'"a"', '"b"'} <= texts and '"self"' not in texts
+    ref = weakref.ref(instance)
+    del instance
+    gc.collect()
+    assert ref() is None
+
+
+def test_function_and_instance_views_should_reflect_later_changes():
+
+    def fn(a, b=1):
+        pass
+
+    def texts(obj):
+        return {frag['contents']['text'] for frag in assemble(obj)['fragments'].values()
+                if frag['type'] == 'TextPrimitive'}
+
+    assert '1' in texts(fn)
+    fn.__defaults__ = (2,)
+    assert '2' in texts(fn) and '1' not in texts(fn)
+
+    class Instance:
+        pass
+
+    instance = Instance()
+    instance.x = 'value'
+    assert '"value"' in texts(instance)
+    Instance.x = 'value'
+    assert '"value"' not in texts(instance)
@@ -0,0 +1,74 @@
+import json
+import urllib.request
+
+from vizstack import *
+from vizstack.serve import FragmentServer
+
+
+def _make_log(num_lines):
+    return '\n'.join(
+        'line {} {}'.format(i, 'error' if i % 1000 == 7 else 'ok') for i in range(num_lines)
+    )
+
+
+def test_windowed_text_should_ship_only_first_window():
+    log = _make_log(10000)
+    view = assemble(Text(log, window=3))
+    contents = view['fragments']['root']['contents']
+    assert contents['text'] == 'line 0 ok\nline 1 ok\nline 2 ok'
+    assert contents['window'] == {'start': 0, 'end': 3, 'totalLines': 10000, 'truncated': False}
+
+
+def test_large_string_should_default_to_windowed_text():
+    log = _make_log(100000)
+    assert len(log) > 2**20
+    contents = assemble(log)['fragments']['root']['contents']
+    assert contents['window']['totalLines'] == 100000
+    assert contents['text'].count('\n') == contents['window']['end'] - 1
+    assert 'window' not in assemble('short')['fragments']['root']['contents']
+
+
+def test_expand_should_return_windows_and_search_matches():
+    log = _make_log(10000)
+    assembly = Assembly([log])
+    view = assembly.run()
+    text_id = view['fragments']['root']['contents']['elements'][0]
+    assert 'window' not in view['fragments'][text_id]['contents']
+
+    windowed = Assembly(Text(log, window=10))
+    windowed.run()
+    window = windowed.expand('root', {'start': 9998, 'count': 5})
+    assert window['text'] == 'line 9998 ok\nline 9999 ok'
+    assert (window['start'], window['end']) == (9998, 10000)
+
+    result = windowed.expand('root', {'search': 'error', 'limit': 3})
+    assert result['matches'] == [{'line': 7, 'column': 7}, {'line': 1007, 'column': 10},
+                                 {'line': 2007, 'column': 10}]
+    result = windowed.expand('root', {'search': 'error', **result['next']})
+    assert len(result['matches']) == 7 and result['next'] is None
+
+
+def test_expand_should_reject_unsupported_requests():
+    assembly = Assembly([1])
+    assembly.run()
+    for frag_id, request in [('root', {'start': 0, 'count': 1}),
+                             ('root', {}), ]:
+        try:
+            assembly.expand(frag_id, request)
+            assert False
+        except ValueError:
+            pass
+    try:
+        Assembly(Text('a', window=1)).expand('root', {'search': ''})
+        assert False
+    except ValueError:
+        pass
+
+
+def test_server_should_serve_text_windows():
+    with FragmentServer() as server:
+        server.register('log', Text(_make_log(1000), window=10))
+        url = '{}/roots/log/fragments/root/expand?start=500&count=2&token={}'.format(
+            server.url, server.token)
+        with urllib.request.urlopen(url) as response:
+            assert json.loads(response.read())['text'] == 'line 500 ok\nline 501 ok'
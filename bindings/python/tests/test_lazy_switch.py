@@ -0,0 +1,92 @@
+from vizstack import *
+
+
+class _Expensive:
+    """Counts how many times instances are visualized."""
+    views = 0
+
+    def __init__(self, label):
+        self.label = label
+
+    def __view__(self):
+        _Expensive.views += 1
+        return Sequence([self.label, 'details'])
+
+
+def test_lazy_switch_should_assemble_only_first_mode():
+    _Expensive.views = 0
+    view = assemble(
+        Switch(lazy=True).mode('raw', _Expensive('raw')).mode('chart', _Expensive('chart'))
+    )
+    raw_id, chart_id = view['fragments']['root']['contents']['modes']
+    assert _Expensive.views == 1
+    assert view['fragments'][raw_id]['type'] == 'SequenceLayout'
+    assert is_stub(view['fragments'][chart_id])
+    assert view['fragments'][chart_id]['meta'] == {
+        'stub': True,
+        'pendingId': chart_id,
+        'deferred': True
+    }
+
+
+def test_switch_should_assemble_every_mode_unless_lazy():
+    _Expensive.views = 0
+    view = assemble(Switch().mode('raw', _Expensive('raw')).mode('chart', _Expensive('chart')))
+    assert _Expensive.views == 2
+    assert not any(is_stub(frag) for frag in view['fragments'].values())
+
+
+def test_resolve_should_assemble_only_the_deferred_subtree():
+    _Expensive.views = 0
+    switch = Switch(lazy=True).mode('raw', 'first').mode('chart', _Expensive('chart'))
+    assembly = Assembly([switch, _Expensive('other'), [_Expensive('deep')]])
+    root = assembly.assemble_fragment('root')
+    switch_fragment = assembly.assemble_fragment(root['contents']['elements'][0])
+    chart_id = switch_fragment['contents']['modes'][1]
+    resolved = assembly.resolve(chart_id)
+    # Only the chart was visualized; the other objects of the root are still pending
+    assert _Expensive.views == 1
+    assert resolved[chart_id]['type'] == 'SequenceLayout'
+    assert len(resolved) == 3
+
+
+def test_lazy_item_should_call_thunk_only_when_requested():
+    calls = []
+
+    def make(label):
+        calls.append(label)
+        return label
+
+    switch = Switch().lazy_item('summary', lambda: make('summary'))
+    switch.lazy_item('raw', lambda: make('raw'))
+    switch.mode('summary').mode('raw')
+    assembly = Assembly(switch)
+    view = assembly.run()
+    summary_id, raw_id = view['fragments']['root']['contents']['modes']
+    assert calls == ['summary']
+    assert view['fragments'][summary_id]['contents']['text'] == '"summary"'
+    assert is_stub(view['fragments'][raw_id])
+
+    resolved = assembly.expand(raw_id, {})['fragments']
+    assert calls == ['summary', 'raw']
+    assert list(resolved) == [raw_id] and resolved[raw_id]['contents']['text'] == '"raw"'
+    # The thunk is called at most once
+    assembly.resolve(raw_id)
+    assert calls == ['summary', 'raw']
+
+
+def test_resolved_mode_should_include_its_subtree():
+    assembly = Assembly(Switch(lazy=True).mode('a', 'first').mode('b', ['x', ['y']]))
+    view = assembly.run()
+    b_id = view['fragments']['root']['contents']['modes'][1]
+    resolved = assembly.resolve(b_id)
+    assert resolved[b_id]['type'] == 'SequenceLayout'
+    assert len(resolved) == 4
+    assert not any(is_stub(frag) for frag in assembly.run()['fragments'].values())
+
+
+def test_deferred_fragment_should_be_resolved_on_demand():
+    assembly = Assembly(Switch(lazy=True).mode('a', 'first').mode('b', 'second'))
+    root = assembly.assemble_fragment('root')
+    fragment = assembly.assemble_fragment(root['contents']['modes'][1])
+    assert fragment['contents']['text'] == '"second"'
@@ -0,0 +1,100 @@
+import io
+import json
+import subprocess
+import sys
+import threading
+
+from vizstack import *
+from vizstack.logger import JsonLinesSink, ViewLogger, configure, get_logger, log
+from vizstack.validation import validate
+
+
+def test_log_should_write_snapshots_in_background():
+    out = io.StringIO()
+    logger = ViewLogger(sink=JsonLinesSink(out))
+    obj = {'a': [1, 2]}
+    assert logger.log(obj)
+    obj['a'].append(3)
+    logger.flush()
+    view = json.loads(out.getvalue())
+    assert validate(view) == []
+    value = view['fragments'][view['fragments']['root']['contents']['entries'][0]['value']]
+    assert len(value['contents']['elements']) == 2
+    assert logger.stats() == {'queued': 1, 'dropped': 0, 'written': 1, 'failed': 0, 'pending': 0}
+    logger.close()
+
+
+def _blocked_logger(**kwargs):
+    """Returns a logger whose sink waits until the returned event is set."""
+    release = threading.Event()
+    logger = ViewLogger(sink=lambda view: release.wait(), **kwargs)
+    return logger, release
+
+
+def test_drop_policy_should_drop_when_full():
+    logger, release = _blocked_logger(max_queue=2, policy='drop')
+    results = [logger.log(i) for i in range(10)]
+    assert not all(results)
+    release.set()
+    logger.close()
+    stats = logger.stats()
+    assert stats['queued'] + stats['dropped'] == 10
+    assert stats['written'] == stats['queued'] and 2 <= stats['queued'] <= 3
+
+
+def test_sample_policy_should_sample_under_pressure():
+    logger, release = _blocked_logger(max_queue=100, policy='sample', sample_every=5)
+    for i in range(200):
+        logger.log(i)
+    release.set()
+    logger.close()
+    stats = logger.stats()
+    # About 50 objects fill half the queue, then one in 5 of the rest is queued until it is full
+    assert 50 <= stats['queued'] <= 100 and stats['dropped'] > 100
+
+
+def test_block_policy_should_wait_for_timeout():
+    logger, release = _blocked_logger(max_queue=1, policy='block', timeout=0.01)
+    results = [logger.log(i) for i in range(4)]
+    assert results[0] and not results[-1]
+    release.set()
+    logger.close()
+
+
+def test_failures_should_be_counted():
+    logger = ViewLogger(sink=lambda view: 1 / 0)
+    logger.log(1)
+    logger.flush()
+    assert logger.stats()['failed'] == 1
+    logger.close()
+
+
+def test_default_logger_should_keep_recent_views():
+    configure(max_recent=2)
+    for i in range(3):
+        log(i)
+    get_logger().flush()
+    texts = [view['fragments']['root']['contents']['text'] for view in get_logger().recent]
+    assert texts == ['1', '2']
+
+
+def test_closed_logger_should_drop_and_count():
+    logger = ViewLogger()
+    logger.log(1)
+    logger.close()
+    assert logger.written == 1
+    assert not logger.log(2)
+    assert logger.stats()['dropped'] == 1
+    logger.close()
+
+
+def test_default_logger_should_write_queued_views_at_exit(tmp_path):
+    path = tmp_path / 'views.jsonl'
+    script = (
+        'from vizstack.logger import JsonLinesSink, configure, log\n'
+        'configure(sink=JsonLinesSink({!r}), max_queue=1000)\n'
+        'for i in range(200):\n'
+        '    log([i] * 50)\n'
+    ).format(str(path))
+    subprocess.run([sys.executable, '-c', script], check=True, timeout=60)
+    assert len(path.read_text().splitlines()) == 200
@@ -0,0 +1,56 @@
+import time
+
+from vizstack import *
+from vizstack.traversal import get_child_ids
+
+
+def test_assemble_roots_should_share_fragments_reachable_from_several_roots():
+    shared = {'config': [1, 2, 3]}
+    view = assemble_roots({'a': [shared, 'a'], 'b': [shared, 'b']})
+    assert view['rootIds'] == {'a': 'root-a', 'b': 'root-b'}
+    assert view['rootId'] == 'root-a'
+    a_children = get_child_ids(view['fragments']['root-a'])
+    b_children = get_child_ids(view['fragments']['root-b'])
+    assert a_children[0] == b_children[0]
+    assert a_children[1] != b_children[1]
+    separate = [assemble([shared, 'a']), assemble([shared, 'b'])]
+    assert len(view['fragments']) < sum(len(v['fragments']) for v in separate)
+
+
+def test_assemble_roots_should_reuse_fragment_of_object_given_as_several_roots():
+    obj = [1, 2]
+    view = assemble_roots({'first': obj, 'second': obj, 'part': obj[0]})
+    assert view['rootIds']['first'] == view['rootIds']['second'] == 'root-first'
+    assert get_child_ids(view['fragments']['root-first'])[0] == 'root-part'
+    assert view['fragments']['root-part']['contents']['text'] == '1'
+
+
+def test_assemble_roots_should_match_single_root_fragments():
+    view = assemble_roots({'only': {'x': [1, 2]}})
+    single = assemble({'x': [1, 2]})
+    assert len(view['fragments']) == len(single['fragments'])
+    assert view['fragments']['root-only']['type'] == single['fragments']['root']['type']
+
+
+def test_assemble_roots_should_stub_every_pending_root_after_deadline():
+    view = assemble_roots({'a': [1], 'b': [2]}, deadline=time.monotonic() - 1)
+    assert set(view['rootIds'].values()) == set(view['fragments'])
+    assert all(is_stub(frag) for frag in view['fragments'].values())
+
+
+def test_assemble_roots_should_reject_invalid_roots():
+    try:
+        assemble_roots({})
+        assert False
+    except ValueError:
+        pass
+    assembly = Assembly([1])
+    assembly.add_root('extra', [2])
+    try:
+        assembly.add_root('extra', [3])
+        assert False
+    except ValueError:
+        pass
+    view = assembly.run()
+    assert view['rootId'] == 'root'
+    assert view['rootIds'] == {'extra': 'root-extra'}
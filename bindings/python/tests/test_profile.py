@@ -0,0 +1,54 @@
+import cProfile
+import pstats
+
+from vizstack import *
+from vizstack.profile import Profiler, view as profile_view
+from vizstack.validation import validate
+
+
+def _fib(n):
+    return n if n < 2 else _fib(n - 1) + _fib(n - 2)
+
+
+def _work():
+    total = 0
+    for _ in range(3):
+        total += _fib(15)
+    return total + sum(range(1000))
+
+
+def _labels(view):
+    fragments = view['fragments']
+    nodes = fragments['root']['contents']['nodes']
+    labels = {}
+    for node_id, node in nodes.items():
+        sequence = fragments[node['fragmentId']]
+        token = fragments[sequence['contents']['elements'][0]]
+        labels[token['contents']['text'].split(' ')[0]] = (node_id, token['contents'].get('color'))
+    return labels
+
+
+def test_profiler_should_produce_call_graph():
+    with Profiler() as profiler:
+        _work()
+    view = assemble(profiler.view(threshold=0.0))
+    assert validate(view) == []
+    labels = _labels(view)
+    assert labels['_work'][1] == 'red' and labels['_fib'][1] == 'red'
+    edges = view['fragments']['root']['contents']['edges'].values()
+    work, fib = labels['_work'][0], labels['_fib'][0]
+    assert any(
+        e['source']['id'] == work and e['target']['id'] == fib and e['label'] == '3x' for e in edges
+    )
+    # Recursive calls are not drawn as edges
+    assert not any(e['source']['id'] == e['target']['id'] for e in edges)
+
+
+def test_view_should_prune_and_cap_nodes():
+    profile = cProfile.Profile()
+    profile.runcall(_work)
+    stats = pstats.Stats(profile)
+    view = assemble(profile_view(stats, threshold=0.0, max_nodes=2))
+    assert len(view['fragments']['root']['contents']['nodes']) == 2
+    pruned = assemble(profile_view(stats, threshold=0.5))
+    assert '_work' in _labels(pruned) and 'sum' not in _labels(pruned)
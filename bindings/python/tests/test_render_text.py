@@ -0,0 +1,89 @@
+import time
+
+from vizstack import *
+from vizstack.text_renderer import _ObjectFragments, _TextRenderer, iter_text_lines, render_text
+
+
+def test_render_text_should_render_short_layouts_inline():
+    assert render_text([1, 'a', None]) == '[1, "a", None]'
+    assert render_text({'key': [1, 2]}) == '{"key": [1, 2]}'
+
+
+def test_render_text_should_render_long_layouts_as_blocks():
+    text = render_text({'numbers': list(range(20)), 'name': 'x'}, width=30)
+    lines = text.split('\n')
+    assert lines[0] == '{'
+    assert lines[1] == '  "numbers":'
+    assert lines[-2] == '  "name": "x"'
+    assert lines[-1] == '}'
+    assert all(len(line) <= 30 for line in lines)
+
+
+def test_render_text_should_render_views_and_objects_alike():
+    obj = {'a': [1, {'b': 'long text ' * 10}], 'c': Token('tok', 'red')}
+    assert render_text(assemble(obj), width=40) == render_text(obj, width=40)
+    inlined = assemble(obj, inline_primitives=True)
+    assert render_text(inlined, width=40) == render_text(obj, width=40)
+
+
+def test_render_text_should_wrap_texts():
+    lines = render_text(Text('x' * 50 + '\ny'), width=20).split('\n')
+    assert lines == ['x' * 20, 'x' * 20, 'x' * 10, 'y']
+
+
+def test_render_text_should_render_grid_switch_and_dag():
+    grid = Grid('ab|cc').item('a', 1).item('b', 2).item('c', 'wide')
+    assert render_text(grid) == '1 | 2\n"wide"'
+    switch = Switch(['first', 'second']).item('first', 'one').item('second', 'two')
+    assert render_text(switch) == '(mode 1 of 2)\n"one"'
+    dag = Dag().node('a').item('A', 'a').node('b', parent='a').item('B', 'b')
+    dag.node('c').item('C', 'c').edge('a', 'c')
+    assert render_text(dag) == '(a)\n  "A"\n  (b)\n    "B"\n(c)\n  "C"\na -> c'
+
+
+def test_render_text_should_cut_cycles():
+    obj = [1]
+    obj.append(obj)
+    assert render_text(obj) == '[\n  1\n  (cycle)\n]'
+
+    # A cycle through layouts without motifs, which could otherwise be tried inline forever
+    b = Flow()
+    c = Flow(b)
+    b.item(c)
+    for rendered in (render_text(Flow(b)), render_text(assemble(Flow(b)))):
+        assert rendered == '(cycle)'
+
+
+def test_render_text_should_stop_at_max_lines():
+    view = assemble([[i] * 20 for i in range(1000)])
+    lines = render_text(view, width=20, max_lines=5).split('\n')
+    assert len(lines) == 5
+    assert lines[-1] == '…'
+    assert render_text([1, 2], max_lines=5) == '[1, 2]'
+
+
+def test_iter_text_lines_should_not_visit_the_rest_of_the_view():
+    visited = []
+
+    class Tracked:
+        def __init__(self, i):
+            self.i = i
+
+        def __view__(self):
+            visited.append(self.i)
+            return Sequence([Text('item {}'.format(self.i))] * 10)
+
+    lines = iter_text_lines([Tracked(i) for i in range(1000)], width=20)
+    for _ in range(3):
+        next(lines)
+    assert visited == [0]
+
+
+def test_render_text_should_visit_only_the_rendered_elements_of_containers():
+    for obj in ([[i] * 20 for i in range(1000)], {i: [i] * 20 for i in range(1000)}):
+        fragments = _ObjectFragments(obj)
+        lines = _TextRenderer(fragments.get, 20).render('0', '')
+        for _ in range(3):
+            next(lines)
+        # The container, its first element, and that element's elements
+        assert len(fragments._objects) <= 25
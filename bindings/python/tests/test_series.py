@@ -0,0 +1,104 @@
+import base64
+import math
+import struct
+from array import array
+
+import pytest
+
+from vizstack import *
+
+
+def _unpack(contents):
+    data = base64.b64decode(contents['points'])
+    values = struct.unpack('<{}d'.format(len(data) // 8), data)
+    return list(zip(values[::2], values[1::2]))
+
+
+def test_short_series_should_emit_all_points():
+    view = assemble(Series([3, 1, 2]))
+    contents = view['fragments']['root']['contents']
+    assert view['fragments']['root']['type'] == 'SeriesPrimitive'
+    assert _unpack(contents) == [(0, 3), (1, 1), (2, 2)]
+    assert [contents[key] for key in ('numPoints', 'start', 'end', 'length')] == [3, 0, 3, 3]
+    assert 'method' not in contents
+
+
+def test_long_series_should_be_downsampled_with_lttb():
+    values = [math.sin(i / 100) for i in range(100000)]
+    contents = assemble(Series(values, max_points=500))['fragments']['root']['contents']
+    points = _unpack(contents)
+    assert contents['method'] == 'lttb' and len(points) == contents['numPoints'] == 500
+    assert points[0] == (0, values[0]) and points[-1] == (99999, values[-1])
+    assert all(a[0] < b[0] for a, b in zip(points, points[1:]))
+    assert all(values[int(x)] == y for x, y in points)
+    # The peaks of the sine wave should survive downsampling
+    assert max(y for _, y in points) > 0.99 and min(y for _, y in points) < -0.99
+
+
+def test_minmax_downsampling_should_keep_extremes():
+    values = array('d', [0.0] * 10000)
+    values[1234], values[8765] = 100.0, -100.0
+    view = assemble(Series(values, max_points=100, method='minmax'))
+    contents = view['fragments']['root']['contents']
+    points = _unpack(contents)
+    assert (1234, 100.0) in points and (8765, -100.0) in points
+    assert len(points) <= 100
+
+
+def test_expand_should_return_full_resolution_window():
+    values = [float(i * i) for i in range(100000)]
+    xs = [i / 10 for i in range(100000)]
+    assembly = Assembly(Series(values, x=xs, max_points=100))
+    assembly.run()
+    window = assembly.expand('root', {'start': 500, 'end': 550})
+    assert _unpack(window) == [(xs[i], values[i]) for i in range(500, 550)]
+    window = assembly.expand('root', {'start': '0', 'end': '100000', 'maxPoints': '1000'})
+    assert window['numPoints'] == 1000 and window['method'] == 'lttb'
+
+
+def test_series_should_reject_invalid_arguments():
+    for kwargs in [{'method': 'mean'}, {'max_points': 2}, {'x': [1, 2]}]:
+        try:
+            Series([1, 2, 3], **kwargs)
+            assert False
+        except ValueError:
+            pass
+
+
+def _assemble_both(monkeypatch, make_series):
+    """Returns the contents assembled with NumPy and with the pure-Python fallback."""
+    import vizstack.assemblers.series as series_module
+    with_numpy = assemble(make_series())['fragments']['root']['contents']
+    monkeypatch.setattr(series_module, '_numpy', None)
+    without_numpy = assemble(make_series())['fragments']['root']['contents']
+    return with_numpy, without_numpy
+
+
+def test_numpy_lttb_should_match_pure_python(monkeypatch):
+    pytest.importorskip('numpy')
+    values = [math.sin(i / 37) * (i % 11) for i in range(20000)]
+    xs = [i * 0.5 for i in range(20000)]
+    with_numpy, without_numpy = _assemble_both(
+        monkeypatch, lambda: Series(values, x=xs, max_points=300)
+    )
+    assert with_numpy['method'] == 'lttb'
+    assert with_numpy == without_numpy
+
+
+def test_numpy_minmax_should_match_pure_python(monkeypatch):
+    pytest.importorskip('numpy')
+    values = [(i * 7919) % 1013 - 500.0 for i in range(20000)]
+    with_numpy, without_numpy = _assemble_both(
+        monkeypatch, lambda: Series(values, max_points=200, method='minmax')
+    )
+    assert with_numpy['method'] == 'minmax'
+    assert with_numpy == without_numpy
+
+
+def test_numpy_series_should_accept_generators(monkeypatch):
+    pytest.importorskip('numpy')
+    with_numpy, without_numpy = _assemble_both(
+        monkeypatch, lambda: Series(float(i) for i in range(10))
+    )
+    assert _unpack(with_numpy) == [(i, i) for i in range(10)]
+    assert with_numpy == without_numpy
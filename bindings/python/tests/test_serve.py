@@ -0,0 +1,138 @@
+import base64
+import json
+import os
+import socket
+import struct
+import urllib.error
+import urllib.request
+
+import pytest
+
+from vizstack import *
+from vizstack.serve import FragmentServer, LRUCache
+
+
+@pytest.fixture
+def server():
+    with FragmentServer(cache_size=2) as server:
+        yield server
+
+
+def _get(server, path, headers=None, token=True):
+    if token:
+        path += ('&' if '?' in path else '?') + 'token=' + server.token
+    request = urllib.request.Request(server.url + path, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, dict(response.headers), response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers), e.read()
+
+
+def test_fragments_should_match_assembled_view(server):
+    obj = {'a': [1, 2], 'b': 'text'}
+    server.register('data', obj)
+    expected = assemble(obj)['fragments']
+
+    status, _, body = _get(server, '/roots/data')
+    assert status == 200
+    frontier = [json.loads(body)['rootId']]
+    fetched = {}
+    while frontier:
+        frag_id = frontier.pop()
+        if frag_id in fetched:
+            continue
+        status, _, body = _get(server, '/roots/data/fragments/' + frag_id)
+        assert status == 200
+        fetched[frag_id] = json.loads(body)
+        for entry in fetched[frag_id]['contents'].get('entries', []):
+            frontier.extend([entry['key'], entry['value']])
+        frontier.extend(fetched[frag_id]['contents'].get('elements', []))
+    assert fetched == expected
+
+
+def test_unchanged_fragment_should_revalidate_with_etag(server):
+    server.register('data', [1, 2, 3])
+    status, headers, _ = _get(server, '/roots/data/fragments/root')
+    assert status == 200
+    status, _, body = _get(server, '/roots/data/fragments/root', {'If-None-Match': headers['ETag']})
+    assert status == 304
+    assert body == b''
+
+
+def test_unknown_roots_and_fragments_should_return_not_found(server):
+    server.register('data', [1])
+    assert _get(server, '/roots/missing')[0] == 404
+    assert _get(server, '/roots/data/fragments/missing')[0] == 404
+    assert json.loads(_get(server, '/roots')[2]) == {'roots': ['data']}
+
+
+def _upgrade(sock, server, origin=None):
+    key = base64.b64encode(os.urandom(16)).decode()
+    sock.sendall((
+        'GET /ws?token={} HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\n'
+        'Connection: Upgrade\r\nSec-WebSocket-Key: {}\r\nSec-WebSocket-Version: 13\r\n'
+        '{}\r\n'.format(server.token, key,
+                        '' if origin is None else 'Origin: {}\r\n'.format(origin))
+    ).encode())
+    reader = sock.makefile('rb')
+    return reader, reader.readline()
+
+
+def test_websocket_should_answer_fragment_requests(server):
+    server.register('data', ['hello'])
+    with socket.create_connection((server.host, server.port)) as sock:
+        reader, status = _upgrade(sock, server, origin=server.url)
+        assert b'101' in status
+        while reader.readline() not in (b'\r\n', b''):
+            pass
+
+        payload = json.dumps({'root': 'data', 'id': 'root'}).encode()
+        mask = os.urandom(4)
+        masked = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+        sock.sendall(struct.pack('!BB', 0x81, 0x80 | len(payload)) + mask + masked)
+
+        header = reader.read(2)
+        length = header[1] & 0x7F
+        if length == 126:
+            length = struct.unpack('!H', reader.read(2))[0]
+        response = json.loads(reader.read(length))
+        assert response['fragment'] == assemble(['hello'])['fragments']['root']
+
+
+def test_requests_without_token_or_from_other_origins_should_be_forbidden(server):
+    server.register('data', [1])
+    assert _get(server, '/roots', token=False)[0] == 403
+    assert _get(server, '/roots?token=wrong', token=False)[0] == 403
+    status, headers, _ = _get(server, '/roots')
+    assert status == 200 and 'Access-Control-Allow-Origin' not in headers
+    with socket.create_connection((server.host, server.port)) as sock:
+        assert b'403' in _upgrade(sock, server, origin='http://evil.example')[1]
+
+
+def test_lru_cache_should_evict_least_recently_used():
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.evictions == 1
+
+
+def test_invalidated_fragments_should_keep_distinct_ids():
+    # Functions are shown through `FragmentAssembler`s created anew on each assembly, so every
+    # invalidation replaces the objects behind the same `FragmentId`s
+    def f(a, b, c=1):
+        pass
+
+    server = FragmentServer()
+    server.register('x', f)
+    expected = server.get_fragment('x', 'root')[0]
+    for _ in range(30):
+        server.invalidate('x')
+        fragment = server.get_fragment('x', 'root')[0]
+        assert fragment == expected
+        elements = fragment['contents']['elements']
+        assert len(set(elements)) == len(elements)
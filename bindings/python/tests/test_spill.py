@@ -0,0 +1,54 @@
+import io
+import json
+import os
+import time
+
+from vizstack import *
+from vizstack.spill import assemble_spilled
+
+
+def _make_object():
+    return {'rows': [[i, str(i), {'even': i % 2 == 0}] for i in range(200)], 'name': 'table'}
+
+
+def test_spilled_view_should_match_in_memory_view():
+    obj = _make_object()
+    expected = assemble(obj)
+    with assemble_spilled(obj, memory_limit=1024) as view:
+        assert os.path.getsize(view.path) > 0
+        assert view['rootId'] == expected['rootId']
+        assert len(view['fragments']) == len(expected['fragments'])
+        assert list(view['fragments']) == list(expected['fragments'])
+        for frag_id, frag in expected['fragments'].items():
+            assert view['fragments'][frag_id] == frag
+        assert view.to_view() == expected
+        path = view.path
+    assert not os.path.exists(path)
+
+
+def test_spilled_view_should_stream_as_json():
+    obj = _make_object()
+    with assemble_spilled(obj, memory_limit=0) as view:
+        out = io.StringIO()
+        view.write_json(out)
+        assert json.loads(out.getvalue()) == assemble(obj)
+
+
+def test_small_view_should_not_spill():
+    with assemble_spilled([1, 2, 3]) as view:
+        assert os.path.getsize(view.path) == 0
+        assert view.to_view() == assemble([1, 2, 3])
+
+
+def test_spill_file_should_be_kept_when_path_is_given(tmp_path):
+    path = str(tmp_path / 'view.jsonl')
+    view = assemble_spilled(_make_object(), memory_limit=0, path=path)
+    fragments = view.to_view()['fragments']
+    view.close()
+    with open(path) as f:
+        assert len(f.readlines()) == len(fragments)
+
+
+def test_spilled_view_should_contain_stubs_after_deadline():
+    with assemble_spilled(_make_object(), memory_limit=0, deadline=time.monotonic() - 1) as view:
+        assert is_stub(view['fragments'][view['rootId']])
@@ -0,0 +1,73 @@
+import itertools
+
+from vizstack import *
+
+
+def _pulled(n=None):
+    """Returns an iterator over 0, 1, ..., and a list recording which values have been pulled."""
+    pulled = []
+
+    def generate():
+        for i in (itertools.count() if n is None else range(n)):
+            pulled.append(i)
+            yield i
+
+    return generate(), pulled
+
+
+def _elements(view):
+    root = view['fragments'][view['rootId']]
+    return [
+        view['fragments'][e]['contents']['text'] if isinstance(e, str) else e['contents']['text']
+        for e in root['contents']['elements']
+    ], root['contents']['stream']
+
+
+def test_from_iterable_should_pull_lazily_and_stop_at_limit():
+    iterator, pulled = _pulled()
+    sequence = Sequence.from_iterable(iterator, limit=5)
+    assert pulled == []
+    texts, stream = _elements(assemble(sequence))
+    assert texts == ['0', '1', '2', '3', '4']
+    assert stream == {'sampling': 'head', 'consumed': 6, 'exhausted': False}
+    assert pulled == [0, 1, 2, 3, 4, 5]
+
+
+def test_from_iterable_should_record_exhaustion():
+    texts, stream = _elements(assemble(Flow.from_iterable(iter(range(3)), limit=5)))
+    assert texts == ['0', '1', '2']
+    assert stream['exhausted'] is True
+    texts, stream = _elements(assemble(Flow.from_iterable(iter(range(5)), limit=5)))
+    assert stream == {'sampling': 'head', 'consumed': 5, 'exhausted': True}
+
+
+def test_from_iterable_should_keep_head_and_tail():
+    texts, stream = _elements(
+        assemble(Sequence.from_iterable(range(100), limit=5, sampling='head_tail'))
+    )
+    assert texts == ['0', '1', '2', '98', '99']
+    assert stream == {'sampling': 'head_tail', 'consumed': 100, 'exhausted': True,
+                      'indices': [0, 1, 2, 98, 99]}
+
+
+def test_from_iterable_should_keep_ordered_reservoir_sample():
+    texts, stream = _elements(
+        assemble(Sequence.from_iterable(range(1000), limit=10, sampling='reservoir'))
+    )
+    assert len(texts) == 10
+    assert [int(t) for t in texts] == stream['indices'] == sorted(stream['indices'])
+    assert stream['consumed'] == 1000
+
+
+def test_from_iterable_should_respect_max_items():
+    iterator, pulled = _pulled()
+    texts, stream = _elements(assemble(
+        Sequence.from_iterable(iterator, limit=4, sampling='head_tail', max_items=50)))
+    assert texts == ['0', '1', '48', '49']
+    assert stream['exhausted'] is False
+    assert len(pulled) == 50
+
+
+def test_from_iterable_should_pull_once_across_assemblies():
+    sequence = Sequence.from_iterable(iter(range(10)), limit=3)
+    assert assemble(sequence) == assemble(sequence)
@@ -0,0 +1,70 @@
+import pytest
+
+from vizstack import *
+
+
+def _contents(table):
+    return assemble(table)['fragments']['root']['contents']
+
+
+def test_table_should_emit_columnar_window():
+    contents = _contents(Table({'name': ['a', 'b', 'c'], 'score': [1.5, 2.0, None]}, window=2))
+    assert contents['columns'] == [
+        {'name': 'name', 'type': 'string'}, {'name': 'score', 'type': 'number'}
+    ]
+    assert contents['data'] == [['a', 'b'], ['1.5', '2']]
+    assert [contents[key] for key in ('start', 'end', 'numRows', 'length')] == [0, 2, 3, 3]
+    assert 'rows' not in contents
+
+
+def test_table_should_accept_records():
+    contents = _contents(Table([{'a': 1}, {'a': 2, 'b': True}]))
+    assert [c['name'] for c in contents['columns']] == ['a', 'b']
+    assert contents['data'] == [['1', '2'], ['', 'True']]
+    contents = _contents(Table([(1, 'x'), (2, 'y')], columns=['n', 's']))
+    assert contents['data'] == [['1', '2'], ['x', 'y']]
+
+
+def test_table_should_expand_row_windows():
+    table = Table({'n': list(range(1000))}, window=10)
+    assert len(assemble(table)['fragments']['root']['contents']['data'][0]) == 10
+    window = table.expand({'start': '990', 'count': '50'})
+    assert window['data'] == [[str(i) for i in range(990, 1000)]]
+    assert (window['start'], window['end'], window['numRows']) == (990, 1000, 1000)
+
+
+def test_table_should_sort_and_filter():
+    table = Table({'name': ['bob', 'alice', 'carol', 'albert'], 'age': [30, None, 25, 41]})
+    window = table.expand({'start': 0, 'sort': 'age', 'descending': 'true'})
+    assert window['data'][0] == ['albert', 'bob', 'carol', 'alice']
+    assert window['rows'] == [3, 0, 2, 1]
+    window = table.expand({'start': 0, 'filter': 'AL', 'filterColumn': 'name', 'sort': 'name'})
+    assert window['data'][0] == ['albert', 'alice']
+    assert window['numRows'] == 2
+    request = {'start': 1, 'count': 1, 'filter': 'AL', 'filterColumn': 'name', 'sort': 'name'}
+    window = table.expand(request)
+    assert window['data'][0] == ['alice'] and window['rows'] == [1]
+
+
+def test_numpy_sort_should_keep_ties_in_order_and_missing_values_last():
+    np = pytest.importorskip('numpy')
+    expected = {'false': [2, 5, 0, 3, 1, 4], 'true': [0, 3, 2, 5, 1, 4]}
+    table = Table({
+        'float': np.array([2.0, np.nan, 1.0, 2.0, np.nan, 1.0]),
+        'object': np.array([2, None, 1, 2, None, 1], dtype=object),
+        'list': [2, float('nan'), 1, 2, None, 1],
+    })
+    for column in ('float', 'object', 'list'):
+        for descending, rows in expected.items():
+            request = {'start': 0, 'sort': column, 'descending': descending}
+            assert table.expand(request)['rows'] == rows, request
+
+
+def test_table_should_reject_invalid_requests():
+    table = Table({'n': [1, 2]})
+    for request in ({}, {'start': 'x'}, {'start': 0, 'sort': 'missing'}, {'start': -1}):
+        try:
+            table.expand(request)
+            assert False, request
+        except ValueError:
+            pass
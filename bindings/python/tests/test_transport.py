@@ -0,0 +1,72 @@
+import multiprocessing
+
+from vizstack import *
+from vizstack.transport import RingBuffer, ViewCollector, ViewPublisher
+
+
+def _publish(ring_name, count):
+    publisher = ViewPublisher(ring_name)
+    for i in range(count):
+        publisher.publish({'worker': ring_name, 'i': i, 'values': [i, i + 1]})
+    publisher.close()
+
+
+def test_ring_buffer_should_preserve_records_across_wraparound():
+    ring = RingBuffer(capacity=256)
+    writer = RingBuffer(ring.name)
+    received = []
+    for i in range(100):
+        payload = bytes([i]) * (i % 50 + 1)
+        assert writer.write(payload, timeout=0)
+        record = ring.peek()
+        received.append(bytes(record))
+        record.release()
+        ring.release()
+    assert received == [bytes([i]) * (i % 50 + 1) for i in range(100)]
+    assert ring.peek() is None
+    writer.close()
+    ring.close()
+
+
+def test_full_ring_buffer_should_drop_when_not_blocking():
+    with ViewCollector(num_workers=1, capacity=256) as collector:
+        publisher = ViewPublisher(collector.ring_names[0], block=False)
+        while publisher.publish_view(assemble('x')):
+            pass
+        assert publisher.dropped == 1
+        assert len(collector.poll()) == publisher.published
+        publisher.close()
+
+
+def test_collector_should_remap_ids_per_worker_and_view():
+    with ViewCollector(num_workers=2) as collector:
+        publishers = [ViewPublisher(name) for name in collector.ring_names]
+        for publisher in publishers:
+            publisher.publish([1, 2])
+            publisher.publish([1, 2])
+        views = collector.poll()
+        assert sorted(index for index, _ in views) == [0, 0, 1, 1]
+        root_ids = {view['rootId'] for _, view in views}
+        assert root_ids == {'0.0:root', '0.1:root', '1.0:root', '1.1:root'}
+        for _, view in views:
+            prefix = view['rootId'][:-len('root')]
+            root = view['fragments'][view['rootId']]
+            assert all(elem.startswith(prefix) for elem in root['contents']['elements'])
+            assert all(elem in view['fragments'] for elem in root['contents']['elements'])
+        for publisher in publishers:
+            publisher.close()
+
+
+def test_collector_should_receive_all_views_from_worker_processes():
+    num_workers, count = 4, 200
+    with ViewCollector(num_workers=num_workers, capacity=2**16) as collector:
+        processes = [
+            multiprocessing.Process(target=_publish, args=(name, count))
+            for name in collector.ring_names
+        ]
+        for process in processes:
+            process.start()
+        received = [index for index, _ in collector.iter_views(timeout=2.0)]
+        for process in processes:
+            process.join()
+        assert sorted(received) == sorted(list(range(num_workers)) * count)
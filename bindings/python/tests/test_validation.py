@@ -0,0 +1,76 @@
+import pytest
+
+from vizstack import *
+from vizstack.validation import validate
+
+
+def _view():
+    dag = Dag().node('a', item='x').node('b', item=['y'], parent='a').node('c', item=2)
+    dag.edge('a', 'c')
+    grid = Grid('ab').item('a', 'p').item('b', {'k': 'v'})
+    switch = Switch().mode('one', 1).mode('two', Text('two'))
+    others = [Flow('f', 1.5), Table({'n': [1]}), Series([1, 2, 3])]
+    return assemble(Sequence([dag, grid, switch] + others))
+
+
+def test_assembled_views_should_be_valid():
+    assert validate(_view()) == []
+    assert validate(assemble([1, 'two', {'three': [3]}], inline_primitives=True)) == []
+    assert validate(assemble_roots({'a': [1], 'b': (2,)})) == []
+
+
+def test_validate_should_report_dangling_references():
+    view = _view()
+    del view['fragments'][view['fragments']['root']['contents']['elements'][1]]
+    with pytest.raises(ValueError, match='not a Fragment of the View'):
+        validate(view)
+    assert len(validate(view, strict=False)) == 1
+
+
+def test_validate_should_report_unreachable_fragments_and_bad_shapes():
+    view = assemble([1])
+    view['fragments']['orphan'] = {'type': 'TextPrimitive', 'contents': {'text': 'x'}, 'meta': {}}
+    assert validate(view, strict=False) == ['Fragment "orphan" is not reachable from any root.']
+    view['fragments']['orphan'] = {'type': 'TextPrimitive', 'contents': {'text': 1}, 'meta': {}}
+    view['fragments']['bad'] = {'type': 'Unknown', 'contents': {}}
+    problems = validate(view, strict=False)
+    assert 'Fragment "orphan": has invalid "text".' in problems
+    assert 'Fragment "bad": has unknown type "Unknown".' in problems
+
+
+def test_validate_should_check_dag_consistency():
+    dag = Dag().node('a', item=1).node('b', item=2, parent='a').node('c', item=3, parent='a')
+    view = assemble(dag.edge('a', 'b'))
+    nodes = view['fragments']['root']['contents']['nodes']
+    nodes['b']['children'] = ['c']
+    nodes['a']['children'].append('missing')
+    view['fragments']['root']['contents']['edges']['e0']['target'] = {'id': 'b', 'port': 'p'}
+    problems = validate(view, strict=False)
+    assert len(problems) == 3
+
+    nodes['b']['children'] = []
+    nodes['a']['children'] = ['b', 'c', 'b']
+    assert validate(view, strict=False) == [
+        'Fragment "root": node "a" lists child "b" more than once.',
+        'Fragment "root": edge "e0" has a non-existent target port "p" on node "b".',
+    ]
+
+
+def test_sampled_validation_should_check_only_sample():
+    view = assemble(list(range(100)))
+    for fragment in view['fragments'].values():
+        fragment['contents'] = {'text': None} if fragment['type'] == 'TextPrimitive' else {}
+    # Every `Fragment` has exactly one problem, so exactly as many are found as are sampled
+    problems = validate(view, sample_size=10, strict=False, seed=0)
+    assert len(problems) == 10
+    assert validate(view, sample_size=10, strict=False, seed=0) == problems
+    assert len(validate(view, strict=False)) == len(view['fragments'])
+
+
+def test_dag_should_raise_on_inconsistent_nodes():
+    with pytest.raises(ValueError, match='No item'):
+        assemble(Dag().node('a'))
+    with pytest.raises(ValueError, match='non-existent node'):
+        assemble(Dag().node('a', item=1).edge('a', 'b'))
+    with pytest.raises(ValueError, match='No item was provided for mode'):
+        assemble(Switch(['x']))
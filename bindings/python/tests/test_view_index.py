@@ -0,0 +1,68 @@
+from vizstack import *
+from vizstack.view_index import ViewIndex
+
+
+def _find(view, frag_type, text=None):
+    return next(frag_id for frag_id, fragment in view['fragments'].items()
+                if fragment['type'] == frag_type
+                and (text is None or fragment['contents'].get('text') == text))
+
+
+def test_view_index_should_map_parents_children_and_types():
+    view = assemble({'a': [1, 2], 'b': 'x'})
+    index = ViewIndex(view)
+    seq_id = _find(view, 'SequenceLayout')
+    one_id = _find(view, 'TextPrimitive', '1')
+    assert index.parents(seq_id) == ['root']
+    assert index.parent(one_id) == seq_id
+    assert index.children(seq_id) == view['fragments'][seq_id]['contents']['elements']
+    assert index.of_type('SequenceLayout') == [seq_id]
+    assert index.types() == {'KeyValueLayout': 1, 'SequenceLayout': 1, 'TextPrimitive': 5}
+    assert index.parent('root') is None
+    assert len(index) == len(view['fragments'])
+
+
+def test_view_index_should_find_shortest_path_from_root():
+    shared = ['deep']
+    obj = [[[shared]], shared]
+    view = assemble(obj)
+    index = ViewIndex(view)
+    deep_id = _find(view, 'TextPrimitive', '"deep"')
+    path = index.path(deep_id)
+    assert path[0] == 'root' and path[-1] == deep_id
+    assert len(path) == 3
+    for parent, child in zip(path, path[1:]):
+        assert child in index.children(parent)
+
+
+def test_view_index_should_count_subtrees_and_reachability():
+    view = assemble([[1, 2], 3])
+    index = ViewIndex(view)
+    inner_id = next(frag_id for frag_id in index.of_type('SequenceLayout') if frag_id != 'root')
+    assert index.subtree_size('root') == 5
+    assert index.subtree_size(inner_id) == 3
+    assert all(index.is_reachable(frag_id) for frag_id in view['fragments'])
+
+
+def test_view_index_should_update_incrementally():
+    view = assemble([[1, 2], 3])
+    index = ViewIndex(view)
+    inner_id = next(frag_id for frag_id in index.of_type('SequenceLayout') if frag_id != 'root')
+    three_id = _find(view, 'TextPrimitive', '3')
+    assert index.subtree_size('root') == 5
+
+    # Drop the inner sequence from the root; its subtree becomes unreachable
+    root = view['fragments']['root']
+    index.set('root', {**root, 'contents': {**root['contents'], 'elements': [three_id]}})
+    assert index.parents(inner_id) == []
+    assert index.subtree_size('root') == 2
+    assert set(index.unreachable()) == index.descendants(inner_id)
+    assert index.path(inner_id) is None
+
+    index.set('new', {'type': 'TextPrimitive', 'contents': {'text': 'new'}, 'meta': {}})
+    assert index.of_type('TextPrimitive').count('new') == 1
+    removed = index.remove(inner_id)
+    assert removed['type'] == 'SequenceLayout'
+    assert inner_id not in view['fragments']
+    assert index.of_type('SequenceLayout') == ['root']
+    assert all(inner_id not in index.parents(frag_id) for frag_id in view['fragments'])
@@ -0,0 +1,93 @@
+from array import array
+from queue import Queue
+
+import pytest
+
+from vizstack import *
+from vizstack import watcher
+from vizstack.snapshot import snapshot
+from vizstack.validation import validate
+from vizstack.watcher import flush, stats, timeline, unwatch, watch
+
+
+def test_snapshot_should_copy_containers_to_depth():
+    inner = [1]
+    obj = {'a': [inner], 'b': (2, {3})}
+    copied = snapshot(obj, depth=2)
+    obj['a'].append(4)
+    inner.append(5)
+    assert copied == {'a': [[1, 5]], 'b': (2, {3})}
+    assert snapshot(obj, depth=0) is obj
+
+
+def test_snapshot_should_copy_buffers():
+    buffers = [bytearray(b'ab'), array('f', [1.0]), memoryview(array('i', [1, 2]))]
+    copied = snapshot(buffers)
+    buffers[0][0] = ord('x')
+    buffers[1][0] = 2.0
+    buffers[2][0] = 3
+    assert copied[0] == bytearray(b'ab') and copied[1] == array('f', [1.0])
+    assert copied[2].tolist() == [1, 2] and copied[2].format == 'i'
+
+    np = pytest.importorskip('numpy')
+    weights = np.zeros(3)
+    samples = [snapshot(weights)]
+    weights += 1
+    assert samples[0].tolist() == [0.0, 0.0, 0.0]
+
+
+def test_watch_should_sample_every_nth_call():
+    values = []
+    for i in range(25):
+        values.append(i)
+        watch('test-every', values, every=10)
+    flush()
+    view = timeline('test-every')
+    assert validate(view) == []
+    modes = view['fragments']['root']['contents']['modes']
+    assert len(modes) == 3
+    captions = [
+        view['fragments'][view['fragments'][mode]['contents']['elements'][0]]['contents']['text']
+        for mode in modes
+    ]
+    assert [c.split(' ')[1] for c in captions] == ['#1', '#11', '#21']
+    # Each sample was copied when it was taken
+    first = view['fragments'][view['fragments'][modes[0]]['contents']['elements'][1]]
+    assert len(first['contents']['elements']) == 1
+    unwatch('test-every')
+
+
+def test_watch_should_limit_rate_and_history():
+    for i in range(1000):
+        watch('test-rate', i, max_rate=0.001, max_history=5)
+    for i in range(10):
+        watch('test-history', i, max_history=5)
+    flush()
+    assert len(timeline('test-rate')['fragments']['root']['contents']['modes']) == 1
+    assert len(timeline('test-history')['fragments']['root']['contents']['modes']) == 5
+    unwatch('test-rate')
+    unwatch('test-history')
+
+
+def test_watch_should_count_failed_and_dropped_samples(monkeypatch):
+
+    class Broken:
+
+        def __view__(self):
+            raise RuntimeError('cannot be viewed')
+
+    for i in range(3):
+        watch('test-failed', Broken())
+    flush()
+    assert stats('test-failed') == {'calls': 3, 'samples': 0, 'dropped': 0, 'failed': 3}
+    unwatch('test-failed')
+
+    # A queue which is already full, and which no consumer empties
+    full = Queue(maxsize=1)
+    full.put(None)
+    monkeypatch.setattr(watcher, '_queue', full)
+    monkeypatch.setattr(watcher, '_ensure_consumer', lambda: None)
+    for i in range(3):
+        watch('test-dropped', i)
+    assert stats('test-dropped')['dropped'] == 3
+    unwatch('test-dropped')
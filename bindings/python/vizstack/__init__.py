@@ -1,2 +1,77 @@
-from vizstack.view_assembler import *
-from vizstack.assemblers import *
+from vizstack._lazy import lazy_attributes
+
+# Public names are loaded lazily from the modules defining them, so that `import vizstack` does not
+# import every assembler and helper up front. New public names must be registered here.
+_ATTRIBUTES = {
+    # vizstack.view_assembler
+    'assemble': 'vizstack.view_assembler',
+    'assemble_many': 'vizstack.view_assembler',
+    'assemble_partial': 'vizstack.view_assembler',
+    'assemble_roots': 'vizstack.view_assembler',
+    'view': 'vizstack.view_assembler',
+    'Assembly': 'vizstack.view_assembler',
+    'is_stub': 'vizstack.view_assembler',
+    # vizstack.assemblers
+    'Buffer': 'vizstack.assemblers',
+    'Dag': 'vizstack.assemblers',
+    'Flow': 'vizstack.assemblers',
+    'Grid': 'vizstack.assemblers',
+    'Icon': 'vizstack.assemblers',
+    'Image': 'vizstack.assemblers',
+    'KeyValue': 'vizstack.assemblers',
+    'Sequence': 'vizstack.assemblers',
+    'Series': 'vizstack.assemblers',
+    'Switch': 'vizstack.assemblers',
+    'Table': 'vizstack.assemblers',
+    'Text': 'vizstack.assemblers',
+    'Token': 'vizstack.assemblers',
+    # vizstack.diffing
+    'diff': 'vizstack.diffing',
+    'diff_view': 'vizstack.diffing',
+    # vizstack.instrument
+    'AssemblyHook': 'vizstack.instrument',
+    'FragmentEvent': 'vizstack.instrument',
+    'MetricsCollector': 'vizstack.instrument',
+    # vizstack.logger
+    'log': 'vizstack.logger',
+    # vizstack.serve
+    'FragmentServer': 'vizstack.serve',
+    # vizstack.spill
+    'assemble_spilled': 'vizstack.spill',
+    'SpilledView': 'vizstack.spill',
+    # vizstack.text_renderer
+    'render_text': 'vizstack.text_renderer',
+    # vizstack.transport
+    'ViewPublisher': 'vizstack.transport',
+    'ViewCollector': 'vizstack.transport',
+    # vizstack.validation
+    'validate': 'vizstack.validation',
+    # vizstack.view_index
+    'ViewIndex': 'vizstack.view_index',
+    # vizstack.watcher
+    'watch': 'vizstack.watcher',
+}
+
+# `from vizstack import *` imports only the assembly API, as it always has; the other tools are
+# attributes of `vizstack`, loaded on first access, or can be imported from their modules.
+__all__ = [
+    name for name, module in _ATTRIBUTES.items()
+    if module in ('vizstack.view_assembler', 'vizstack.assemblers')
+]
+
+__getattr__, __dir__ = lazy_attributes(globals(), _ATTRIBUTES)
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from vizstack.view_assembler import *
+    from vizstack.assemblers import *
+    from vizstack.diffing import *
+    from vizstack.instrument import *
+    from vizstack.logger import log
+    from vizstack.serve import *
+    from vizstack.spill import *
+    from vizstack.text_renderer import *
+    from vizstack.transport import *
+    from vizstack.validation import *
+    from vizstack.view_index import *
+    from vizstack.watcher import watch
@@ -0,0 +1,129 @@
+"""Command-line tools which inspect `View` files by streaming through them, not loading them.
+
+Examples::
+
+    python -m vizstack stats dump.json --top 20
+    python -m vizstack extract dump.json 4sk0Y2cvbV --output subtree.json
+    python -m vizstack convert dump.json dump.ndjson
+    python -m vizstack convert dump.ndjson - --to compact
+
+Formats are "json", "compact" and "ndjson"; see `vizstack.viewfile`. The input format is guessed
+from the file extension unless `--from` is given, and the output format from the output's extension
+unless `--to` is given. "-" reads from stdin or writes to stdout, except that `extract` reads its
+input twice, and so needs a file.
+"""
+import argparse
+import json
+import sys
+from contextlib import contextmanager
+from typing import IO, Iterator, List, Optional
+
+from vizstack.viewfile import (
+    FORMATS, ViewFileWriter, compute_stats, get_subtree_ids, guess_format, iter_view_items
+)
+
+
+@contextmanager
+def _open(path: str, mode: str) -> Iterator[IO[str]]:
+    if path == '-':
+        yield sys.stdin if mode == 'r' else sys.stdout
+    else:
+        with open(path, mode) as f:
+            yield f
+
+
+def _stats(args: argparse.Namespace) -> int:
+    with _open(args.input, 'r') as f:
+        items = iter_view_items(f, args.input_format or guess_format(args.input))
+        stats = compute_stats(items, top=args.top)
+    if args.json:
+        json.dump(stats, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+        return 0
+    print('{} fragments, {} bytes, {} unreachable'.format(stats['numFragments'], stats['bytes'],
+                                                          stats['unreachable']))
+    print('\nBy type:')
+    for frag_type, entry in sorted(stats['types'].items(), key=lambda item: -item[1]['bytes']):
+        print('  {:<28} {:>10} {:>14}'.format(frag_type, entry['count'], entry['bytes']))
+    print('\nBy depth:')
+    for depth, count in stats['depths'].items():
+        print('  {:<28} {:>10}'.format(depth, count))
+    print('\nLargest subtrees:')
+    for subtree in stats['largestSubtrees']:
+        print('  {:<14} {:<20} {:>10} {:>14}'.format(subtree['id'], subtree['type'],
+                                                     subtree['fragments'], subtree['bytes']))
+    return 0
+
+
+def _extract(args: argparse.Namespace) -> int:
+    if args.input == '-':
+        print('extract reads its input twice, so it cannot read from stdin.', file=sys.stderr)
+        return 2
+    input_format = args.input_format or guess_format(args.input)
+    with open(args.input) as f:
+        try:
+            subtree_ids = get_subtree_ids(iter_view_items(f, input_format), args.id)
+        except KeyError:
+            print('No fragment with id {}.'.format(args.id), file=sys.stderr)
+            return 1
+    with open(args.input) as f, _open(args.output, 'w') as out:
+        writer = ViewFileWriter(out, args.output_format or guess_format(args.output))
+        writer.write_header('rootId', args.id)
+        for kind, frag_id, fragment, _ in iter_view_items(f, input_format):
+            if kind == 'fragment' and frag_id in subtree_ids:
+                writer.write_fragment(frag_id, fragment)
+        writer.close()
+    return 0
+
+
+def _convert(args: argparse.Namespace) -> int:
+    with _open(args.input, 'r') as f, _open(args.output, 'w') as out:
+        writer = ViewFileWriter(out, args.output_format or guess_format(args.output))
+        for item in iter_view_items(f, args.input_format or guess_format(args.input)):
+            writer.write_item(item)
+        writer.close()
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m vizstack', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+
+    stats_parser = subparsers.add_parser('stats', help='Summarize the fragments of a View.')
+    stats_parser.add_argument('input')
+    stats_parser.add_argument('--from', dest='input_format', choices=FORMATS, default=None)
+    stats_parser.add_argument(
+        '--top', type=int, default=10, help='The number of largest subtrees to list.'
+    )
+    stats_parser.add_argument('--json', action='store_true', help='Print the statistics as JSON.')
+    stats_parser.set_defaults(func=_stats)
+
+    extract_parser = subparsers.add_parser(
+        'extract', help='Write the subtree rooted at a fragment as a View.'
+    )
+    extract_parser.add_argument('input')
+    extract_parser.add_argument('id')
+    extract_parser.add_argument('--output', '-o', default='-', help='Defaults to stdout.')
+    extract_parser.add_argument('--from', dest='input_format', choices=FORMATS, default=None)
+    extract_parser.add_argument('--to', dest='output_format', choices=FORMATS, default=None)
+    extract_parser.set_defaults(func=_extract)
+
+    convert_parser = subparsers.add_parser('convert', help='Convert a View between formats.')
+    convert_parser.add_argument('input')
+    convert_parser.add_argument('output')
+    convert_parser.add_argument('--from', dest='input_format', choices=FORMATS, default=None)
+    convert_parser.add_argument('--to', dest='output_format', choices=FORMATS, default=None)
+    convert_parser.set_defaults(func=_convert)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.func(args)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""Module-level lazy attribute loading (PEP 562), which keeps `import vizstack` cheap.
+
+A package lists the public names it exports and the submodule defining each; a submodule is only
+imported the first time one of its names is accessed.
+"""
+from __future__ import annotations
+import sys
+
+# `typing` is not imported at runtime, since it alone costs more than the rest of `import vizstack`.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_attributes(namespace: Dict[str, Any], attributes: Dict[str, str]
+                    ) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Returns `__getattr__()` and `__dir__()` functions for a package.
+
+    Args:
+        namespace: The `globals()` of the package.
+        attributes: A mapping of each public name to the module which defines it.
+
+    Returns:
+        A `__getattr__()` which imports the defining module of a name on first access and caches the
+        value in `namespace`, and a `__dir__()` which lists all of the public names.
+    """
+
+    def __getattr__(name: str) -> Any:
+        try:
+            module = attributes[name]
+        except KeyError:
+            raise AttributeError(
+                'module {!r} has no attribute {!r}'.format(namespace['__name__'], name)
+            )
+        __import__(module)
+        value = getattr(sys.modules[module], name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(attributes))
+
+    return __getattr__, __dir__
@@ -1,12 +1,41 @@
-from vizstack.assemblers.dag import Dag
-from vizstack.assemblers.flow import Flow
-from vizstack.assemblers.grid import Grid
-from vizstack.assemblers.icon import Icon
-from vizstack.assemblers.image import Image
-from vizstack.assemblers.keyvalue import KeyValue
-from vizstack.assemblers.sequence import Sequence
-from vizstack.assemblers.switch import Switch
-from vizstack.assemblers.text import Text
-from vizstack.assemblers.token import Token
-
-__all__ = ['Dag', 'Flow', 'Grid', 'Icon', 'Image', 'KeyValue', 'Sequence', 'Switch', 'Text', 'Token']
+from vizstack._lazy import lazy_attributes
+
+# Each assembler module is only imported when its assembler is first used.
+_ATTRIBUTES = {
+    'Buffer': 'vizstack.assemblers.buffer',
+    'Dag': 'vizstack.assemblers.dag',
+    'Flow': 'vizstack.assemblers.flow',
+    'Grid': 'vizstack.assemblers.grid',
+    'Icon': 'vizstack.assemblers.icon',
+    'Image': 'vizstack.assemblers.image',
+    'KeyValue': 'vizstack.assemblers.keyvalue',
+    'Sequence': 'vizstack.assemblers.sequence',
+    'Series': 'vizstack.assemblers.series',
+    'Switch': 'vizstack.assemblers.switch',
+    'Table': 'vizstack.assemblers.table',
+    'Text': 'vizstack.assemblers.text',
+    'Token': 'vizstack.assemblers.token',
+}
+
+__all__ = [
+    'Buffer', 'Dag', 'Flow', 'Grid', 'Icon', 'Image', 'KeyValue', 'Sequence', 'Series', 'Switch',
+    'Table', 'Text', 'Token'
+]
+
+__getattr__, __dir__ = lazy_attributes(globals(), _ATTRIBUTES)
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from vizstack.assemblers.buffer import Buffer
+    from vizstack.assemblers.dag import Dag
+    from vizstack.assemblers.flow import Flow
+    from vizstack.assemblers.grid import Grid
+    from vizstack.assemblers.icon import Icon
+    from vizstack.assemblers.image import Image
+    from vizstack.assemblers.keyvalue import KeyValue
+    from vizstack.assemblers.sequence import Sequence
+    from vizstack.assemblers.series import Series
+    from vizstack.assemblers.switch import Switch
+    from vizstack.assemblers.table import Table
+    from vizstack.assemblers.text import Text
+    from vizstack.assemblers.token import Token
@@ -0,0 +1,107 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+from collections import deque
+from itertools import islice
+import random
+
+from vizstack.schema import JsonType
+
+if TYPE_CHECKING:
+    from typing_extensions import Literal
+
+    Sampling = Literal['head', 'head_tail', 'reservoir']
+
+
+class Stream:
+    """Elements pulled lazily from an iterable, at most `limit` of which are kept.
+
+    Nothing is pulled until `take()` is first called, typically during assembly; the result is then
+    kept, so that assembling the same `Fragment` again shows the same elements.
+    """
+
+    def __init__(self, iterable: Iterable[Any], limit: int, sampling: Sampling = 'head',
+                 max_items: Optional[int] = None) -> None:
+        """
+        Args:
+            iterable: The source of the elements.
+            limit: The maximum number of elements to keep.
+            sampling: Which elements to keep: "head" keeps the first `limit` elements and stops
+                pulling after them; "head_tail" keeps the first and last `limit // 2` or so; and
+                "reservoir" keeps a uniform random sample. The latter two pull every element.
+            max_items: The maximum number of elements to pull from `iterable`, for sources which
+                are too long (or infinite) to pull in full.
+        """
+        if sampling not in ('head', 'head_tail', 'reservoir'):
+            raise ValueError('Unknown sampling: {}'.format(sampling))
+        if limit < 0:
+            raise ValueError('Limit must be non-negative, got {}.'.format(limit))
+        self._iterable = iterable
+        self._limit = limit
+        self._sampling = sampling
+        self._max_items = max_items
+        self._taken: Optional[Tuple[List[Any], Dict[str, JsonType]]] = None
+
+    def take(self) -> Tuple[List[Any], Dict[str, JsonType]]:
+        """Returns the kept elements, in their original order, and a description of the sampling:
+        {"sampling", "consumed" (the number of elements pulled), "exhausted" (whether the iterable
+        ended), and "indices" (the original positions of the kept elements, unless they are simply
+        the first ones)}."""
+        if self._taken is None:
+            self._taken = self._take()
+            # Drop the reference to the source, which may hold large resources
+            self._iterable = ()
+        return self._taken
+
+    def _take(self) -> Tuple[List[Any], Dict[str, JsonType]]:
+        iterator = iter(self._iterable)
+        if self._max_items is not None:
+            iterator = islice(iterator, self._max_items)
+        limit = self._limit
+        indices: Optional[List[int]] = None
+        if self._sampling == 'head':
+            elements = list(islice(iterator, limit))
+            consumed = len(elements)
+            # Pull one more element only to learn whether the iterator is exhausted
+            exhausted = len(elements) < limit or next(iterator, _END) is _END
+            consumed += 0 if exhausted else 1
+        elif self._sampling == 'head_tail':
+            elements = list(islice(iterator, (limit + 1) // 2))
+            tail: deque = deque(maxlen=limit - len(elements))
+            consumed = len(elements)
+            for consumed, elem in enumerate(iterator, consumed + 1):
+                tail.append(elem)
+            indices = list(range(len(elements))) + list(range(consumed - len(tail), consumed))
+            elements.extend(tail)
+            exhausted = True
+        else:
+            # Algorithm R: after n elements, each has been kept with probability `limit / n`
+            elements = []
+            indices = []
+            consumed = 0
+            for consumed, elem in enumerate(iterator, 1):
+                if len(elements) < limit:
+                    elements.append(elem)
+                    indices.append(consumed - 1)
+                else:
+                    slot = random.randrange(consumed)
+                    if slot < limit:
+                        elements[slot] = elem
+                        indices[slot] = consumed - 1
+            order = sorted(range(len(elements)), key=indices.__getitem__)
+            elements = [elements[i] for i in order]
+            indices = [indices[i] for i in order]
+            exhausted = True
+        if self._max_items is not None and consumed >= self._max_items:
+            # The cap, rather than the source, ended the iteration
+            exhausted = False
+        info: Dict[str, JsonType] = {
+            'sampling': self._sampling,
+            'consumed': consumed,
+            'exhausted': exhausted,
+        }
+        if indices is not None and indices != list(range(len(indices))):
+            info['indices'] = indices  # type: ignore
+        return elements, info
+
+
+_END = object()
@@ -0,0 +1,142 @@
+from __future__ import annotations
+from vizstack.fragment_assembler import FragmentAssembler
+from typing import Optional, Tuple, Dict, List, Any, cast
+from vizstack.schema import JsonType, View, Fragment
+
+# The maximum number of bytes returned by a single `expand()`, however many are requested.
+_MAX_EXPAND_BYTES = 2**16
+
+# Typecodes whose items are simply bytes, which the hexdump already shows.
+_BYTE_FORMATS = ('B', 'b', 'c')
+
+
+class Buffer(FragmentAssembler):
+    """
+    A View which renders a binary buffer, such as `bytes` or an `array.array`, as a hexdump.
+
+    Only the length and the bytes at the start and at the end of the buffer are emitted; other
+    windows are fetched with `expand()`. Windows are sliced from a `memoryview`, so the buffer is
+    never copied (only the rows spanning a window of a non-contiguous buffer are), and the cost of
+    assembling does not depend on its size. Buffers with a typecode, such as `array.array('f')`,
+    also show the typed values of each window.
+    """
+
+    def __init__(self, data: Any, window: int = 256) -> None:
+        """
+        Args:
+            data: Any object supporting the buffer protocol, e.g. `bytes`, `bytearray`,
+                `memoryview`, `array.array` or a NumPy array.
+            window: The number of bytes to emit from each of the start and the end of the buffer.
+        """
+        super(Buffer, self).__init__()
+        if window < 0:
+            raise ValueError('Window must be non-negative, got {}.'.format(window))
+        self._data = data
+        # The `memoryview` is only held while slicing, since a `bytearray` cannot be resized while
+        # one exists
+        with memoryview(data) as view:
+            self._length = view.nbytes
+            self._format = view.format
+            self._item_size = view.itemsize
+            self._contiguous = view.c_contiguous
+        self._window = window - window % self._item_size if self._item_size > 1 else window
+
+    def assemble(self, get_id) -> Tuple[Fragment, List[Any]]:
+        length = self._length
+        window = self._window
+        if length <= 2 * window:
+            head, tail = self._get_window(0, length), None
+        else:
+            tail_start = length - window
+            tail_start -= tail_start % self._item_size
+            head, tail = self._get_window(0, window), self._get_window(tail_start, length)
+        return {
+            'type': 'BufferPrimitive',
+            'contents': {
+                'length': length,
+                'format': self._format,
+                'itemSize': self._item_size,
+                'head': head,
+                'tail': tail,
+            },
+            'meta': self._meta,
+        }, []
+
+    def expand(self, request: Dict[str, Any]) -> Dict[str, JsonType]:
+        """Returns a window of the buffer.
+
+        Args:
+            request: {"start": <byte offset>, "end": <byte offset>}, where the window is
+                [start, end). Offsets are rounded down to whole items. Returns a window as in the
+                "head" of the assembled `Fragment`.
+
+        Raises:
+            ValueError: If `request` is invalid.
+        """
+        try:
+            start, end = int(request['start']), int(request['end'])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(
+                'Expected {{"start": <byte offset>, "end": <byte offset>}}, got: {}'.format(request)
+            )
+        if start < 0 or end < start:
+            raise ValueError('Invalid window: {}'.format(request))
+        start = min(start, self._length)
+        end = min(end, self._length, start + _MAX_EXPAND_BYTES)
+        item_size = self._item_size
+        return self._get_window(start - start % item_size, end - end % item_size)
+
+    def _get_window(self, start: int, end: int) -> Dict[str, JsonType]:
+        window: Dict[str, JsonType] = {'start': start, 'end': end}
+        with memoryview(self._data) as view:
+            if self._contiguous:
+                with view.cast('B') as raw:
+                    with raw[start:end] as sliced:
+                        self._set_contents(window, sliced)
+            else:
+                # Only a contiguous buffer can be viewed as bytes; any other has just the window
+                # copied
+                with memoryview(_copy_bytes(view, start, end)) as sliced:
+                    self._set_contents(window, sliced)
+        return window
+
+    def _set_contents(self, window: Dict[str, JsonType], sliced: memoryview) -> None:
+        window['hex'] = sliced.hex()
+        if self._format not in _BYTE_FORMATS:
+            window['values'] = _get_values(sliced, self._format)
+
+
+def _copy_bytes(view: memoryview, start: int, end: int) -> bytes:
+    """Returns bytes [start, end) of a non-contiguous buffer, in C order, copying only the rows
+    spanning them.
+
+    A `memoryview` can only be sliced along its first dimension, so a window of a multi-dimensional
+    buffer copies whole rows; a window of a one-dimensional buffer copies just its items.
+    """
+    # A non-contiguous buffer has at least one dimension, so `shape` is never empty
+    shape = view.shape
+    if start >= end or not shape:
+        return b''
+    row_size = view.nbytes // shape[0]
+    first, last = start // row_size, -(-end // row_size)
+    with view[first:last] as rows:
+        copied = rows.tobytes()
+    offset = first * row_size
+    return copied[start - offset:end - offset]
+
+
+def _get_values(raw: memoryview, fmt: str) -> Optional[List[JsonType]]:
+    """Returns the typed values of a slice of bytes, or `None` if their format cannot be decoded."""
+    try:
+        # Typeshed only accepts literal formats, but `fmt` is known only at run time
+        with cast(Any, raw).cast(fmt) as typed:
+            values = typed.tolist()
+    except (TypeError, ValueError, NotImplementedError):
+        # `cast()` only supports single native formats, not, e.g., structs or explicit byte orders
+        return None
+    if values and isinstance(values[0], float):
+        # NaN and infinity cannot be represented in JSON
+        values = [
+            v if v == v and v not in (float('inf'), float('-inf')) else str(v) for v in values
+        ]
+    return values
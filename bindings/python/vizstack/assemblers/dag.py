@@ -1,50 +1,98 @@
+from __future__ import annotations
 from vizstack.fragment_assembler import FragmentAssembler
-from typing import Optional, Tuple, Dict, List, Any, Union, cast
-from typing_extensions import Literal, TypedDict
-from vizstack.schema import JsonType, View, Fragment
+from typing import TYPE_CHECKING, Optional, Tuple, Dict, List, Any, Union, Hashable, TypeVar
+from vizstack.schema import JsonType, View, Fragment, FragmentId
 from collections import defaultdict
 
-
-FlowDirection = Literal['north', 'south', 'east', 'west', None]
-Side = Literal['north', 'south', 'east', 'west', None]
-
-Port = TypedDict('Port', {
-    'side': Side,
-    'order': Optional[int],
-    'label': Optional[str],
-}, total=False)
-
-NodeAlignment = TypedDict('NodeAlignment', {
-    'axis': Literal['x', 'y'],
-    'justify': Literal['north', 'south', 'east', 'west', 'center', None],
-    'nodes': List[str],
-}, total=False)
-
-Node = TypedDict('Node', {
-    'flowDirection': FlowDirection,
-    'isExpanded': Optional[bool],
-    'alignChildren': Optional[bool],
-    'isInteractive': Optional[bool],
-    'isVisible': Optional[bool],
-    'label': Optional[str],
-    'parent': Optional[str],
-    'children': Optional[List[str]],
-    'ports': Dict[str, Port],
-}, total=False)
-
-Endpoint = TypedDict('Endpoint', {
-    'id': str,
-    'port': Optional[str],
-    'label': Optional[str],
-    'isPersistent': Optional[bool],
-}, total=False)
-
-Edge = TypedDict('Edge', {
-    'source': Endpoint,
-    'target': Endpoint,
-    'label': Optional[str],
-    'temporal': bool,  # TODO: remove this hack
-}, total=False)
+if TYPE_CHECKING:
+    from typing_extensions import Literal, TypedDict
+
+    FlowDirection = Literal['north', 'south', 'east', 'west', None]
+    Side = Literal['north', 'south', 'east', 'west', None]
+
+    Port = TypedDict('Port', {
+        'side': Side,
+        'order': Optional[int],
+        'label': Optional[str],
+    }, total=False)
+
+    NodeAlignment = TypedDict('NodeAlignment', {
+        'axis': Literal['x', 'y'],
+        'justify': Literal['north', 'south', 'east', 'west', 'center', None],
+        'nodes': List[str],
+    }, total=False)
+
+    Node = TypedDict('Node', {
+        'flowDirection': FlowDirection,
+        'isExpanded': Optional[bool],
+        'alignChildren': Optional[bool],
+        'isInteractive': Optional[bool],
+        'isVisible': Optional[bool],
+        'label': Optional[str],
+        'parent': Optional[str],
+        'children': Optional[List[str]],
+        'ports': Dict[str, Port],
+    }, total=False)
+
+    Endpoint = TypedDict('Endpoint', {
+        'id': str,
+        'port': Optional[str],
+        'label': Optional[str],
+        'isPersistent': Optional[bool],
+    }, total=False)
+
+    Edge = TypedDict('Edge', {
+        'source': Endpoint,
+        'target': Endpoint,
+        'label': Optional[str],
+        'temporal': bool,  # TODO: remove this hack
+    }, total=False)
+
+
+_Node = TypeVar('_Node', bound=Hashable)
+
+
+def _drop_back_edges(nodes: List[_Node], edges: Dict[_Node, List[Tuple[_Node, Any]]]
+                     ) -> Dict[_Node, List[Tuple[_Node, Any]]]:
+    """Returns a copy of a graph's edges without those which close a cycle, so that the graph can be
+    laid out as a `Dag`.
+
+    Edges are found by a depth-first search which starts from `nodes` in order, so edges out of
+    earlier nodes are preferred.
+
+    Args:
+        nodes: The nodes of the graph.
+        edges: A mapping of each node to its outgoing edges, as (target node, data) pairs.
+    """
+    acyclic: Dict[_Node, List[Tuple[_Node, Any]]] = {node: [] for node in nodes}
+    # 0: unvisited, 1: on the current path, 2: done
+    state: Dict[_Node, int] = {node: 0 for node in nodes}
+    for start in nodes:
+        if state[start]:
+            continue
+        state[start] = 1
+        stack = [(start, iter(edges[start]))]
+        while stack:
+            node, remaining = stack[-1]
+            for target, data in remaining:
+                if state[target] == 1:
+                    continue
+                acyclic[node].append((target, data))
+                if state[target] == 0:
+                    state[target] = 1
+                    stack.append((target, iter(edges[target])))
+                    break
+            else:
+                state[node] = 2
+                stack.pop()
+    return acyclic
+
+
+def _reference(ref: Union[FragmentId, Fragment]) -> Dict[str, Any]:
+    # `get_id()` returns a `Fragment` to be embedded, rather than a `FragmentId`, for inlined items
+    if isinstance(ref, str):
+        return {'fragmentId': ref}
+    return {'fragment': ref}
 
 
 class Dag(FragmentAssembler):
@@ -135,8 +183,7 @@ class Dag(FragmentAssembler):
             'source': { 'id': source } if isinstance(source, str) else source,
             'target': { 'id': target } if isinstance(target, str) else target,
         }
-        if label is not Node:
-            edge['label'] = label
+        edge['label'] = label
         edge['temporal'] = temporal
         self._edges.append(edge)
         return self
@@ -146,36 +193,21 @@ class Dag(FragmentAssembler):
         return self
 
     def assemble(self, get_id) -> Tuple[Fragment, List[Any]]:
-        for node_id in self._nodes:
-            # All nodes must have an item
-            assert node_id in self._items, 'No item was provided for node "{}".'.format(node_id)
-            # All node parents must exist
-            assert self._nodes[node_id]['parent'] is None or self._nodes[node_id][
-                'parent'] in self._nodes, 'Parent node "{}" not found for child "{}".'.format(
-                self._nodes[node_id]['parent'], node_id)
-        for edge in self._edges:
-            sourceId = edge['source']['id'] 
-            targetId = edge['target']['id']
-            # All edges must connect real nodes
-            assert sourceId in self._nodes, 'An edge starts at non-existent node "{}".'.format(sourceId)
-            assert targetId in self._nodes, 'An edge ends at non-existent node "{}".'.format(targetId)
-            # All edge ports must exist
-            if 'port' in edge['source']:
-                sourcePort = edge['source']['port']
-                assert sourcePort in self._nodes[sourceId][
-                    'ports'], 'An edge starts at non-existent port "{}" on node "{}".'.format(sourcePort, sourceId)
-            if 'port' in edge['target']:
-                targetPort = edge['target']['port']
-                assert targetPort in self._nodes[targetId][
-                    'ports'], 'An edge ends at non-existent port "{}" on node "{}".'.format(targetPort, targetId)
+        self._check()
+        # Group the nodes by parent in one pass, in the order they were added
+        children: Dict[str, List[JsonType]] = defaultdict(list)
+        for node_id, node in self._nodes.items():
+            if node['parent'] is not None:
+                children[node['parent']].append(node_id)
         return {
             'type': 'DagLayout',
             'contents': {
                 'nodes':
                     {node_id: {
-                    **{key: value for key, value in node.items() if value is not None and key is not 'parent'},
-                    'fragmentId': get_id(self._items[node_id], 'n{}'.format(node_id)),
-                    'children': [_node_id for _node_id in self._nodes if self._nodes[_node_id]['parent'] == node_id]}
+                    **{key: value for key, value in node.items()
+                       if value is not None and key != 'parent'},
+                    **_reference(get_id(self._items[node_id], 'n{}'.format(node_id), True)),
+                    'children': children.get(node_id, [])}
                      for node_id, node in self._nodes.items()},
                 'edges':
                     {'e{}'.format(i): edge
@@ -188,3 +220,26 @@ class Dag(FragmentAssembler):
             },
             'meta': self._meta,
         }, [self._items[node_id] for node_id in self._nodes]
+
+    def _check(self) -> None:
+        """Raises a `ValueError` if the nodes and edges are inconsistent."""
+        for node_id, node in self._nodes.items():
+            # All nodes must have an item
+            if node_id not in self._items:
+                raise ValueError('No item was provided for node "{}".'.format(node_id))
+            # All node parents must exist
+            if node['parent'] is not None and node['parent'] not in self._nodes:
+                raise ValueError(
+                    'Parent node "{}" not found for child "{}".'.format(node['parent'], node_id)
+                )
+        for edge in self._edges:
+            for end, verb in (('source', 'starts'), ('target', 'ends')):
+                end_id = edge[end]['id']  # type: ignore
+                # All edges must connect real nodes
+                if end_id not in self._nodes:
+                    raise ValueError('An edge {} at non-existent node "{}".'.format(verb, end_id))
+                # All edge ports must exist
+                port = edge[end].get('port')  # type: ignore
+                if port is not None and port not in self._nodes[end_id].get('ports', {}):
+                    message = 'An edge {} at non-existent port "{}" on node "{}".'
+                    raise ValueError(message.format(verb, port, end_id))
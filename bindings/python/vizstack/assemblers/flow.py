@@ -1,14 +1,20 @@
+from __future__ import annotations
 from vizstack.fragment_assembler import FragmentAssembler
-from typing import Optional, Tuple, Dict, List, Any, Iterable
+from typing import TYPE_CHECKING, Optional, Tuple, Dict, List, Any, Iterable
 from vizstack.schema import JsonType, View, Fragment
+from vizstack.assemblers._stream import Stream
+
+if TYPE_CHECKING:
+    from vizstack.assemblers._stream import Sampling
 
 
 class Flow(FragmentAssembler):
     """
     A View which renders other Views as a series of inline elements.
     """
+    _stream: Optional[Stream] = None
 
-    def __init__(self, *items: Iterable[Any]) -> None:
+    def __init__(self, *items: Any) -> None:
         """
         Args:
             items: A sequence of objects which should be visualized.
@@ -16,6 +22,18 @@ class Flow(FragmentAssembler):
         super(Flow, self).__init__()
         self._elements = list(items)
 
+    @classmethod
+    def from_iterable(cls,
+                      iterable: Iterable[Any],
+                      limit: int = 100,
+                      sampling: Sampling = 'head',
+                      max_items: Optional[int] = None) -> 'Flow':
+        """Returns a `Flow` of at most `limit` elements of `iterable`, pulled lazily when the `Flow`
+        is assembled; see `Sequence.from_iterable()`."""
+        flow = cls()
+        flow._stream = Stream(iterable, limit, sampling, max_items)
+        return flow
+
     def item(self, item: Any):
         self._elements.append(item)
         return self
@@ -25,10 +43,15 @@ class Flow(FragmentAssembler):
         return self
 
     def assemble(self, get_id) -> Tuple[Fragment, List[Any]]:
+        elements, stream = self._elements, None
+        if self._stream is not None:
+            pulled, stream = self._stream.take()
+            elements = elements + pulled
         return {
             'type': 'FlowLayout',
             'contents': {
-                'elements': [get_id(elem, '{}'.format(i)) for i, elem in enumerate(self._elements)],
+                'elements': [get_id(elem, '{}'.format(i), True) for i, elem in enumerate(elements)],
+                'stream': stream,
             },
             'meta': self._meta,
-        }, self._elements
+        }, elements
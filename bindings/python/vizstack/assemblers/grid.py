@@ -1,39 +1,45 @@
+from __future__ import annotations
 from vizstack.fragment_assembler import FragmentAssembler
-from typing import Optional, Tuple, Dict, List, Any, Union
-from typing_extensions import TypedDict, Literal
-from vizstack.schema import JsonType, View, Fragment
+from typing import TYPE_CHECKING, Optional, Tuple, Dict, List, Any, Union
+from vizstack.schema import JsonType, View, Fragment, FragmentId
+from functools import lru_cache
 import re
 
+if TYPE_CHECKING:
+    from typing_extensions import TypedDict, Literal
 
-GridCell = TypedDict('GridCell', {
-    'col': int,
-    'row': int,
-    'width': int,
-    'height': int,
-})
+    GridCell = TypedDict('GridCell', {
+        'col': int,
+        'row': int,
+        'width': int,
+        'height': int,
+    })
 
-GridCellNamed = TypedDict('GridCellNamed', {
-    'col': int,
-    'row': int,
-    'width': int,
-    'height': int,
-    'name': str,
-})
+    GridCellNamed = TypedDict('GridCellNamed', {
+        'col': int,
+        'row': int,
+        'width': int,
+        'height': int,
+        'name': str,
+    })
 
-GridBounds = TypedDict('GridBounds', {
-    'r': int,
-    'c': int,
-    'R': int,
-    'C': int,
-})
+    GridBounds = TypedDict('GridBounds', {
+        'r': int,
+        'c': int,
+        'R': int,
+        'C': int,
+    })
 
-RowColSetting = Literal['fit', 'equal', None]
+    RowColSetting = Literal['fit', 'equal', None]
 
 
 def _within_bounds(bounds: GridBounds, row: int, col: int) -> bool:
     return bounds['r'] <= row <= bounds['R'] and bounds['c'] <= col <= bounds['C']
 
 
+# Grid specification strings are typically literals in `__view__()` methods, so the same few are
+# parsed over and over. `lru_cache` is thread-safe; the cells it returns are copied before use.
+@lru_cache(maxsize=256)
 def _parse_grid_string(spec: str) -> Dict[str, GridCell]:
     rows = re.split("\||\n", spec)
     rows = ["".join(row.split()) for row in rows]
@@ -68,6 +74,13 @@ def _parse_grid_string(spec: str) -> Dict[str, GridCell]:
     } for name, bound in bounds.items()}
 
 
+def _with_reference(cell: GridCell, ref: Union[FragmentId, Fragment]) -> Dict[str, Any]:
+    # `get_id()` returns a `Fragment` to be embedded, rather than a `FragmentId`, for inlined items
+    if isinstance(ref, str):
+        return {**cell, 'fragmentId': ref}
+    return {**cell, 'fragment': ref}
+
+
 class Grid(FragmentAssembler):
 
     _NONE_SPECIFIED = object()
@@ -101,7 +114,7 @@ class Grid(FragmentAssembler):
                     'height': cell['height'],
                 }
         elif isinstance(cells, str):
-            self._cells = _parse_grid_string(cells)
+            self._cells = {name: {**cell} for name, cell in _parse_grid_string(cells).items()}
         else:
             raise ValueError('Unknown format received for cells:' + str(cells))
 
@@ -136,12 +149,15 @@ class Grid(FragmentAssembler):
 
     def assemble(self, get_id) -> Tuple[Fragment, List[Any]]:
         for cell_name in self._cells:
-            assert cell_name in self._items, 'No item was provided for cell "{}".'.format(cell_name)
+            if cell_name not in self._items:
+                raise ValueError('No item was provided for cell "{}".'.format(cell_name))
         return {
                    'type': 'GridLayout',
                    'contents': {
-                       'cells': [{**cell, 'fragmentId': get_id(self._items[cell_name], cell_name)}
-                                 for cell_name, cell in self._cells.items()],
+                       'cells': [
+                           _with_reference(cell, get_id(self._items[cell_name], cell_name, True))
+                           for cell_name, cell in self._cells.items()
+                       ],
                        'rowHeight': self._row_height,
                        'colWidth': self._col_width,
                        'showLabels': self._show_labels,
@@ -1,10 +1,13 @@
+from __future__ import annotations
 from vizstack.fragment_assembler import FragmentAssembler
-from typing import Optional, Tuple, Dict, List, Any
-from typing_extensions import Literal
+from typing import TYPE_CHECKING, Optional, Tuple, Dict, List, Any
 from vizstack.schema import JsonType, View, Fragment
 
 
-Emphasis = Literal['normal', 'less', 'more', None]
+if TYPE_CHECKING:
+    from typing_extensions import Literal
+
+    Emphasis = Literal['normal', 'less', 'more', None]
 
 
 class Icon(FragmentAssembler):
@@ -1,6 +1,5 @@
 from vizstack.fragment_assembler import FragmentAssembler
 from typing import Optional, Tuple, Dict, List, Any
-from typing_extensions import Literal
 from vizstack.schema import JsonType, View, Fragment
 import os
 
@@ -51,7 +51,8 @@ class KeyValue(FragmentAssembler):
             'type': 'KeyValueLayout',
             'contents': {
                 'entries': [
-                    {'key': get_id(key, '{}k'.format(i)), 'value': get_id(value, '{}v'.format(i))}
+                    {'key': get_id(key, '{}k'.format(i), True),
+                     'value': get_id(value, '{}v'.format(i), True)}
                     for i, (key, value) in enumerate(self._entries)],
                 'separator': self._separator,
                 'startMotif': self._start_motif,
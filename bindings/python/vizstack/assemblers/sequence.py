@@ -1,10 +1,15 @@
+from __future__ import annotations
 from vizstack.fragment_assembler import FragmentAssembler
-from typing import Optional, Tuple, Dict, List, Any, Iterable
-from typing_extensions import Literal
+from typing import TYPE_CHECKING, Optional, Tuple, Dict, List, Any, Iterable
 from vizstack.schema import JsonType, View, Fragment
+from vizstack.assemblers._stream import Stream
 
 
-Orientation = Literal['horizontal', 'vertical', None]
+if TYPE_CHECKING:
+    from typing_extensions import Literal
+
+    Orientation = Literal['horizontal', 'vertical', None]
+    from vizstack.assemblers._stream import Sampling
 
 
 class Sequence(FragmentAssembler):
@@ -15,6 +20,7 @@ class Sequence(FragmentAssembler):
     _start_motif: Optional[str] = None
     _end_motif: Optional[str] = None
     _show_labels: Optional[bool] = None
+    _stream: Optional[Stream] = None
 
     def __init__(self,
                  elements: Optional[Iterable[Any]] = None,
@@ -31,6 +37,30 @@ class Sequence(FragmentAssembler):
                     end_motif=end_motif,
                     show_labels=show_labels)
 
+    @classmethod
+    def from_iterable(cls,
+                      iterable: Iterable[Any],
+                      limit: int = 100,
+                      sampling: Sampling = 'head',
+                      max_items: Optional[int] = None) -> 'Sequence':
+        """Returns a `Sequence` of at most `limit` elements of `iterable`, which are pulled lazily
+        when the `Sequence` is assembled rather than copied into a `list` up front.
+
+        The assembled contents include "stream", which records how the elements were chosen and
+        whether `iterable` was exhausted. Elements added with `item()` precede the pulled ones.
+
+        Args:
+            iterable: The source of the elements, such as a generator.
+            limit: The maximum number of elements to show.
+            sampling: Which elements to show: "head", the first ones, pulling no more than needed;
+                "head_tail", the first and last ones; or "reservoir", a uniform random sample.
+            max_items: The maximum number of elements to pull from `iterable`, which bounds the work
+                done by "head_tail" and "reservoir" sampling.
+        """
+        sequence = cls()
+        sequence._stream = Stream(iterable, limit, sampling, max_items)
+        return sequence
+
     def item(self, item: Any):
         self._elements.append(item)
         return self
@@ -50,14 +80,19 @@ class Sequence(FragmentAssembler):
         return self
 
     def assemble(self, get_id) -> Tuple[Fragment, List[Any]]:
+        elements, stream = self._elements, None
+        if self._stream is not None:
+            pulled, stream = self._stream.take()
+            elements = elements + pulled
         return {
             'type': 'SequenceLayout',
             'contents': {
-                'elements': [get_id(elem, '{}'.format(i)) for i, elem in enumerate(self._elements)],
+                'elements': [get_id(elem, '{}'.format(i), True) for i, elem in enumerate(elements)],
                 'orientation': self._orientation,
                 'startMotif': self._start_motif,
                 'endMotif': self._end_motif,
                 'showLabels': self._show_labels,
+                'stream': stream,
             },
             'meta': self._meta,
-        }, self._elements
+        }, elements
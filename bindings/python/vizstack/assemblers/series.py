@@ -0,0 +1,242 @@
+from __future__ import annotations
+from vizstack.fragment_assembler import FragmentAssembler
+from typing import (
+    TYPE_CHECKING, Optional, Tuple, Dict, List, Any, Iterable, Sequence as SequenceType
+)
+from vizstack.schema import JsonType, View, Fragment
+from array import array
+import sys
+
+if TYPE_CHECKING:
+    from typing_extensions import Literal
+
+    Method = Literal['lttb', 'minmax']
+
+# The maximum number of points returned by a single `expand()`, however many are requested.
+_MAX_EXPAND_POINTS = 100000
+
+_NUMPY_UNKNOWN = object()
+_numpy: Any = _NUMPY_UNKNOWN
+
+
+def _get_numpy() -> Any:
+    """Returns the `numpy` module, or `None` if it is not installed. NumPy is optional; when it is
+    present, values are stored as arrays and downsampled with vectorized operations."""
+    global _numpy
+    if _numpy is _NUMPY_UNKNOWN:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = None
+    return _numpy
+
+
+class Series(FragmentAssembler):
+    """
+    A View which renders a long series of numbers, such as a loss curve, as a line chart.
+
+    Values are stored compactly and downsampled to at most `max_points` points, which are emitted as
+    a single packed buffer; full-resolution windows of the series are fetched with `expand()`.
+    """
+
+    def __init__(self,
+                 values: Iterable[float],
+                 x: Optional[Iterable[float]] = None,
+                 max_points: int = 1000,
+                 method: Method = 'lttb') -> None:
+        """
+        Args:
+            values: The y-values of the series. A NumPy array or an `array.array('d')` is used
+                without copying; anything else is copied into a compact array.
+            x: The x-values of the series, increasing, with one per y-value. Defaults to the indices
+                of the y-values.
+            max_points: The maximum number of points to emit.
+            method: How to downsample: "lttb" (largest-triangle-three-buckets) keeps the visual
+                shape of the series, while "minmax" keeps the extremes of each bucket.
+        """
+        super(Series, self).__init__()
+        if method not in ('lttb', 'minmax'):
+            raise ValueError('Unknown downsampling method: {}'.format(method))
+        if max_points < 3:
+            raise ValueError(
+                'At least 3 points must be shown, got max_points={}.'.format(max_points)
+            )
+        self._y = _to_array(values)
+        self._x = _to_array(x) if x is not None else None
+        if self._x is not None and len(self._x) != len(self._y):
+            raise ValueError('Expected one x-value per y-value, got {} and {}.'.format(
+                len(self._x), len(self._y)))
+        self._max_points = max_points
+        self._method: Method = method
+
+    def assemble(self, get_id) -> Tuple[Fragment, List[Any]]:
+        return {
+            'type': 'SeriesPrimitive',
+            'contents': {
+                **self._get_window(0, len(self._y), self._max_points),
+                'length': len(self._y),
+            },
+            'meta': self._meta,
+        }, []
+
+    def expand(self, request: Dict[str, Any]) -> Dict[str, JsonType]:
+        """Returns the points of a window of the series, at full resolution if they fit.
+
+        Args:
+            request: {"start": <index>, "end": <index>, "maxPoints": <number of points>}, where the
+                window is [start, end) in indices of the series; "maxPoints" defaults to the
+                `max_points` of the `Series`. Returns contents as in the assembled `Fragment`.
+
+        Raises:
+            ValueError: If `request` is invalid.
+        """
+        try:
+            start, end = int(request['start']), int(request['end'])
+            max_points = int(request.get('maxPoints', self._max_points))
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(
+                'Expected {{"start": <index>, "end": <index>}}, got: {}'.format(request)
+            )
+        length = len(self._y)
+        start, end = max(0, min(start, length)), max(0, min(end, length))
+        if end < start or max_points < 3:
+            raise ValueError('Invalid window: {}'.format(request))
+        return self._get_window(start, end, min(max_points, _MAX_EXPAND_POINTS))
+
+    def _get_window(self, start: int, end: int, max_points: int) -> Dict[str, JsonType]:
+        np = _get_numpy()
+        downsampled = end - start > max_points
+        if downsampled:
+            if self._method == 'lttb':
+                lttb = _lttb_numpy if np is not None else _lttb
+                indices = lttb(self._x, self._y, start, end, max_points)
+            else:
+                minmax = _minmax_numpy if np is not None else _minmax
+                indices = minmax(self._y, start, end, max_points)
+        else:
+            indices = range(start, end)
+        return {
+            'points': _pack(self._x, self._y, indices),
+            'numPoints': len(indices),
+            'start': start,
+            'end': end,
+            'method': self._method if downsampled else None,
+        }
+
+
+def _to_array(values: Iterable[float]) -> SequenceType[float]:
+    np = _get_numpy()
+    if np is not None:
+        if hasattr(values, '__len__'):
+            return np.asarray(values, dtype=np.float64)
+        # `asarray()` cannot convert iterators, such as generators
+        return np.fromiter(values, dtype=np.float64)
+    if isinstance(values, array) and values.typecode == 'd':
+        return values
+    return array('d', values)
+
+
+def _lttb(x: Optional[SequenceType[float]], y: SequenceType[float], start: int, end: int,
+          num_points: int) -> List[int]:
+    """Returns the indices of `num_points` points in [start, end) chosen by largest-triangle-three-
+    buckets: the first and last points, and from each bucket in between, the point forming the
+    largest triangle with the previously chosen point and the average of the next bucket."""
+    xs: SequenceType[float] = x if x is not None else range(len(y))  # type: ignore
+    every = (end - start - 2) / (num_points - 2)
+    selected = [start]
+    a = start
+    for i in range(num_points - 2):
+        lo = start + int(i * every) + 1
+        hi = start + int((i + 1) * every) + 1
+        next_lo, next_hi = hi, min(start + int((i + 2) * every) + 1, end)
+        avg_x = sum(xs[next_lo:next_hi]) / (next_hi - next_lo)
+        avg_y = sum(y[next_lo:next_hi]) / (next_hi - next_lo)
+        ax, ay = xs[a], y[a]
+        best, best_area = lo, -1.0
+        for j in range(lo, hi):
+            area = abs((ax - avg_x) * (y[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(end - 1)
+    return selected
+
+
+def _lttb_numpy(x: Optional[Any], y: Any, start: int, end: int, num_points: int) -> Any:
+    np = _get_numpy()
+    xs = x if x is not None else np.arange(len(y), dtype=np.float64)
+    every = (end - start - 2) / (num_points - 2)
+    # The same buckets as `_lttb()`: bucket i is [bounds[i], bounds[i + 1])
+    offsets = (np.arange(num_points, dtype=np.float64) * every).astype(np.int64)
+    bounds = (start + offsets + 1).tolist()
+    selected = np.empty(num_points, dtype=np.int64)
+    selected[0], selected[-1] = start, end - 1
+    a = start
+    for i in range(num_points - 2):
+        lo, hi = bounds[i], bounds[i + 1]
+        next_hi = min(bounds[i + 2], end)
+        avg_x = xs[hi:next_hi].mean()
+        avg_y = y[hi:next_hi].mean()
+        areas = np.abs((xs[a] - avg_x) * (y[lo:hi] - y[a]) - (xs[a] - xs[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(areas.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def _minmax(y: SequenceType[float], start: int, end: int, num_points: int) -> List[int]:
+    """Returns the indices of the minimum and maximum of each of `num_points // 2` buckets of
+    [start, end), in order."""
+    num_buckets = num_points // 2
+    every = (end - start) / num_buckets
+    selected: List[int] = []
+    for i in range(num_buckets):
+        lo, hi = start + int(i * every), start + int((i + 1) * every)
+        if hi <= lo:
+            continue
+        # Slicing and searching an `array.array` run in C, unlike a loop over the bucket
+        bucket = y[lo:hi]
+        try:
+            low = lo + bucket.index(min(bucket))  # type: ignore
+            high = lo + bucket.index(max(bucket))  # type: ignore
+        except ValueError:
+            # `min()` and `max()` can return a NaN, which is not equal to itself
+            low = high = lo
+        selected.extend(sorted({low, high}))
+    return selected
+
+
+def _minmax_numpy(y: Any, start: int, end: int, num_points: int) -> Any:
+    np = _get_numpy()
+    num_buckets = num_points // 2
+    offsets = (np.arange(num_buckets + 1) * ((end - start) / num_buckets)).astype(np.int64)
+    bounds = (start + offsets).tolist()
+    selected: List[int] = []
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        if hi <= lo:
+            continue
+        bucket = y[lo:hi]
+        low, high = lo + int(bucket.argmin()), lo + int(bucket.argmax())
+        selected.extend(sorted({low, high}))
+    return np.asarray(selected, dtype=np.int64)
+
+
+def _pack(x: Optional[SequenceType[float]], y: SequenceType[float], indices: Any) -> str:
+    """Returns the points at `indices` as base64-encoded little-endian float64 (x, y) pairs."""
+    # `base64` is only needed once a `Series` is assembled, so it is imported on first use
+    from base64 import b64encode
+    np = _get_numpy()
+    if np is not None:
+        indices = np.asarray(indices, dtype=np.int64)
+        xs = x[indices] if x is not None else indices.astype(np.float64)
+        points = np.empty((len(indices), 2), dtype='<f8')
+        points[:, 0], points[:, 1] = xs, y[indices]  # type: ignore
+        return b64encode(points.tobytes()).decode()
+    points = array('d', [0.0]) * (2 * len(indices))
+    for i, index in enumerate(indices):
+        points[2 * i] = x[index] if x is not None else index
+        points[2 * i + 1] = y[index]
+    if sys.byteorder == 'big':
+        points.byteswap()
+    return b64encode(points.tobytes()).decode()
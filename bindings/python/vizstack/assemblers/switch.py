@@ -1,6 +1,5 @@
-from vizstack.fragment_assembler import FragmentAssembler
-from typing import Optional, Tuple, Dict, List, Any, Iterable
-from typing_extensions import Literal
+from vizstack.fragment_assembler import FragmentAssembler, Deferred
+from typing import Callable, Optional, Tuple, Dict, List, Any, Iterable
 from vizstack.schema import JsonType, View, Fragment
 
 
@@ -8,11 +7,13 @@ class Switch(FragmentAssembler):
 
     _NONE_SPECIFIED = object()
     _show_labels: Optional[bool] = None
+    _lazy: bool = False
 
     def __init__(self,
                  modes: Optional[List[str]] = None,
                  items: Optional[Dict[str, Any]] = None,
-                 show_labels: Optional[bool] = None) -> None:
+                 show_labels: Optional[bool] = None,
+                 lazy: Optional[bool] = None) -> None:
         """
 
         Args:
@@ -20,15 +21,21 @@ class Switch(FragmentAssembler):
                 they will be cycled.
             items: An optional mapping of mode names to items.
             show_labels: Whether to show the labels.
+            lazy: Whether to assemble only the first mode's item, leaving stubs for the other modes
+                until they are requested; see `Assembly.resolve()`. Off by default, since a `View`
+                which is shipped whole has no way to request the other modes.
         """
         super(Switch, self).__init__()
         self._modes: List[str] = []
         if modes is not None: self._modes = modes
         self._items: Dict[str, Any] = dict()
+        # The `Deferred` placeholders of lazily assembled modes, kept so that each mode keeps its
+        # placeholder (and its object is produced at most once) across assemblies.
+        self._deferred: Dict[str, Deferred] = dict()
         if items is not None:
             for mode, item in items.items():
                 self.item(mode, item)
-        self.config(show_labels=show_labels)
+        self.config(show_labels=show_labels, lazy=lazy)
 
     def mode(self, name: str, item=_NONE_SPECIFIED):
         """Adds a new mode to the existing modes."""
@@ -39,20 +46,41 @@ class Switch(FragmentAssembler):
 
     def item(self, name: str, item: Any):
         self._items[name] = item
+        self._deferred.pop(name, None)
         return self
 
-    def config(self, show_labels: Optional[bool] = None):
+    def lazy_item(self, name: str, thunk: Callable[[], Any]):
+        """Sets the item of a mode to the result of `thunk()`, which is only called once the mode is
+        requested, or when the `Switch` is assembled if it is the first mode."""
+        self._items[name] = self._deferred[name] = Deferred(thunk)
+        return self
+
+    def config(self, show_labels: Optional[bool] = None, lazy: Optional[bool] = None):
         if show_labels is not None: self._show_labels = show_labels
+        if lazy is not None: self._lazy = lazy
         return self
 
     def assemble(self, get_id) -> Tuple[Fragment, List[Any]]:
         for mode_name in self._modes:
-            assert mode_name in self._items, 'No item was provided for mode "{}".'.format(mode_name)
+            if mode_name not in self._items:
+                raise ValueError('No item was provided for mode "{}".'.format(mode_name))
+        items = [self._get_item(name, i == 0) for i, name in enumerate(self._modes)]
         return {
             'type': 'SwitchLayout',
             'contents': {
-                'modes': [get_id(self._items[name], str(name)) for name in self._modes],
+                'modes': [get_id(item, str(name)) for name, item in zip(self._modes, items)],
                 'showLabels': self._show_labels,
             },
             'meta': self._meta,
-        }, [self._items[mode] for mode in self._modes]
+        }, items
+
+    def _get_item(self, name: str, initial: bool) -> Any:
+        if initial:
+            deferred = self._deferred.get(name)
+            if deferred is not None:
+                deferred.resolve()
+            return self._items[name]
+        if self._lazy and name not in self._deferred:
+            item = self._items[name]
+            self._deferred[name] = Deferred(lambda: item)
+        return self._deferred.get(name, self._items[name])
@@ -0,0 +1,282 @@
+from __future__ import annotations
+from vizstack.fragment_assembler import FragmentAssembler
+from typing import (
+    TYPE_CHECKING, Optional, Tuple, Dict, List, Any, Callable, Sequence as SequenceType
+)
+from vizstack.schema import JsonType, View, Fragment
+
+if TYPE_CHECKING:
+    from typing_extensions import Literal
+
+    ColumnType = Literal['number', 'string', 'boolean', 'other']
+
+# The maximum number of rows returned by a single `expand()`, however many are requested.
+_MAX_EXPAND_ROWS = 10000
+
+
+class Table(FragmentAssembler):
+    """
+    A View which renders a table of rows with named columns, such as the records of a dataset.
+
+    Columns are stored as given, without copying each value into its own `Fragment`. Only a window
+    of rows is emitted, formatted one column at a time; other windows, optionally sorted by a column
+    or filtered, are fetched with `expand()`.
+    """
+
+    def __init__(self,
+                 data: Any,
+                 columns: Optional[List[str]] = None,
+                 window: int = 100) -> None:
+        """
+        Args:
+            data: Either a mapping of column names to columns (e.g., a `dict` of `list`s or of NumPy
+                arrays, or a pandas `DataFrame`), a NumPy structured array, or a sequence of rows,
+                each a mapping of column names to values or a sequence of values.
+            columns: The names of the columns to show, in order. Defaults to all columns of `data`;
+                required if the rows of `data` are sequences, unless their indices suffice.
+            window: The number of rows to emit when assembled.
+        """
+        super(Table, self).__init__()
+        if window < 0:
+            raise ValueError('Window must be non-negative, got {}.'.format(window))
+        self._names, self._columns = _to_columns(data, columns)
+        lengths = {len(column) for column in self._columns}
+        if len(lengths) > 1:
+            raise ValueError(
+                'All columns must have the same length, got lengths {}.'.format(sorted(lengths))
+            )
+        self._length = lengths.pop() if lengths else 0
+        self._types = [_get_column_type(column) for column in self._columns]
+        self._window = window
+        # The row order of the last sorted or filtered `expand()`, reused while paging through it.
+        self._order_key: Optional[Tuple[Optional[str], bool, Optional[str], Optional[str]]] = None
+        self._order: Optional[SequenceType[int]] = None
+
+    def assemble(self, get_id) -> Tuple[Fragment, List[Any]]:
+        return {
+            'type': 'TablePrimitive',
+            'contents': {
+                'columns': [{'name': name, 'type': column_type}
+                            for name, column_type in zip(self._names, self._types)],
+                **self._get_window(None, 0, self._window),
+                'length': self._length,
+            },
+            'meta': self._meta,
+        }, []
+
+    def expand(self, request: Dict[str, Any]) -> Dict[str, JsonType]:
+        """Returns a window of rows, optionally sorted and filtered.
+
+        Args:
+            request: {"start": <row>, "count": <number of rows>, "sort": <column>, "descending":
+                <bool>, "filter": <text>, "filterColumn": <column>}, where all but "start" are
+                optional. Rows are sorted by the values of "sort", and only rows where the formatted
+                value of "filterColumn" (or of any column) contains "filter", ignoring case, are
+                kept. The window is [start, start + count) of the sorted and filtered rows; "count"
+                defaults to the `window` of the `Table`. Returns contents as in the assembled
+                `Fragment`, where "numRows" counts the filtered rows and "rows" holds the original
+                index of each row, if sorted or filtered.
+
+        Raises:
+            ValueError: If `request` is invalid.
+        """
+        try:
+            start = int(request['start'])
+            count = int(request.get('count', self._window))
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(
+                'Expected {{"start": <row>, "count": <number of rows>}}, got: {}'.format(request)
+            )
+        sort = request.get('sort')
+        descending = str(request.get('descending', False)).lower() in ('true', '1')
+        text = request.get('filter') or None
+        filter_column = request.get('filterColumn')
+        for name in (sort, filter_column):
+            if name is not None and name not in self._names:
+                raise ValueError('Unknown column: {}'.format(name))
+        if start < 0 or count < 0:
+            raise ValueError('Invalid window: {}'.format(request))
+        key = (sort, descending, text, filter_column)
+        if sort is None and text is None:
+            order = None
+        elif key == self._order_key:
+            order = self._order
+        else:
+            order = self._get_order(sort, descending, text, filter_column)
+            self._order_key, self._order = key, order
+        return self._get_window(order, start, min(count, _MAX_EXPAND_ROWS))
+
+    def _get_order(self, sort: Optional[str], descending: bool, text: Optional[str],
+                   filter_column: Optional[str]) -> SequenceType[int]:
+        """Returns the indices of the rows which pass the filter, in sorted order."""
+        order: SequenceType[int] = range(self._length)
+        if text is not None:
+            needle = text.lower()
+            searched: SequenceType[int]
+            if filter_column is not None:
+                searched = [self._names.index(filter_column)]
+            else:
+                searched = range(len(self._columns))
+            matches = bytearray(self._length)
+            for i in searched:
+                # Format and test the whole column at once, rather than row by row across columns
+                formatted = _format_column(self._columns[i], self._types[i], 0, self._length)
+                for row, value in enumerate(formatted):
+                    if needle in value.lower():
+                        matches[row] = 1
+            order = [row for row in order if matches[row]]
+        if sort is not None:
+            column = self._columns[self._names.index(sort)]
+            kind = getattr(getattr(column, 'dtype', None), 'kind', 'O')
+            if kind != 'O' and not isinstance(order, list):
+                order = _argsort(column, descending)
+            else:
+                order = _sort_rows(column, order, descending)
+        return order
+
+    def _get_window(self, order: Optional[SequenceType[int]], start: int,
+                    count: int) -> Dict[str, JsonType]:
+        num_rows = self._length if order is None else len(order)
+        start = min(start, num_rows)
+        end = min(start + count, num_rows)
+        if order is None:
+            data = [_format_column(column, column_type, start, end)
+                    for column, column_type in zip(self._columns, self._types)]
+            rows = None
+        else:
+            rows = list(order[start:end])
+            data = [_format_column(_take(column, rows), column_type, 0, len(rows))
+                    for column, column_type in zip(self._columns, self._types)]
+        return {
+            'data': data,  # type: ignore
+            'start': start,
+            'end': end,
+            'numRows': num_rows,
+            'rows': rows,  # type: ignore
+        }
+
+
+def _to_columns(data: Any, names: Optional[List[str]]) -> Tuple[List[str], List[SequenceType[Any]]]:
+    """Returns the names of the columns of `data` and the columns themselves, avoiding copies where
+    `data` is already columnar."""
+    dtype_names = getattr(getattr(data, 'dtype', None), 'names', None)
+    if dtype_names is not None:
+        # A NumPy structured array, whose fields are columns
+        names = list(names if names is not None else dtype_names)
+        return names, [data[name] for name in names]
+    if hasattr(data, 'keys'):
+        names = [str(name) for name in (names if names is not None else data.keys())]
+        return names, [_as_column(data[name]) for name in names]
+    rows = data if isinstance(data, (list, tuple)) else list(data)
+    if len(rows) > 0 and hasattr(rows[0], 'keys'):
+        if names is None:
+            # The union of the keys of all rows, in order of first appearance
+            seen: Dict[str, None] = {}
+            for row in rows:
+                seen.update(dict.fromkeys(row.keys()))
+            names = list(seen)
+        return [str(name) for name in names], [[row.get(name) for row in rows] for name in names]
+    width = max((len(row) for row in rows), default=0)
+    if names is None:
+        names = [str(i) for i in range(width)]
+    elif len(names) < width:
+        raise ValueError('Expected {} column names, got {}.'.format(width, len(names)))
+    return list(names), [
+        [row[i] if i < len(row) else None for row in rows] for i in range(len(names))
+    ]
+
+
+def _as_column(column: Any) -> SequenceType[Any]:
+    # Lists, tuples, NumPy arrays and pandas `Series` support `len()` and slicing without copying
+    if isinstance(column, (list, tuple)) or hasattr(column, 'dtype'):
+        return column
+    return list(column)
+
+
+def _get_column_type(column: SequenceType[Any]) -> ColumnType:
+    dtype = getattr(column, 'dtype', None)
+    kind = getattr(dtype, 'kind', None)
+    if kind is not None and kind != 'O':
+        if kind == 'b':
+            return 'boolean'
+        return 'number' if kind in 'iufc' else 'string' if kind in 'SU' else 'other'
+    # Infer the type of other columns from their first non-missing value
+    for value in column:
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            return 'boolean'
+        if isinstance(value, (int, float)):
+            return 'number'
+        if isinstance(value, str):
+            return 'string'
+        return 'other'
+    return 'other'
+
+
+def _format_float(value: Any) -> str:
+    return '{:.6g}'.format(value) if isinstance(value, float) else _format_value(value)
+
+
+def _format_value(value: Any) -> str:
+    return '' if value is None else str(value)
+
+
+def _format_column(column: SequenceType[Any], column_type: ColumnType, start: int,
+                   end: int) -> List[str]:
+    """Returns the formatted values of rows [start, end) of a column, choosing the formatter once
+    for the whole column rather than once per value."""
+    values = column[start:end]
+    if hasattr(values, 'tolist'):
+        # Convert NumPy scalars to Python values in a single call
+        values = values.tolist()
+    formatter: Callable[[Any], str] = _format_float if column_type == 'number' else _format_value
+    return list(map(formatter, values))
+
+
+def _take(column: SequenceType[Any], rows: List[int]) -> SequenceType[Any]:
+    if hasattr(column, 'take'):
+        return column.take(rows)  # type: ignore
+    return [column[row] for row in rows]
+
+
+def _argsort(column: Any, descending: bool) -> List[int]:
+    """Returns all rows sorted by their values in `column`, a NumPy array or pandas `Series` which
+    does not hold Python objects, in C. As in `_sort_rows()`, ties keep their original order and
+    missing values (NaN or NaT) come last."""
+    if hasattr(column, 'to_numpy'):
+        column = column.to_numpy()
+    # Missing values are the only ones which are not equal to themselves
+    is_present = column == column
+    present = is_present.nonzero()[0]
+    values = column[present]
+    if descending:
+        # Reversing a stable ascending sort would reverse the order of ties, so instead sort the
+        # reversed values and map the positions back
+        order = len(values) - 1 - values[::-1].argsort(kind='stable')[::-1]
+    else:
+        order = values.argsort(kind='stable')
+    rows: List[int] = present[order].tolist()
+    if len(rows) < len(column):
+        rows.extend((~is_present).nonzero()[0].tolist())
+    return rows
+
+
+def _is_missing(value: Any) -> bool:
+    # NaN is not equal to itself, and would otherwise make the sort order arbitrary
+    return value is None or value != value
+
+
+def _sort_rows(column: SequenceType[Any], rows: SequenceType[int], descending: bool) -> List[int]:
+    """Returns `rows` sorted by their values in `column`, with ties in their original order and
+    missing values (`None` or NaN) last."""
+    if hasattr(column, 'tolist'):
+        column = column.tolist()
+    present = [row for row in rows if not _is_missing(column[row])]
+    missing = [row for row in rows if _is_missing(column[row])]
+    try:
+        present.sort(key=column.__getitem__, reverse=descending)
+    except TypeError:
+        # Values of different types cannot be compared, so compare their formatted values instead
+        present.sort(key=lambda row: _format_value(column[row]), reverse=descending)
+    return present + missing
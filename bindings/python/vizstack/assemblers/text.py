@@ -1,10 +1,24 @@
+from __future__ import annotations
 from vizstack.fragment_assembler import FragmentAssembler
-from typing import Optional, Tuple, Dict, List, Any
-from typing_extensions import Literal
+from typing import TYPE_CHECKING, Optional, Tuple, Dict, List, Any
 from vizstack.schema import JsonType, View, Fragment
+from array import array
+from bisect import bisect_right
+import re
 
-Variant = Literal['caption', 'body',  'subheading', 'heading', None]
-Emphasis = Literal['normal', 'less', 'more', None]
+if TYPE_CHECKING:
+    from typing_extensions import Literal
+
+    Variant = Literal['caption', 'body',  'subheading', 'heading', None]
+    Emphasis = Literal['normal', 'less', 'more', None]
+
+
+# The maximum number of characters in a window of a large text, so that a text with very long lines
+# cannot produce huge windows.
+_MAX_WINDOW_CHARS = 2**16
+# The default and maximum number of matches returned by a single search.
+_DEFAULT_SEARCH_LIMIT = 100
+_MAX_SEARCH_LIMIT = 10000
 
 
 class Text(FragmentAssembler):
@@ -15,25 +29,121 @@ class Text(FragmentAssembler):
     def __init__(self,
                  text: str,
                  variant: Variant = None,
-                 emphasis: Emphasis = None,) -> None:
+                 emphasis: Emphasis = None,
+                 window: Optional[int] = None) -> None:
         """
         Args:
             text: Text which should be rendered.
             variant: Semantic role of text.
             emphasis: Relative important of text.
+            window: If given, only this many lines of the text are included in the `Fragment`, along
+                with the total number of lines; further windows are fetched with `expand()`. Use
+                this for texts too large to ship whole.
         """
         super(Text, self).__init__()
         self._text: str = text
         self._variant: Variant = variant
         self._emphasis: Emphasis = emphasis
+        self._window: Optional[int] = window
+        # The offset of the start of each line, built on the first `expand()` of a windowed text.
+        self._line_starts: Optional[array] = None
 
     def assemble(self, get_id) -> Tuple[Fragment, List[Any]]:
+        if self._window is None:
+            text = self._text
+            window = None
+        else:
+            window = self._get_window(0, self._window)
+            text = window.pop('text')  # type: ignore
         return {
             'type': 'TextPrimitive',
             'contents': {
-                'text': self._text,
+                'text': text,
                 'variant': self._variant,
                 'emphasis': self._emphasis,
+                'window': window,
             },
             'meta': self._meta,
         }, []
+
+    def expand(self, request: Dict[str, Any]) -> Dict[str, JsonType]:
+        """Returns a window of lines of the text, or the positions of a substring in it.
+
+        Args:
+            request: Either {"start": <line>, "count": <number of lines>}, which returns
+                {"start", "end", "totalLines", "truncated", "text"}; or {"search": <substring>,
+                "line": <line>, "column": <column>, "limit": <number of matches>}, which returns
+                {"matches": [{"line", "column"}, ...], "next": <the "line" and "column" to continue
+                the search from, or None>}. Lines are numbered from 0, without their "\\n".
+
+        Raises:
+            ValueError: If `request` is neither kind of request.
+        """
+        try:
+            if 'search' in request:
+                limit = int(request.get('limit', _DEFAULT_SEARCH_LIMIT))
+                return self._search(str(request['search']), int(request.get('line', 0)),
+                                    int(request.get('column', 0)),
+                                    max(1, min(limit, _MAX_SEARCH_LIMIT)))
+            return self._get_window(int(request['start']), int(request['count']))
+        except (KeyError, TypeError, ValueError):
+            raise ValueError('Expected {{"start": <line>, "count": <lines>}} or '
+                             '{{"search": <non-empty substring>}}, got: {}'.format(request))
+
+    def _get_line_starts(self) -> array:
+        if self._line_starts is None:
+            # Matches are produced one at a time, so no copy of the text is made
+            self._line_starts = array('q', [0])
+            self._line_starts.extend(match.end() for match in re.finditer('\n', self._text))
+        return self._line_starts
+
+    def _get_window(self, start: int, count: int) -> Dict[str, JsonType]:
+        text = self._text
+        if self._line_starts is None and start == 0:
+            # The first window is shipped with every `Fragment`, so avoid indexing the whole text
+            total = text.count('\n') + 1
+            end = min(count, total)
+            start, end = 0, max(0, end)
+            start_offset = end_offset = 0
+            for line in range(end):
+                end_offset = text.find('\n', end_offset + (line > 0))
+                if end_offset == -1:
+                    end_offset = len(text)
+                    break
+        else:
+            line_starts = self._get_line_starts()
+            total = len(line_starts)
+            start = max(0, min(start, total))
+            end = max(start, min(start + count, total))
+            start_offset = line_starts[start] if start < total else len(text)
+            end_offset = line_starts[end] - 1 if end < total else len(text)
+        truncated = end_offset - start_offset > _MAX_WINDOW_CHARS
+        return {
+            'start': start,
+            'end': end,
+            'totalLines': total,
+            'truncated': truncated,
+            'text': text[start_offset:min(end_offset, start_offset + _MAX_WINDOW_CHARS)],
+        }
+
+    def _search(self, substring: str, line: int, column: int, limit: int) -> Dict[str, JsonType]:
+        if len(substring) == 0:
+            raise ValueError('Cannot search for an empty string.')
+        text = self._text
+        line_starts = self._get_line_starts()
+        # `str.find()` searches the text in place, so no copy of it is made
+        start = line_starts[max(0, min(line, len(line_starts) - 1))] + max(0, column)
+        offset = text.find(substring, start)
+        matches: List[JsonType] = []
+        while offset != -1 and len(matches) < limit:
+            matches.append(self._get_position(offset))
+            offset = text.find(substring, offset + 1)
+        return {
+            'matches': matches,
+            'next': None if offset == -1 else self._get_position(offset),
+        }
+
+    def _get_position(self, offset: int) -> Dict[str, JsonType]:
+        line_starts = self._get_line_starts()
+        line = bisect_right(line_starts, offset) - 1
+        return {'line': line, 'column': offset - line_starts[line]}
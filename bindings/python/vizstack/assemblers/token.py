@@ -1,10 +1,14 @@
+from __future__ import annotations
 from vizstack.fragment_assembler import FragmentAssembler
-from typing import Optional, Tuple, Dict, List, Any
-from typing_extensions import Literal
+from typing import TYPE_CHECKING, Optional, Tuple, Dict, List, Any
 from vizstack.schema import JsonType, View, Fragment
 
 
-Color = Literal['gray', 'brown', 'purple', 'blue', 'green', 'yellow', 'orange', 'red', 'pink', None]
+if TYPE_CHECKING:
+    from typing_extensions import Literal
+
+    Color = Literal['gray', 'brown', 'purple', 'blue', 'green', 'yellow', 'orange', 'red', 'pink',
+                    None]
 
 
 class Token(FragmentAssembler):
@@ -0,0 +1,257 @@
+"""Views of the differences between two versions of an object, such as a configuration or model
+state.
+
+Example:
+    before = copy.deepcopy(config)
+    ...
+    assemble(diff(before, config))
+    diff_view(before, config)  # The same, as a `View`
+
+The two objects are walked together, descending only into containers which differ. Values which
+are the same object are skipped at once, and containers which compare equal are skipped by a single
+`==`, which runs in C; so the cost of diffing two large, nested structures which differ in a handful
+of values is dominated by one pass over the changed containers, not by the Python-level walk.
+
+Values of different types, such as `1`, `1.0` and `True`, are reported as changed wherever they are
+compared, although `==` treats them as equal; but a container which compares equal is not walked to
+find them, unless `strict_types` is set.
+
+Only the differences are emitted, each marked with a `Token`: green for added, red for removed and
+yellow for changed entries. Each run of unchanged entries is collapsed into a gray count.
+"""
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+import reprlib
+
+from vizstack.assemblers.flow import Flow
+from vizstack.assemblers.keyvalue import KeyValue
+from vizstack.assemblers.sequence import Sequence
+from vizstack.assemblers.text import Text
+from vizstack.assemblers.token import Token
+from vizstack.schema import View
+
+if TYPE_CHECKING:
+    from vizstack.assemblers.token import Color
+
+__all__ = ['diff', 'diff_view']
+
+_ADDED: 'Color' = 'green'
+_REMOVED: 'Color' = 'red'
+_CHANGED: 'Color' = 'yellow'
+_UNCHANGED: 'Color' = 'gray'
+
+# The motifs around each kind of container.
+_MOTIFS: Dict[type, Tuple[str, str]] = {dict: ('{', '}'), list: ('[', ']'), tuple: ('(', ')')}
+
+# Returned by `_diff()` for a difference which is not shown, because `max_changes` was reached.
+_OMITTED = object()
+
+_repr = reprlib.Repr()
+_repr.maxstring = 60
+_repr.maxother = 60
+
+
+class _Budget:
+    """The number of differences which may still be emitted, and how values are compared."""
+
+    def __init__(self, max_changes: int, strict_types: bool = False) -> None:
+        self.remaining = max_changes
+        self.omitted = 0
+        self.strict_types = strict_types
+
+    def take(self) -> bool:
+        if self.remaining <= 0:
+            self.omitted += 1
+            return False
+        self.remaining -= 1
+        return True
+
+
+def diff(old: Any, new: Any, max_changes: int = 1000, strict_types: bool = False) -> Any:
+    """Returns an object which visualizes the differences between `old` and `new`; see the module
+    documentation.
+
+    `dict`s are compared by key, `list`s and `tuple`s by position, after matching their common
+    prefix and suffix so that an insertion or removal does not mark every later element as
+    changed, and `set`s and `frozenset`s by membership. Any other objects are equal if they have the
+    same type and compare equal with `==`.
+
+    Args:
+        old: The earlier version.
+        new: The later version.
+        max_changes: The maximum number of differences to show; the number of further differences
+            is given at the end.
+        strict_types: Whether to walk containers which compare equal, to find values of different
+            types within them, e.g. in `{'a': 1}` and `{'a': True}`. This makes the cost of the diff
+            depend on the size of `old`, rather than on the changed containers.
+    """
+    budget = _Budget(max_changes, strict_types)
+    result = _diff(old, new, budget)
+    if result is None:
+        return Text('No differences')
+    if budget.omitted:
+        shown = [] if result is _OMITTED else [result]
+        omitted = Token('{} more differences not shown'.format(budget.omitted), _UNCHANGED)
+        return Sequence(shown + [omitted])
+    return result
+
+
+def diff_view(old: Any, new: Any, max_changes: int = 1000, strict_types: bool = False) -> View:
+    """Returns a `View` of the differences between `old` and `new`; see `diff()`."""
+    # Imported here, so that importing this module does not import the assembly machinery
+    from vizstack.view_assembler import ViewAssembler
+    return ViewAssembler.assemble(diff(old, new, max_changes, strict_types))
+
+
+def _equal(old: Any, new: Any, strict_types: bool) -> bool:
+    if old is new:
+        return True
+    old_type = type(old)
+    if old_type is not type(new):
+        return False
+    try:
+        if not old == new:
+            return False
+    except Exception:
+        # E.g., NumPy arrays, whose `==` is elementwise
+        return False
+    if strict_types:
+        # Equal containers may still hold values of different types, e.g. `[1]` and `[True]`. Like
+        # the containers themselves, the keys of `dict`s and the elements of `set`s match by `==`.
+        if old_type is dict:
+            return all(_equal(value, new[key], True) for key, value in old.items())
+        if old_type is list or old_type is tuple:
+            return all(_equal(old_elem, new_elem, True) for old_elem, new_elem in zip(old, new))
+    return True
+
+
+def _diff(old: Any, new: Any, budget: _Budget) -> Optional[Any]:
+    """Returns an object visualizing the differences between `old` and `new`, `None` if there are
+    none, or `_OMITTED` if they differ but `budget` is exhausted."""
+    if _equal(old, new, budget.strict_types):
+        return None
+    old_type = type(old)
+    if old_type is type(new):
+        if old_type is dict:
+            return _diff_dict(old, new, budget)
+        if old_type is list or old_type is tuple:
+            return _diff_sequence(old, new, budget)
+        if old_type is set or old_type is frozenset:
+            return _diff_set(old, new, budget)
+    return _changed(old, new) if budget.take() else _OMITTED
+
+
+def _short(obj: Any) -> Any:
+    """Returns a `repr()` of a value which is not a container, or the container itself."""
+    return obj if type(obj) in _MOTIFS or isinstance(obj, (set, frozenset)) else _repr.repr(obj)
+
+
+def _changed(old: Any, new: Any) -> Any:
+    old, new = _short(old), _short(new)
+    return Flow(Token(old, _REMOVED) if isinstance(old, str) else old,
+                Text('→'),
+                Token(new, _ADDED) if isinstance(new, str) else new)
+
+
+def _layout(container_type: type) -> KeyValue:
+    start, end = _MOTIFS[container_type]
+    return KeyValue(start_motif=start, end_motif=end)
+
+
+def _add_unchanged(layout: KeyValue, count: int) -> None:
+    if count:
+        layout.item(Token('…', _UNCHANGED), Text('{} unchanged'.format(count)))
+
+
+def _diff_dict(old: Dict[Any, Any], new: Dict[Any, Any], budget: _Budget) -> KeyValue:
+    layout = _layout(dict)
+    unchanged = 0
+    strict_types = budget.strict_types
+    for key, old_value in old.items():
+        if key not in new:
+            if budget.take():
+                _add_unchanged(layout, unchanged)
+                unchanged = 0
+                layout.item(Token(_repr.repr(key), _REMOVED), old_value)
+            continue
+        new_value = new[key]
+        # Inlined from `_equal()`, since this runs once per entry of the largest containers
+        if new_value is old_value:
+            unchanged += 1
+            continue
+        value_type = type(old_value)
+        if value_type is type(new_value) and not (strict_types and value_type in _MOTIFS):
+            try:
+                if new_value == old_value:
+                    unchanged += 1
+                    continue
+            except Exception:
+                pass
+        change = _diff(old_value, new_value, budget)
+        if change is not None and change is not _OMITTED:
+            _add_unchanged(layout, unchanged)
+            unchanged = 0
+            layout.item(Token(_repr.repr(key), _CHANGED), change)
+    _add_unchanged(layout, unchanged)
+    # Key views support set operations in C
+    added = new.keys() - old.keys()
+    if added:
+        for key, new_value in new.items():
+            if key in added and budget.take():
+                layout.item(Token(_repr.repr(key), _ADDED), new_value)
+    return layout
+
+
+def _common_prefix(old: List[Any], new: List[Any], strict_types: bool) -> int:
+    n = min(len(old), len(new))
+    i = 0
+    while i < n and _equal(old[i], new[i], strict_types):
+        i += 1
+    return i
+
+
+def _diff_sequence(old: List[Any], new: List[Any], budget: _Budget) -> KeyValue:
+    layout = _layout(type(old))
+    strict_types = budget.strict_types
+    prefix = _common_prefix(old, new, strict_types)
+    # Match the common suffix of what remains, so that an insertion or removal shifts nothing
+    suffix = 0
+    max_suffix = min(len(old), len(new)) - prefix
+    while suffix < max_suffix and _equal(old[len(old) - 1 - suffix], new[len(new) - 1 - suffix],
+                                         strict_types):
+        suffix += 1
+    old_middle = range(prefix, len(old) - suffix)
+    new_middle = range(prefix, len(new) - suffix)
+    _add_unchanged(layout, prefix)
+
+    # Pair the remaining elements by position; the longer side's extra elements are added or removed
+    paired = min(len(old_middle), len(new_middle))
+    unchanged = 0
+    for offset in range(paired):
+        change = _diff(old[prefix + offset], new[prefix + offset], budget)
+        if change is None:
+            unchanged += 1
+        elif change is not _OMITTED:
+            _add_unchanged(layout, unchanged)
+            unchanged = 0
+            layout.item(Token('{}'.format(prefix + offset), _CHANGED), change)
+    _add_unchanged(layout, unchanged)
+    for i in old_middle[paired:]:
+        if budget.take():
+            layout.item(Token('{}'.format(i), _REMOVED), old[i])
+    for i in new_middle[paired:]:
+        if budget.take():
+            layout.item(Token('{}'.format(i), _ADDED), new[i])
+    _add_unchanged(layout, suffix)
+    return layout
+
+
+def _diff_set(old: Any, new: Any, budget: _Budget) -> Sequence:
+    elements: List[Any] = []
+    for elems, color in ((old - new, _REMOVED), (new - old, _ADDED)):
+        for elem in elems:
+            if budget.take():
+                elements.append(Token(_repr.repr(elem), color))
+    unchanged = len(old & new)
+    if unchanged:
+        elements.append(Token('… {} unchanged'.format(unchanged), _UNCHANGED))
+    return Sequence(elements, start_motif='{', end_motif='}')
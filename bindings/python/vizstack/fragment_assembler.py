@@ -1,7 +1,14 @@
 from vizstack.schema import FragmentMeta, JsonType, FragmentId, Fragment
-from typing import Callable, Any, Tuple, List
+from typing import Callable, Any, Dict, Optional, Tuple, List, Union
 
-__all__ = ['FragmentAssembler']
+__all__ = ['FragmentAssembler', 'Deferred']
+
+_STUB_META_KEY = 'stub'
+_PENDING_ID_META_KEY = 'pendingId'
+_DEFERRED_META_KEY = 'deferred'
+
+# The type of the `get_id(obj, slot, inline=False)` passed to `FragmentAssembler.assemble()`.
+GetId = Callable[..., Union[FragmentId, Fragment]]
 
 
 class FragmentAssembler:
@@ -13,20 +20,104 @@ class FragmentAssembler:
         self._meta[key] = value
         return self
 
-    def assemble(self, get_id: Callable[[Any, str], FragmentId]) -> Tuple[Fragment, List[Any]]:
+    def assemble(self, get_id: GetId) -> Tuple[Fragment, List[Any]]:
         """Returns a `Fragment` and a `list` of all objects referenced by the `Fragment`.
 
-        Any valid `View` which includes the assembled `Fragment` must also include the `Fragment` for each object in
-        the returned `list`.
+        Any valid `View` which includes the assembled `Fragment` must also include the `Fragment`
+        for each object in the returned `list`.
 
         Args:
-            get_id: A function with signature `(obj, slot)`, where `obj` is an object referenced in the assembled
-                `Fragment` and `slot` is a string which uniquely identifies that object among all other referenced
-                objects. It returns a `FragmentId` for `obj`, which should be used in place of the object itself in
-                the assembled `Fragment`.
+            get_id: A function with signature `(obj, slot, inline=False)`, where `obj` is an object
+                referenced in the assembled `Fragment` and `slot` is a string which uniquely
+                identifies that object among all other referenced objects. It returns a `FragmentId`
+                for `obj`, which should be used in place of the object itself in the assembled
+                `Fragment`. If `inline` is `True`, it may instead return the complete `Fragment` of
+                `obj` (a `dict`), to be embedded in the assembled `Fragment`; only pass
+                `inline=True` where the schema allows an embedded `Fragment`. Referenced objects are
+                returned in the `list` either way.
 
         Returns:
             A `Fragment` which can be rendered.
-            A `list` of objects whose `Fragment`s should be included in any `View` containing the returned `Fragment`.
+            A `list` of objects whose `Fragment`s should be included in any `View` containing the
+            returned `Fragment`.
         """
         raise NotImplementedError
+
+    def expand(self, request: Dict[str, Any]) -> Dict[str, JsonType]:
+        """Returns more of the data shown by the `Fragment`, such as another window of a large text.
+
+        Assemblers whose `Fragment`s show only part of their data override this; see, e.g., `Text`.
+        Clients request expansions through `Assembly.expand()` or the `FragmentServer`. Request
+        values may arrive as strings (e.g., from a URL query), so implementations should convert
+        them as needed.
+
+        Args:
+            request: The parameters of the expansion, specific to each assembler.
+
+        Returns:
+            A JSON-serializable `dict` describing the requested data.
+
+        Raises:
+            ValueError: If the assembler does not support expansion, or `request` is invalid.
+        """
+        raise ValueError('{} does not support expansion.'.format(type(self).__name__))
+
+
+class Deferred(FragmentAssembler):
+    """A placeholder for an object which is only produced, and assembled, once it is requested.
+
+    Until `resolve()` is called, a `Deferred` is assembled as a stub (see `is_stub()`); afterwards,
+    it is assembled as the object returned by its thunk. `Assembly.resolve()` resolves a `Deferred`
+    and assembles the object in its place, under the same `FragmentId`.
+    """
+
+    def __init__(self, thunk: Callable[[], Any]) -> None:
+        """
+        Args:
+            thunk: A function, called at most once, which returns the object to be visualized.
+        """
+        super(Deferred, self).__init__()
+        self._thunk = thunk
+        self._resolved = False
+        self._value: Any = None
+
+    @property
+    def resolved(self) -> bool:
+        return self._resolved
+
+    def resolve(self) -> Any:
+        """Returns the object to be visualized, calling the thunk if it has not been called yet."""
+        if not self._resolved:
+            self._value = self._thunk()
+            self._resolved = True
+            self._thunk = None  # type: ignore
+        return self._value
+
+    def assemble(self, get_id: GetId) -> Tuple[Fragment, List[Any]]:
+        if not self._resolved:
+            return _stub_fragment(deferred=True), []
+        # Imported here since `vizstack.view_assembler` depends on this module
+        from vizstack.view_assembler import ViewAssembler
+        return ViewAssembler.get_fragment_assembler(self._value).assemble(get_id)
+
+
+def _stub_fragment(frag_id: Optional[FragmentId] = None, deferred: bool = False) -> Fragment:
+    """Returns a placeholder `Fragment` for an object whose assembly has been postponed.
+
+    Stubs are ordinary `TextPrimitive`s, so that any `View` containing them can be rendered, and are
+    marked in their "meta" so that they can be recognized and replaced. The "meta" also records how
+    to resume: "pendingId" is the `FragmentId` under which the real `Fragment` will be assembled, by
+    the next `Assembly.run()`, or, if "deferred" is set, by `Assembly.resolve(pendingId)`.
+    """
+    meta: FragmentMeta = {_STUB_META_KEY: True}
+    if frag_id is not None:
+        meta[_PENDING_ID_META_KEY] = frag_id
+    if deferred:
+        meta[_DEFERRED_META_KEY] = True
+    return {
+        'type': 'TextPrimitive',
+        'contents': {
+            'text': '...',
+        },
+        'meta': meta,
+    }
@@ -0,0 +1,204 @@
+"""Views of the objects in memory, aggregated by type, for investigating memory use and leaks.
+
+Example:
+    # What does `model` hold on to?
+    assemble(view(model))
+    # What holds on to `leaked`?
+    assemble(view(leaked, direction='referrers'))
+    # What is in the whole heap?
+    assemble(view())
+
+Objects are visited breadth-first through `gc.get_referents()` (or `gc.get_referrers()`), each at
+most once, until `max_objects` have been visited. Rather than one `Fragment` per object, which would
+be unusable for heaps of millions of objects, the view summarizes them: a `Table` of the types seen,
+with their counts and total `sys.getsizeof()`, and a `Dag` of the dominant retention paths, in which
+each type is connected to the type which first reached most of its objects.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from collections import deque
+import gc
+import sys
+import types
+
+from vizstack.assemblers.dag import Dag, _drop_back_edges
+from vizstack.assemblers.sequence import Sequence
+from vizstack.assemblers.table import Table
+from vizstack.assemblers.text import Text
+from vizstack.assemblers.token import Token
+
+if TYPE_CHECKING:
+    from typing_extensions import Literal
+
+    from vizstack.assemblers.token import Color
+
+    Direction = Literal['referents', 'referrers']
+
+__all__ = ['view', 'HeapSummary', 'summarize']
+
+# Objects of these types are counted, but the objects they reference are not visited: following a
+# module, class or function leads to most of the interpreter, which is seldom what is retained.
+_OPAQUE_TYPES = (types.ModuleType, type, types.FunctionType, types.BuiltinFunctionType)
+
+# Passed to mean "the whole heap", since `None` is itself an object which can be explored.
+_ALL = object()
+
+
+class HeapSummary:
+    """Counts, sizes and retention of the objects visited by `summarize()`, by type."""
+
+    def __init__(self) -> None:
+        # For each type: [number of objects, total bytes]
+        self.types: Dict[type, List[int]] = {}
+        # For each (retaining type, retained type): the number of objects of the retained type which
+        # were first reached from an object of the retaining type, or for the whole heap, the number
+        # of references between objects of the two types
+        self.retention: Dict[Tuple[type, type], int] = {}
+        self.num_objects = 0
+        # Whether `max_objects` was reached before every reachable object was visited
+        self.truncated = False
+
+
+def summarize(root: Any = _ALL, max_objects: int = 1000000,
+              direction: Direction = 'referents') -> HeapSummary:
+    """Visits objects breadth-first from `root`, or every object tracked by the garbage collector,
+    and aggregates them by type; see `view()`."""
+    if direction not in ('referents', 'referrers'):
+        raise ValueError('Unknown direction: {}'.format(direction))
+    summary = HeapSummary()
+    counts = summary.types
+    retention = summary.retention
+    get_size = sys.getsizeof
+
+    if root is _ALL:
+        objects = gc.get_objects()
+        # Each object is reached from the heap as a whole, and the references between objects are
+        # aggregated by type
+        ignored = {id(objects), id(summary), id(counts), id(retention)}
+        for obj in objects:
+            if summary.num_objects >= max_objects:
+                summary.truncated = True
+                break
+            if id(obj) in ignored:
+                continue
+            summary.num_objects += 1
+            obj_type = type(obj)
+            _count(counts, obj_type, get_size(obj))
+            if isinstance(obj, _OPAQUE_TYPES):
+                continue
+            for child in gc.get_referents(obj):
+                key = (obj_type, type(child))
+                retention[key] = retention.get(key, 0) + 1
+        del objects
+        return summary
+
+    get_next = gc.get_referents if direction == 'referents' else gc.get_referrers
+    visited = {id(root)}
+    queue = deque([root])
+    # The walk's own containers must not be mistaken for referrers of the objects they hold
+    ignored = {id(visited), id(queue), id(summary), id(counts), id(retention)}
+    while queue:
+        obj = queue.popleft()
+        summary.num_objects += 1
+        obj_type = type(obj)
+        _count(counts, obj_type, get_size(obj))
+        if obj is not root and isinstance(obj, _OPAQUE_TYPES):
+            continue
+        for child in get_next(obj):
+            if id(child) in visited or id(child) in ignored or isinstance(child, types.FrameType):
+                continue
+            if len(visited) >= max_objects:
+                summary.truncated = True
+                break
+            visited.add(id(child))
+            queue.append(child)
+            # Following references from `obj`, the retaining type is that of `obj`; following
+            # referrers, it is that of `child`
+            key = (obj_type, type(child)) if direction == 'referents' else (type(child), obj_type)
+            retention[key] = retention.get(key, 0) + 1
+    return summary
+
+
+def view(root_or_all: Any = _ALL, max_objects: int = 1000000, max_types: int = 30,
+         direction: Direction = 'referents') -> Sequence:
+    """Returns a summary of the objects reachable from an object, or of the whole heap.
+
+    Args:
+        root_or_all: The object to start from. If omitted, every object tracked by the garbage
+            collector is summarized instead, along with the references between them.
+        max_objects: The maximum number of objects to visit.
+        max_types: The maximum number of types to show in the retention `Dag`; the types with the
+            largest total size are kept.
+        direction: Whether to visit the objects which `root_or_all` references ("referents"), or the
+            objects which reference it ("referrers"), to find out what keeps it alive. Finding
+            referrers scans the whole heap for each object visited, so keep `max_objects` small.
+
+    Returns:
+        A `Sequence` of a caption, a `Table` of all types seen and a `Dag` of retention paths.
+    """
+    summary = summarize(root_or_all, max_objects, direction)
+    by_size = sorted(summary.types.items(), key=lambda item: item[1][1], reverse=True)
+    caption = '{} objects of {} types{}'.format(
+        summary.num_objects, len(by_size), ' (stopped at max_objects)' if summary.truncated else '')
+    table = Table({
+        'type': [_get_type_name(t) for t, _ in by_size],
+        'count': [count for _, (count, _) in by_size],
+        'bytes': [size for _, (_, size) in by_size],
+    })
+    dag = _retention_dag(summary, by_size[:max_types])
+    return Sequence([Text(caption, variant='caption'), table, dag], orientation='vertical')
+
+
+def _retention_dag(summary: HeapSummary, shown: List[Tuple[type, List[int]]]) -> Dag:
+    kept = [t for t, _ in shown]
+    node_ids = {t: 't{}'.format(i) for i, t in enumerate(kept)}
+    # Each type is connected only to its dominant retainer among the types shown
+    dominant: Dict[type, Tuple[type, int]] = {}
+    for (retainer, retained), count in summary.retention.items():
+        if retainer is retained or retainer not in node_ids or retained not in node_ids:
+            continue
+        if retained not in dominant or count > dominant[retained][1]:
+            dominant[retained] = (retainer, count)
+    edges: Dict[type, List[Tuple[type, int]]] = {t: [] for t in kept}
+    for retained, (retainer, count) in dominant.items():
+        edges[retainer].append((retained, count))
+
+    total = sum(size for _, (_, size) in shown) or 1
+    dag = Dag(flow_direction='south')
+    for t, (count, size) in shown:
+        share = size / total
+        color: Color = 'red' if share >= 0.25 else 'orange' if share >= 0.1 else 'gray'
+        dag.node(node_ids[t], item=Sequence([
+            Token(_get_type_name(t), color),
+            Text('{} objects, {}'.format(count, _format_bytes(size)), variant='caption'),
+        ], orientation='vertical'))
+    for retainer, retained_types in _drop_back_edges(kept, edges).items():
+        for retained, count in retained_types:
+            dag.edge(node_ids[retainer], node_ids[retained], label='{}x'.format(count))
+    return dag
+
+
+def _count(counts: Dict[type, List[int]], obj_type: type, size: int) -> None:
+    entry = counts.get(obj_type)
+    if entry is None:
+        counts[obj_type] = [1, size]
+    else:
+        entry[0] += 1
+        entry[1] += size
+
+
+def _get_type_name(t: type) -> str:
+    if t.__module__ == 'builtins':
+        return t.__qualname__
+    return '{}.{}'.format(t.__module__, t.__qualname__)
+
+
+def _format_bytes(size: int) -> str:
+    if size < 1024:
+        return '{} B'.format(size)
+    scaled = float(size)
+    for unit in ('KB', 'MB', 'GB'):
+        scaled /= 1024
+        if scaled < 1024 or unit == 'GB':
+            break
+    return '{:.1f} {}'.format(scaled, unit)
@@ -0,0 +1,170 @@
+from typing import Any, Dict, List, Optional, Tuple
+from vizstack.schema import Fragment, FragmentId
+
+__all__ = ['AssemblyHook', 'FragmentEvent', 'MetricsCollector']
+
+
+class FragmentEvent:
+    """Describes the assembly of a single `Fragment`, as passed to `AssemblyHook` methods.
+
+    The same `FragmentEvent` is passed to `pre_fragment()` and then to `post_fragment()`. Before
+    `pre_fragment()`, only the fields describing the object and its position are set; the
+    `Fragment` and timings are filled in before `post_fragment()`.
+
+    Timings are disjoint, so their sum is the total time spent on the `Fragment`:
+        resolve_seconds: Time spent producing the `FragmentAssembler` for `obj`, i.e. in its
+            `__view__()` method or in `get_language_default()`.
+        assemble_seconds: Time spent in the `FragmentAssembler`'s `assemble()`, excluding hashing.
+        hash_seconds: Time spent creating `FragmentId`s for the objects `obj` references.
+    """
+    __slots__ = (
+        'obj', 'fragment_id', 'parent_id', 'slot', 'depth', 'stack_length', 'view_class',
+        'fragment', 'resolve_seconds', 'assemble_seconds', 'hash_seconds'
+    )
+
+    def __init__(self, obj: Any, fragment_id: FragmentId, parent_id: Optional[FragmentId],
+                 slot: Optional[str], depth: int, stack_length: int) -> None:
+        self.obj = obj
+        self.fragment_id = fragment_id
+        self.parent_id = parent_id
+        self.slot = slot
+        self.depth = depth
+        self.stack_length = stack_length
+        # The qualified name of `type(obj)` if `obj.__view__()` produced the `FragmentAssembler`.
+        self.view_class: Optional[str] = None
+        self.fragment: Optional[Fragment] = None
+        self.resolve_seconds = 0.0
+        self.assemble_seconds = 0.0
+        self.hash_seconds = 0.0
+
+
+class AssemblyHook:
+    """Base class for objects which observe a call to `assemble()`.
+
+    Subclasses override either or both methods. Hooks are passed to `assemble(obj, hooks=[...])`;
+    when no hooks are passed, no timing or bookkeeping is done at all.
+    """
+
+    def pre_fragment(self, event: FragmentEvent) -> None:
+        """Called before the `FragmentAssembler` for `event.obj` is produced."""
+        pass
+
+    def post_fragment(self, event: FragmentEvent) -> None:
+        """Called after `event.fragment` has been assembled."""
+        pass
+
+
+def _new_group() -> Dict[str, Any]:
+    return {'count': 0, 'seconds': 0.0, 'bytes': 0}
+
+
+class MetricsCollector(AssemblyHook):
+    """An `AssemblyHook` which aggregates where time and output size go during assembly.
+
+    Example:
+        metrics = MetricsCollector()
+        assemble(obj, hooks=[metrics])
+        print(metrics.report())
+    """
+
+    def __init__(self, measure_size: bool = True) -> None:
+        """
+        Args:
+            measure_size: Whether to measure the serialized size of each `Fragment`. This requires
+                serializing every `Fragment` to JSON, which roughly doubles the cost of assembly.
+        """
+        self._measure_size = measure_size
+        # Imported here, rather than at module level, to keep `json` out of `import vizstack`.
+        import json
+        self._dumps = json.dumps
+        self.by_type: Dict[str, Dict[str, Any]] = {}
+        self.by_view_class: Dict[str, Dict[str, Any]] = {}
+        self.totals: Dict[str, Any] = {
+            'fragments': 0,
+            'bytes': 0,
+            'view_seconds': 0.0,
+            'default_seconds': 0.0,
+            'assemble_seconds': 0.0,
+            'hash_seconds': 0.0,
+        }
+        self.max_depth = 0
+        self.max_stack_length = 0
+        self._deepest_id: Optional[FragmentId] = None
+        self._origins: Dict[FragmentId, Tuple[Optional[FragmentId], Optional[str]]] = {}
+
+    def post_fragment(self, event: FragmentEvent) -> None:
+        assert event.fragment is not None
+        size = len(self._dumps(event.fragment)) if self._measure_size else 0
+        seconds = event.resolve_seconds + event.assemble_seconds + event.hash_seconds
+
+        totals = self.totals
+        totals['fragments'] += 1
+        totals['bytes'] += size
+        totals['view_seconds' if event.view_class is not None else 'default_seconds'] += \
+            event.resolve_seconds
+        totals['assemble_seconds'] += event.assemble_seconds
+        totals['hash_seconds'] += event.hash_seconds
+
+        groups = [self.by_type.setdefault(event.fragment['type'], _new_group())]
+        if event.view_class is not None:
+            groups.append(self.by_view_class.setdefault(event.view_class, _new_group()))
+        for group in groups:
+            group['count'] += 1
+            group['seconds'] += seconds
+            group['bytes'] += size
+
+        self._origins[event.fragment_id] = (event.parent_id, event.slot)
+        if event.depth >= self.max_depth:
+            self.max_depth = event.depth
+            self._deepest_id = event.fragment_id
+        if event.stack_length > self.max_stack_length:
+            self.max_stack_length = event.stack_length
+
+    def deepest_path(self) -> List[str]:
+        """Returns the slots leading from the root to the deepest `Fragment`, starting with the
+        root's `FragmentId`."""
+        path: List[str] = []
+        frag_id = self._deepest_id
+        while frag_id is not None:
+            parent_id, slot = self._origins.get(frag_id, (None, None))
+            path.append(slot if parent_id is not None else frag_id)  # type: ignore
+            frag_id = parent_id
+        return list(reversed(path))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns all collected metrics as a JSON-serializable `dict`."""
+        return {
+            'totals': dict(self.totals),
+            'byType': {name: dict(group) for name, group in self.by_type.items()},
+            'byViewClass': {name: dict(group) for name, group in self.by_view_class.items()},
+            'maxDepth': self.max_depth,
+            'deepestPath': self.deepest_path(),
+            'maxStackLength': self.max_stack_length,
+        }
+
+    def report(self) -> str:
+        """Returns a human-readable text report of all collected metrics."""
+        totals = self.totals
+        lines = [
+            'Fragments: {}  Bytes: {}'.format(totals['fragments'], totals['bytes']),
+            'Time: __view__ {:.6f}s  language defaults {:.6f}s  assemble {:.6f}s  hashing {:.6f}s'
+            .format(
+                totals['view_seconds'], totals['default_seconds'], totals['assemble_seconds'],
+                totals['hash_seconds']
+            ),
+            'Max depth: {}  Max stack length: {}'.format(self.max_depth, self.max_stack_length),
+            'Deepest path: {}'.format('/'.join(self.deepest_path())),
+        ]
+        for title, groups in (('By fragment type', self.by_type),
+                              ('By __view__ class', self.by_view_class)):
+            if not groups:
+                continue
+            lines.append('')
+            lines.append('{:<40} {:>10} {:>12} {:>12}'.format(title, 'count', 'seconds', 'bytes'))
+            for name, group in sorted(groups.items(), key=lambda item: -item[1]['seconds']):
+                lines.append(
+                    '{:<40} {:>10} {:>12.6f} {:>12}'.format(
+                        name, group['count'], group['seconds'], group['bytes']
+                    )
+                )
+        return '\n'.join(lines)
@@ -1,155 +1,245 @@
 from vizstack.fragment_assembler import FragmentAssembler
-from typing import Any, Optional, List, Dict
-from vizstack.assemblers import Text, Token, KeyValue, Sequence, Switch
+from typing import Any, Callable, Optional, List, Dict, Tuple
+from vizstack.assemblers import Text, Token, KeyValue, Sequence
+from array import array
 import types
-import inspect
 
 __all__ = ['get_language_default']
 
 
 _MIN_SHOWN_LENGTH = 10
 
+# Strings longer than this are shown a window of lines at a time; see `Text`.
+_LARGE_TEXT_LENGTH = 2**20
+_LARGE_TEXT_WINDOW = 100
+
+# The number of types whose default view is cached.
+_MAX_CACHED_TYPES = 1024
+
+# Returned by `getattr()` for an attribute which the class of an instance does not define.
+_MISSING = object()
+
 
 def get_language_default(obj: Any) -> FragmentAssembler:
+    """Returns a `FragmentAssembler` which shows `obj` using the default view for its type.
+
+    Which default applies depends only on the type of `obj`, so the choice is made once per type and
+    cached; the cache is safe to share between threads, since a race at worst makes the same choice
+    twice. The choice is not cached for objects whose `__class__` differs from their type, such as
+    weak reference proxies, since `isinstance()` checks their `__class__`; nor once the cache is
+    full, so that classes created on the fly cannot grow it without bound.
+    """
+    obj_type = type(obj)
+    try:
+        make_default = _DEFAULTS[obj_type]
+    except KeyError:
+        make_default = _choose_default(obj)
+        if obj.__class__ is obj_type and len(_DEFAULTS) < _MAX_CACHED_TYPES:
+            _DEFAULTS[obj_type] = make_default
+    return make_default(obj)
+
+
+def _choose_default(obj: Any) -> Callable[[Any], FragmentAssembler]:
     # Primitives: Token containing the value in full
     if isinstance(obj, (str, int, float, bool)) or obj is None:
-        return Text('"{}"'.format(obj) if isinstance(obj, str) else str(obj))
-
+        return _primitive_default
     # List: Sequence of the list elements
     elif isinstance(obj, list):
-        return Sequence(
-            obj,
-            start_motif='[{}] ['.format(len(obj))[-1 if len(obj) < _MIN_SHOWN_LENGTH else 0:],
-            end_motif=']',
-        )
-
+        return _list_default
     # Set: Sequence of the set items
     elif isinstance(obj, set):
-        return Sequence(
-            list(obj),
-            start_motif='[{}] {{'.format(len(obj))[-1 if len(obj) < _MIN_SHOWN_LENGTH else 0:],
-            end_motif='}',
-        )
-
+        return _set_default
     # Tuple: Sequence of the tuple elements
     elif isinstance(obj, tuple):
-        return Sequence(
-            list(obj),
-            start_motif='[{}] ('.format(len(obj))[-1 if len(obj) < _MIN_SHOWN_LENGTH else 0:],
-            end_motif=')',
-        )
-
+        return _tuple_default
     # Dict: KeyValue of the dict items
     elif isinstance(obj, dict):
-        return KeyValue(
-            obj,
-            start_motif='[{}] {{'.format(len(obj))[-1 if len(obj) < _MIN_SHOWN_LENGTH else 0:],
-            end_motif='}',
-        )
-
+        return _dict_default
+    # Binary buffer: Buffer showing a hexdump of its start and end
+    elif isinstance(obj, (bytes, bytearray, memoryview, array)):
+        return _buffer_default
     # Function: Sequence of positional arguments and the KeyValue of keyword arguments
     elif callable(obj):
-        parameters = inspect.signature(obj).parameters.items()
-        args = [param_name for param_name, param in parameters if param.default is inspect._empty] # type: ignore
-        kwargs = {
-            param_name: param.default
-            for param_name, param in parameters
-            if param.default is not inspect._empty  # type: ignore
-        }
-
-        return Sequence(
-            [
-                Sequence(
-                    args,
-                    start_motif='Positional Args [',
-                    end_motif=']',
-                ),
-                KeyValue(
-                    kwargs,
-                    start_motif='Keyword Args {',
-                    end_motif='}',
-                ),
-            ],
-            start_motif='Function[{}] ('.format(obj.__name__),
-            end_motif=')',
-            orientation='vertical',
-        )
-
+        return _function_default
     # Module: KeyValue of module contents
-    elif inspect.ismodule(obj):
-        attributes = dict()
-        for attr in filter(lambda a: not a.startswith('__'), dir(obj)):
-            # There are some functions, like torch.Tensor.data, which exist just to throw errors.
-            # Testing these fields will throw the errors. We should consume them and keep moving
-            # if so.
-            try:
-                value: Any = getattr(obj, attr)
-                if not inspect.ismodule(value):
-                    # Prevent recursing through many modules for no reason
-                    attributes[attr] = getattr(obj, attr)
-            except Exception:
-                continue
-        return KeyValue(
-            attributes,
-            start_motif='Module[{}] {{'.format(obj.__name__),
-            end_motif='}',
-        )
-
+    elif isinstance(obj, types.ModuleType):
+        return _module_default
     # Class: KeyValue of functions and KeyValue of static fields
-    elif inspect.isclass(obj):
-        functions = dict()
-        staticfields = dict()
-        for attr in filter(lambda a: not a.startswith('__'), dir(obj)):
-            try:
-                value = getattr(obj, attr)
-                if inspect.isfunction(value):
-                    functions[attr] = value
-                else:
-                    staticfields[attr] = value
-            except AttributeError:
-                continue
-        contents: List[FragmentAssembler] = []
-        if len(functions) > 0:
-            contents.append(
-                KeyValue(
-                    functions,
-                    start_motif='Functions {',
-                    end_motif='}',
-                )
-            )
-        if len(staticfields) > 0:
-            contents.append(
-                KeyValue(
-                    staticfields,
-                    start_motif='Fields {',
-                    end_motif='}',
-                )
-            )
-        return Sequence(
-            contents,
-            start_motif='Class[{}] ('.format(obj.__name__),
-            end_motif=')',
-            orientation='vertical'
-        )
-
+    elif isinstance(obj, type):
+        return _class_default
     # Object instance: KeyValue of all instance attributes
     else:
-        instance_class = type(obj)
-        instance_class_attrs = dir(instance_class)
-        instance_fields: Dict[str, Any] = dict()
-        for attr in filter(lambda a: not a.startswith('__'), dir(obj)):
+        return _instance_default
+
+
+def _primitive_default(obj: Any) -> FragmentAssembler:
+    if isinstance(obj, str) and len(obj) > _LARGE_TEXT_LENGTH:
+        # Quoting a large string would copy it, and only a window of it is shipped anyway
+        return Text(obj, window=_LARGE_TEXT_WINDOW)
+    return Text('"{}"'.format(obj) if isinstance(obj, str) else str(obj))
+
+
+def _list_default(obj: Any) -> FragmentAssembler:
+    return Sequence(
+        obj,
+        start_motif='[{}] ['.format(len(obj))[-1 if len(obj) < _MIN_SHOWN_LENGTH else 0:],
+        end_motif=']',
+    )
+
+
+def _set_default(obj: Any) -> FragmentAssembler:
+    return Sequence(
+        list(obj),
+        start_motif='[{}] {{'.format(len(obj))[-1 if len(obj) < _MIN_SHOWN_LENGTH else 0:],
+        end_motif='}',
+    )
+
+
+def _tuple_default(obj: Any) -> FragmentAssembler:
+    return Sequence(
+        list(obj),
+        start_motif='[{}] ('.format(len(obj))[-1 if len(obj) < _MIN_SHOWN_LENGTH else 0:],
+        end_motif=')',
+    )
+
+
+def _dict_default(obj: Any) -> FragmentAssembler:
+    return KeyValue(
+        obj,
+        start_motif='[{}] {{'.format(len(obj))[-1 if len(obj) < _MIN_SHOWN_LENGTH else 0:],
+        end_motif='}',
+    )
+
+
+def _buffer_default(obj: Any) -> FragmentAssembler:
+    # Imported here so that `vizstack.assemblers.buffer` is only loaded once a buffer is shown
+    from vizstack.assemblers import Buffer
+    return Buffer(obj)
+
+
+def _function_default(obj: Any) -> FragmentAssembler:
+    if isinstance(obj, types.MethodType):
+        fn, bound = obj.__func__, True
+    else:
+        fn, bound = obj, False
+    args, kwargs = _get_parameters(fn, bound)
+    return Sequence(
+        [
+            Sequence(
+                list(args),
+                start_motif='Positional Args [',
+                end_motif=']',
+            ),
+            KeyValue(
+                dict(kwargs),
+                start_motif='Keyword Args {',
+                end_motif='}',
+            ),
+        ],
+        start_motif='Function[{}] ('.format(obj.__name__),
+        end_motif=')',
+        orientation='vertical',
+    )
+
+
+def _module_default(obj: Any) -> FragmentAssembler:
+    attributes = dict()
+    for attr in filter(lambda a: not a.startswith('__'), dir(obj)):
+        # There are some functions, like torch.Tensor.data, which exist just to throw errors.
+        # Testing these fields will throw the errors. We should consume them and keep moving
+        # if so.
+        try:
+            value: Any = getattr(obj, attr)
+            if not isinstance(value, types.ModuleType):
+                # Prevent recursing through many modules for no reason
+                attributes[attr] = getattr(obj, attr)
+        except Exception:
+            continue
+    return KeyValue(
+        attributes,
+        start_motif='Module[{}] {{'.format(obj.__name__),
+        end_motif='}',
+    )
+
+
+def _class_default(obj: Any) -> FragmentAssembler:
+    functions = dict()
+    staticfields = dict()
+    for attr in filter(lambda a: not a.startswith('__'), dir(obj)):
+        try:
             value = getattr(obj, attr)
-            try:
-                if not callable(value) and (attr not in instance_class_attrs or
-                                            getattr(instance_class, attr, None) != value):
-                    instance_fields[attr] = value
-            except Exception:
-                # If some unexpected error occurs (as any object can override `getattr()` like
-                # Pytorch does, and raise any error), just skip over instead of crashing
-                continue
-        return KeyValue(
-            instance_fields,
-            separator='=',
-            start_motif='Instance[{}] {{'.format(type(obj).__name__),
-            end_motif='}',
+            if isinstance(value, types.FunctionType):
+                functions[attr] = value
+            else:
+                staticfields[attr] = value
+        except AttributeError:
+            continue
+    contents: List[FragmentAssembler] = []
+    if len(functions) > 0:
+        contents.append(
+            KeyValue(
+                functions,
+                start_motif='Functions {',
+                end_motif='}',
+            )
+        )
+    if len(staticfields) > 0:
+        contents.append(
+            KeyValue(
+                staticfields,
+                start_motif='Fields {',
+                end_motif='}',
+            )
         )
+    return Sequence(
+        contents,
+        start_motif='Class[{}] ('.format(obj.__name__),
+        end_motif=')',
+        orientation='vertical'
+    )
+
+
+def _instance_default(obj: Any) -> FragmentAssembler:
+    instance_class = type(obj)
+    instance_fields: Dict[str, Any] = dict()
+    for attr in filter(lambda a: not a.startswith('__'), dir(obj)):
+        value = getattr(obj, attr)
+        try:
+            # Show the attributes which the class does not define, or which the instance overrides
+            class_value = getattr(instance_class, attr, _MISSING)
+            if not callable(value) and (class_value is _MISSING or class_value != value):
+                instance_fields[attr] = value
+        except Exception:
+            # If some unexpected error occurs (as any object can override `getattr()` like
+            # Pytorch does, and raise any error), just skip over instead of crashing
+            continue
+    return KeyValue(
+        instance_fields,
+        separator='=',
+        start_motif='Instance[{}] {{'.format(type(obj).__name__),
+        end_motif='}',
+    )
+
+
+# Not cached: a cache would either keep functions and classes alive or need weak references, and
+# could not tell when their defaults are reassigned or their methods patched.
+def _get_parameters(fn: Any, bound: bool) -> Tuple[Tuple[str, ...], Tuple[Tuple[str, Any], ...]]:
+    """Returns the names of the parameters of `fn` without defaults, and the (name, default) pairs
+    of those with defaults. If `bound` is set, the first positional parameter, which a method binds
+    to its instance, is left out."""
+    # `inspect` is slow to import and only needed here, so it is imported on first use
+    import inspect
+    parameters = list(inspect.signature(fn).parameters.items())
+    if bound and parameters and parameters[0][1].kind in (inspect.Parameter.POSITIONAL_ONLY,
+                                                          inspect.Parameter.POSITIONAL_OR_KEYWORD):
+        parameters = parameters[1:]
+    empty = inspect.Parameter.empty
+    args = tuple(param_name for param_name, param in parameters if param.default is empty)
+    kwargs = tuple((param_name, param.default)
+                   for param_name, param in parameters
+                   if param.default is not empty)
+    return args, kwargs
+
+
+# Maps each type to the function which creates the default `FragmentAssembler` for its instances.
+_DEFAULTS: Dict[type, Callable[[Any], FragmentAssembler]] = {}
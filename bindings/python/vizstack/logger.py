@@ -0,0 +1,243 @@
+"""Non-blocking logging of `View`s, assembled and written on a background thread.
+
+Example:
+    configure(sink=JsonLinesSink('views.jsonl'), policy='drop')
+
+    def handle(request):
+        log(request.payload)  # Returns immediately
+        ...
+
+`log()` takes a structural `snapshot()` of the object, so that later changes to it do not affect the
+`View`, and puts it on a bounded queue. A background thread assembles each snapshot and passes the
+`View` to a sink. When the queue is full, the logger's policy decides what happens:
+    "drop":   The object is dropped; `log()` never waits.
+    "sample": Once the queue is half full, only one in `sample_every` objects is queued, and the
+              rest are dropped; `log()` never waits.
+    "block":  `log()` waits for space, up to `timeout` seconds, and drops the object after that.
+The counters in `stats()` record how many objects were queued, dropped, written and failed.
+Objects logged after `close()` are dropped. The logger used by `log()` is closed at exit, so that
+the objects still queued are written.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, IO, Optional, Union
+from collections import deque
+from threading import Lock, Thread
+from queue import Empty, Full, Queue
+import atexit
+
+from vizstack.schema import View
+from vizstack.snapshot import snapshot
+from vizstack.view_assembler import ViewAssembler
+
+if TYPE_CHECKING:
+    from typing_extensions import Literal
+
+    Policy = Literal['drop', 'sample', 'block']
+
+__all__ = ['log', 'configure', 'get_logger', 'ViewLogger', 'JsonLinesSink']
+
+# Put on the queue to stop the worker.
+_STOP = object()
+
+
+class JsonLinesSink:
+    """A sink which writes each `View` as a line of JSON."""
+
+    def __init__(self, file: Union[str, IO[str]]) -> None:
+        """
+        Args:
+            file: A path, which is opened for appending, or a text file object.
+        """
+        self._owned = isinstance(file, str)
+        self._file: IO[str] = open(file, 'a') if isinstance(file, str) else file
+
+    def __call__(self, view: View) -> None:
+        # `json` is only needed once a `View` is written, so it is imported on first use
+        import json
+        self._file.write(json.dumps(view, separators=(',', ':')))
+        self._file.write('\n')
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._owned:
+            self._file.close()
+
+
+class ViewLogger:
+    """Assembles logged objects on a background thread and passes their `View`s to a sink."""
+
+    def __init__(self,
+                 sink: Optional[Callable[[View], Any]] = None,
+                 max_queue: int = 1024,
+                 policy: Policy = 'drop',
+                 sample_every: int = 10,
+                 timeout: Optional[float] = None,
+                 depth: int = 3,
+                 max_recent: int = 100) -> None:
+        """
+        Args:
+            sink: A function called with each assembled `View`, e.g. a `JsonLinesSink`. If `None`,
+                the `max_recent` most recent `View`s are kept in `recent`.
+            max_queue: The maximum number of objects waiting to be assembled.
+            policy: What to do when the queue is full; see the module documentation.
+            sample_every: For the "sample" policy, queue one in this many objects under pressure.
+            timeout: For the "block" policy, the maximum number of seconds to wait for space, or
+                `None` to wait indefinitely.
+            depth: The depth to which containers are copied; see `snapshot()`.
+            max_recent: The number of `View`s kept in `recent` when there is no sink.
+        """
+        if policy not in ('drop', 'sample', 'block'):
+            raise ValueError('Unknown policy: {}'.format(policy))
+        if sample_every < 1:
+            raise ValueError('Expected sample_every >= 1, got {}.'.format(sample_every))
+        self.recent: Deque[View] = deque(maxlen=max_recent)
+        self._sink: Callable[[View], Any] = sink if sink is not None else self.recent.append
+        self._queue: Queue = Queue(maxsize=max_queue)
+        self._policy = policy
+        self._sample_every = sample_every
+        self._pressure_threshold = max(1, max_queue // 2)
+        self._timeout = timeout
+        self._depth = depth
+        self._counters_lock = Lock()
+        self._pressured = 0
+        self.queued = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self._closed = False
+        self._worker = Thread(target=self._run, name='vizstack-log', daemon=True)
+        self._worker.start()
+
+    def log(self, obj: Any) -> bool:
+        """Queues `obj` to be assembled, unless the queue is full; see the module documentation.
+
+        Returns:
+            Whether `obj` was queued.
+        """
+        if self._closed:
+            return self._drop()
+        queue = self._queue
+        policy = self._policy
+        if policy == 'sample' and queue.qsize() >= self._pressure_threshold:
+            with self._counters_lock:
+                self._pressured += 1
+                skip = self._pressured % self._sample_every != 0
+            if skip:
+                return self._drop()
+        try:
+            if policy == 'block':
+                queue.put(snapshot(obj, self._depth), timeout=self._timeout)
+            else:
+                # Check first, to avoid copying an object which will be dropped anyway
+                if queue.full():
+                    return self._drop()
+                queue.put_nowait(snapshot(obj, self._depth))
+        except Full:
+            return self._drop()
+        with self._counters_lock:
+            self.queued += 1
+        return True
+
+    def _drop(self) -> bool:
+        with self._counters_lock:
+            self.dropped += 1
+        return False
+
+    def _run(self) -> None:
+        queue = self._queue
+        stopping = False
+        while True:
+            try:
+                obj = queue.get(block=not stopping)
+            except Empty:
+                return
+            if obj is _STOP:
+                # Also write any objects which `log()` queued while `close()` was stopping it
+                queue.task_done()
+                stopping = True
+                continue
+            try:
+                self._write(obj)
+            finally:
+                queue.task_done()
+
+    def _write(self, obj: Any) -> None:
+        try:
+            self._sink(ViewAssembler.assemble(obj))
+            with self._counters_lock:
+                self.written += 1
+        except Exception:
+            # A failure to assemble or write one object must not stop the logger
+            with self._counters_lock:
+                self.failed += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the counters: "queued", "dropped", "written", "failed", and "pending" (queued but
+        not yet written or failed)."""
+        with self._counters_lock:
+            return {
+                'queued': self.queued,
+                'dropped': self.dropped,
+                'written': self.written,
+                'failed': self.failed,
+                'pending': self._queue.qsize(),
+            }
+
+    def flush(self) -> None:
+        """Waits until every queued object has been written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Writes every queued object and stops the background thread. Objects logged afterwards are
+        dropped."""
+        with self._counters_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(_STOP)
+        self._worker.join()
+        close_sink = getattr(self._sink, 'close', None)
+        if close_sink is not None:
+            close_sink()
+
+
+_logger: Optional[ViewLogger] = None
+_logger_lock = Lock()
+
+
+def get_logger() -> ViewLogger:
+    """Returns the logger used by `log()`, creating one with the default options if needed."""
+    global _logger
+    if _logger is None:
+        with _logger_lock:
+            if _logger is None:
+                _logger = ViewLogger()
+    return _logger
+
+
+def configure(**kwargs: Any) -> ViewLogger:
+    """Replaces the logger used by `log()` with `ViewLogger(**kwargs)`, closing the previous one."""
+    global _logger
+    with _logger_lock:
+        previous, _logger = _logger, ViewLogger(**kwargs)
+    if previous is not None:
+        previous.close()
+    return _logger
+
+
+def log(obj: Any) -> bool:
+    """Queues `obj` to be assembled and written by the default logger, without waiting for either.
+
+    Returns:
+        Whether `obj` was queued, rather than dropped.
+    """
+    return get_logger().log(obj)
+
+
+def _close_at_exit() -> None:
+    # The worker is a daemon thread, which would otherwise be stopped with objects still queued
+    if _logger is not None:
+        _logger.close()
+
+
+atexit.register(_close_at_exit)
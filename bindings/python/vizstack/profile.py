@@ -0,0 +1,151 @@
+"""Views of `cProfile` profiles as call graphs.
+
+Example:
+    with Profiler() as profiler:
+        train_one_epoch()
+    assemble(profiler.view())
+
+    # Or, from a saved profile:
+    assemble(view(pstats.Stats('train.prof')))
+
+Each function which accounts for at least `threshold` of the total time becomes a node of a `Dag`,
+labelled with its cumulative and self time; at most `max_nodes` of the most expensive functions are
+kept, so that profiles with tens of thousands of functions still produce a readable graph. Edges go
+from caller to callee and are labelled with call counts. The hot path, which follows the most
+expensive callee from the most expensive function, is shown in red, and other functions are colored
+by their share of the total time.
+"""
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+import heapq
+import os
+
+from vizstack.assemblers.dag import Dag, _drop_back_edges
+from vizstack.assemblers.sequence import Sequence
+from vizstack.assemblers.text import Text
+from vizstack.assemblers.token import Token
+
+if TYPE_CHECKING:
+    import pstats
+    from vizstack.assemblers.token import Color
+
+    # (filename, line number, function name), as in `pstats.Stats.stats`
+    Function = Tuple[str, int, str]
+
+__all__ = ['view', 'Profiler']
+
+# The colors of functions, by the minimum share of the total time they account for.
+_COLORS: List[Tuple[float, Color]] = [(0.25, 'orange'), (0.1, 'yellow'), (0.0, 'gray')]
+_HOT_COLOR: Color = 'red'
+
+
+class Profiler:
+    """A context manager which profiles its body with `cProfile`."""
+
+    def __init__(self) -> None:
+        import cProfile
+        self._profile = cProfile.Profile()
+
+    def __enter__(self) -> 'Profiler':
+        self._profile.enable()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self._profile.disable()
+
+    @property
+    def stats(self) -> pstats.Stats:
+        import pstats
+        return pstats.Stats(self._profile)
+
+    def view(self, threshold: float = 0.01, max_nodes: int = 100) -> Dag:
+        """Returns a call graph of the profiled body; see `view()`."""
+        return view(self.stats, threshold=threshold, max_nodes=max_nodes)
+
+
+def view(stats: Any, threshold: float = 0.01, max_nodes: int = 100) -> Dag:
+    """Returns a `Dag` showing the call graph of a profile.
+
+    Args:
+        stats: A `pstats.Stats`, a `Profiler`, or anything from which a `pstats.Stats` can be
+            created, such as a `cProfile.Profile` or the path of a saved profile.
+        threshold: The minimum share of the total time, between 0 and 1, which a function must
+            account for (including its callees) to be shown.
+        max_nodes: The maximum number of functions to show; the most expensive ones are kept.
+
+    Returns:
+        A `Dag` with one node per function shown.
+    """
+    if isinstance(stats, Profiler):
+        stats = stats.stats
+    elif not hasattr(stats, 'stats'):
+        import pstats
+        stats = pstats.Stats(stats)
+    entries: Dict[Function, Tuple[Any, ...]] = stats.stats
+    total = max((entry[3] for entry in entries.values()), default=0.0)
+
+    # Keep the most expensive functions above the threshold; `nlargest()` avoids a full sort
+    cutoff = threshold * total
+    kept = heapq.nlargest(
+        max_nodes, (func for func, entry in entries.items() if entry[3] >= cutoff),
+        key=lambda func: entries[func][3]
+    )
+    node_ids = {func: 'f{}'.format(i) for i, func in enumerate(kept)}
+
+    callees: Dict[Function, List[Tuple[Function, int]]] = {func: [] for func in kept}
+    for func in kept:
+        for caller, caller_entry in entries[func][4].items():
+            if caller in node_ids and caller != func:
+                # `cProfile` records (calls, primitive calls, ...) per caller; `profile` only calls
+                calls = caller_entry[0] if isinstance(caller_entry, tuple) else caller_entry
+                callees[caller].append((func, calls))
+
+    hot = _get_hot_path(kept, callees, entries)
+    dag = Dag(flow_direction='south')
+    for func in kept:
+        _, calls, self_time, cumulative_time = entries[func][:4]
+        if func in hot:
+            color = _HOT_COLOR
+        else:
+            share = cumulative_time / total if total > 0 else 0.0
+            color = next(c for minimum, c in _COLORS if share >= minimum)
+        caption = '{} cumulative, {} self, {} calls'.format(
+            _format_seconds(cumulative_time), _format_seconds(self_time), calls)
+        dag.node(node_ids[func], item=Sequence([
+            Token(_get_label(func), color),
+            Text(caption, variant='caption'),
+        ], orientation='vertical'))
+    for caller, edges in _drop_back_edges(kept, callees).items():
+        for callee, calls in edges:
+            dag.edge(node_ids[caller], node_ids[callee], label='{}x'.format(calls))
+    return dag
+
+
+def _get_hot_path(kept: List[Function], callees: Dict[Function, List[Tuple[Function, int]]],
+                  entries: Dict[Function, Tuple[Any, ...]]) -> Set[Function]:
+    """Returns the functions on the path which starts at the most expensive function and repeatedly
+    follows its most expensive callee."""
+    hot: Set[Function] = set()
+    func: Optional[Function] = kept[0] if kept else None
+    while func is not None and func not in hot:
+        hot.add(func)
+        func = max(
+            (callee for callee, _ in callees[func]), key=lambda f: entries[f][3], default=None
+        )
+    return hot
+
+
+def _get_label(func: Function) -> str:
+    filename, line, name = func
+    if filename == '~':
+        # Built-in functions have no source location
+        return name
+    return '{} ({}:{})'.format(name, os.path.basename(filename), line)
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return '{:.2f}s'.format(seconds)
+    if seconds >= 1e-3:
+        return '{:.1f}ms'.format(seconds * 1e3)
+    return '{:.0f}us'.format(seconds * 1e6)
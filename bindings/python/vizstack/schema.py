@@ -1,5 +1,4 @@
-from typing import Union, Dict, List, NewType
-from mypy_extensions import TypedDict
+from typing import TYPE_CHECKING, Any, Union, Dict, List, NewType
 
 JsonType = Union[str, float, int, bool, None, List['JsonType'], Dict[str, 'JsonType']]
 
@@ -7,15 +6,31 @@ FragmentMeta = Dict[str, JsonType]
 
 FragmentId = NewType('FragmentId', str)
 
-Fragment = TypedDict(
-    'Fragment', {
-        'type': str,
-        'contents': Dict[str, JsonType],
-        'meta': FragmentMeta,
-    }
-)
+if TYPE_CHECKING:
+    from mypy_extensions import TypedDict
 
-View = TypedDict('View', {
-    'rootId': FragmentId,
-    'fragments': Dict[FragmentId, Fragment],
-})
+    Fragment = TypedDict(
+        'Fragment', {
+            'type': str,
+            'contents': Dict[str, JsonType],
+            'meta': FragmentMeta,
+        }
+    )
+
+    View = TypedDict('View', {
+        'rootId': FragmentId,
+        'fragments': Dict[FragmentId, Fragment],
+    })
+
+    # A `View` of several named objects; "rootId" is the `FragmentId` of the first of them.
+    MultiRootView = TypedDict('MultiRootView', {
+        'rootId': FragmentId,
+        'rootIds': Dict[str, FragmentId],
+        'fragments': Dict[FragmentId, Fragment],
+    })
+else:
+    # The schema types only matter to type checkers, so they are not built at runtime; this keeps
+    # `mypy_extensions` out of `import vizstack`.
+    Fragment = Dict[str, Any]
+    View = Dict[str, Any]
+    MultiRootView = Dict[str, Any]
@@ -0,0 +1,411 @@
+"""A local HTTP/WebSocket server which assembles `Fragment`s on demand.
+
+Instead of assembling and shipping a complete `View`, the server holds a registry of named root
+objects and assembles each `Fragment` only when a client asks for its `FragmentId`. `FragmentId`s
+are created exactly as by `assemble()`, and `Fragment`s have the same schema, so a client can build
+the same `View` one `Fragment` at a time. Serialized `Fragment`s are kept in a bounded LRU cache.
+However, each root keeps every object it has assigned a `FragmentId`, so that the `Fragment`s they
+reference can still be requested. The server's memory therefore grows with the number of distinct
+`Fragment`s visited until the root is registered again, or unregistered.
+
+Every request must carry the server's `token`, as a "token" query parameter, e.g.
+GET /roots?token=<token>; other requests get a 403 response. Responses carry no CORS headers, and
+WebSocket upgrades from any `Origin` but the server's own are rejected, so that web pages visited
+in a browser cannot read the state of the program.
+
+HTTP endpoints (all responses are JSON):
+    GET /roots                          -> {"roots": [name, ...]}
+    GET /roots/<name>                   -> {"rootId": <FragmentId>}
+    GET /roots/<name>/fragments/<id>    -> <Fragment>, with an ETag header; a request whose
+                                           If-None-Match header matches gets a 304 response.
+    GET /roots/<name>/fragments/<id>/expand?<param>=<value>&...
+                                        -> More of the data shown by a `Fragment` which shows only
+                                           part of it, e.g. ?start=100&count=50 for the lines of a
+                                           large `Text`; see `FragmentAssembler.expand()`.
+    GET /roots/<name>/view              -> <View>, fully assembled.
+
+WebSocket endpoint:
+    /ws     Each text message {"root": <name>, "id": <FragmentId>} is answered by a message
+            {"root": <name>, "id": <FragmentId>, "etag": <str>, "fragment": <Fragment>}, or by
+            {"root": <name>, "id": <FragmentId>, "error": <str>} if the fragment does not exist.
+            A message {"root": <name>, "id": <FragmentId>, "expand": {<param>: <value>, ...}} is
+            answered by {"root": <name>, "id": <FragmentId>, "expansion": <dict>} instead.
+
+Example:
+    server = FragmentServer(port=8000)
+    server.register('model', model)
+    server.start()
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote, urlsplit
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import struct
+import threading
+
+from vizstack.schema import Fragment, FragmentId
+from vizstack.view_assembler import Assembly, ViewAssembler
+
+__all__ = ['FragmentServer', 'LRUCache']
+
+_WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+
+class LRUCache:
+    """A thread-safe mapping which holds at most `capacity` items, evicting the least recently
+    used."""
+
+    def __init__(self, capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError('LRUCache capacity must be positive, got {}.'.format(capacity))
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items: 'OrderedDict[Any, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Returns the value for `key` and marks it as most recently used, or `None` if absent."""
+        with self._lock:
+            try:
+                self._items.move_to_end(key)
+            except KeyError:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return self._items[key]
+
+    def put(self, key: Any, value: Any) -> None:
+        """Inserts or replaces the value for `key`, evicting the least recently used item if
+        full."""
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, predicate: Any) -> None:
+        """Removes every item whose key satisfies `predicate`."""
+        with self._lock:
+            for key in [key for key in self._items if predicate(key)]:
+                del self._items[key]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class _Root:
+    """A registered root object, whose `Fragment`s are assembled one at a time."""
+
+    def __init__(self, obj: Any, cache_size: int) -> None:
+        self.obj = obj
+        # Expanders are bounded like cached `Fragment`s
+        self.assembly = Assembly(obj, max_expanders=cache_size)
+        # `Assembly` is not thread-safe, and request handlers run on separate threads.
+        self.lock = threading.Lock()
+
+
+class FragmentServer:
+    """Serves the `Fragment`s of registered objects over HTTP and WebSocket on demand."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, cache_size: int = 10000,
+                 token: Optional[str] = None) -> None:
+        """
+        Args:
+            host: The interface to listen on. Defaults to localhost only.
+            port: The port to listen on; 0 picks a free port, available as `port` afterwards.
+            cache_size: The maximum number of serialized `Fragment`s to keep in memory. The objects
+                behind visited `Fragment`s are kept regardless; see the module documentation.
+            token: The token which every request must carry. Defaults to a random one, available as
+                `token` afterwards.
+        """
+        self.cache = LRUCache(cache_size)
+        self.token = token if token is not None else secrets.token_urlsafe(16)
+        self._roots: Dict[str, _Root] = {}
+        self._roots_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.fragment_server = self  # type: ignore
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def host(self) -> str:
+        return self._httpd.server_address[0]  # type: ignore
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1]  # type: ignore
+
+    @property
+    def url(self) -> str:
+        return 'http://{}:{}'.format(self.host, self.port)
+
+    def is_own_origin(self, origin: str) -> bool:
+        """Returns whether `origin`, the value of an `Origin` header, is this server's origin."""
+        origins = {self.url}
+        if self.host == '127.0.0.1':
+            origins.add('http://localhost:{}'.format(self.port))
+        return origin in origins
+
+    # ==============================================================================================
+    # Registry.
+
+    def register(self, name: str, obj: Any) -> 'FragmentServer':
+        """Registers `obj` as a root named `name`, replacing any existing root with that name."""
+        with self._roots_lock:
+            self._roots[name] = _Root(obj, self.cache.capacity)
+        self.cache.discard(lambda key: key[0] == name)
+        return self
+
+    def unregister(self, name: str) -> None:
+        """Removes the root named `name` and its cached `Fragment`s."""
+        with self._roots_lock:
+            self._roots.pop(name, None)
+        self.cache.discard(lambda key: key[0] == name)
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Drops cached `Fragment`s of the root `name`, or of all roots, so that changes to the
+        underlying objects are picked up by the next request. `FragmentId`s are preserved."""
+        self.cache.discard(lambda key: name is None or key[0] == name)
+
+    def roots(self) -> List[str]:
+        with self._roots_lock:
+            return list(self._roots)
+
+    def get_fragment(self, name: str, frag_id: FragmentId) -> Tuple[Fragment, bytes, str]:
+        """Returns a `Fragment` of a root with its serialized form and ETag, assembling it if
+        needed.
+
+        Raises:
+            KeyError: If there is no root named `name`, or `frag_id` has not been referenced by any
+                `Fragment` of it assembled so far.
+        """
+        key = (name, frag_id)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        with self._roots_lock:
+            root = self._roots[name]
+        with root.lock:
+            fragment = root.assembly.assemble_fragment(frag_id)
+        body = json.dumps(fragment, separators=(',', ':')).encode()
+        etag = '"{}"'.format(hashlib.md5(body).hexdigest())
+        entry = (fragment, body, etag)
+        self.cache.put(key, entry)
+        return entry
+
+    def expand(self, name: str, frag_id: FragmentId, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Returns more of the data shown by a `Fragment` of a root; see `Assembly.expand()`.
+
+        Raises:
+            KeyError: If there is no root named `name`, or no object has been assigned `frag_id`.
+            ValueError: If the `Fragment` cannot be expanded, or `request` is invalid.
+        """
+        with self._roots_lock:
+            root = self._roots[name]
+        with root.lock:
+            return root.assembly.expand(frag_id, request)
+
+    def get_view(self, name: str) -> Dict[str, Any]:
+        """Returns the fully-assembled `View` of the root named `name`."""
+        with self._roots_lock:
+            root = self._roots[name]
+        return ViewAssembler.assemble(root.obj)  # type: ignore
+
+    # ==============================================================================================
+    # Lifecycle.
+
+    def start(self) -> 'FragmentServer':
+        """Starts serving on a background daemon thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serves on the calling thread until `stop()` is called from another thread."""
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        """Stops serving and closes the listening socket."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> 'FragmentServer':
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    @property
+    def _fragment_server(self) -> FragmentServer:
+        return self.server.fragment_server  # type: ignore
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Keep the console quiet; the server is usually embedded in another program.
+        pass
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        parts = [unquote(part) for part in url.path.split('/') if part]
+        server = self._fragment_server
+        query = dict(parse_qsl(url.query))
+        token = query.pop('token', '')
+        if not hmac.compare_digest(token.encode(), server.token.encode()):
+            self._send_json(403, {'error': 'Missing or invalid token.'})
+            return
+        if parts == ['ws'] and self.headers.get('Upgrade', '').lower() == 'websocket':
+            origin = self.headers.get('Origin')
+            if origin is not None and not server.is_own_origin(origin):
+                self._send_json(403, {'error': 'Cross-origin WebSockets are not allowed.'})
+                return
+            self._serve_websocket()
+            return
+        try:
+            if parts == ['roots']:
+                self._send_json(200, {'roots': server.roots()})
+            elif len(parts) == 2 and parts[0] == 'roots':
+                if parts[1] not in server.roots():
+                    raise KeyError(parts[1])
+                self._send_json(200, {'rootId': ViewAssembler._ROOT_ID})
+            elif len(parts) == 4 and parts[0] == 'roots' and parts[2] == 'fragments':
+                _, body, etag = server.get_fragment(parts[1], FragmentId(parts[3]))
+                if self.headers.get('If-None-Match') == etag:
+                    self._send(304, b'', etag=etag)
+                else:
+                    self._send(200, body, etag=etag)
+            elif (len(parts) == 5 and parts[0] == 'roots' and parts[2] == 'fragments'
+                  and parts[4] == 'expand'):
+                self._send_json(200, server.expand(parts[1], FragmentId(parts[3]), query))
+            elif len(parts) == 3 and parts[0] == 'roots' and parts[2] == 'view':
+                self._send_json(200, server.get_view(parts[1]))
+            else:
+                self._send_json(404, {'error': 'Unknown endpoint: {}'.format(self.path)})
+        except KeyError as e:
+            self._send_json(404, {'error': 'Not found: {}'.format(e.args[0])})
+        except ValueError as e:
+            self._send_json(400, {'error': str(e)})
+
+    def _send_json(self, status: int, obj: Any) -> None:
+        self._send(status, json.dumps(obj, separators=(',', ':')).encode())
+
+    def _send(self, status: int, body: bytes, etag: Optional[str] = None) -> None:
+        self.send_response(status)
+        self.send_header('Cache-Control', 'no-cache')
+        if etag is not None:
+            self.send_header('ETag', etag)
+        if status != 304:
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+    # ==============================================================================================
+    # WebSocket (RFC 6455), supporting only what the fragment protocol needs: unfragmented or
+    # fragmented text messages from the client, text messages to the client, ping and close.
+
+    def _serve_websocket(self) -> None:
+        key = self.headers.get('Sec-WebSocket-Key')
+        if key is None:
+            self._send_json(400, {'error': 'Missing Sec-WebSocket-Key header.'})
+            return
+        accept = base64.b64encode(hashlib.sha1((key + _WEBSOCKET_GUID).encode()).digest()).decode()
+        self.send_response(101, 'Switching Protocols')
+        self.send_header('Upgrade', 'websocket')
+        self.send_header('Connection', 'Upgrade')
+        self.send_header('Sec-WebSocket-Accept', accept)
+        self.end_headers()
+        self.close_connection = True
+
+        message = b''
+        while True:
+            frame = self._read_frame()
+            if frame is None:
+                return
+            fin, opcode, payload = frame
+            if opcode == 0x8:  # Close
+                self._write_frame(0x8, payload[:2])
+                return
+            elif opcode == 0x9:  # Ping
+                self._write_frame(0xA, payload)
+            elif opcode in (0x0, 0x1):  # Continuation or text
+                message += payload
+                if fin:
+                    self._write_frame(0x1, self._handle_message(message))
+                    message = b''
+
+    def _handle_message(self, message: bytes) -> bytes:
+        try:
+            request = json.loads(message.decode())
+            name, frag_id = request['root'], request['id']
+        except (ValueError, KeyError, TypeError):
+            return json.dumps({'error': 'Expected {"root": ..., "id": ...}.'}).encode()
+        try:
+            if 'expand' in request:
+                expansion = self._fragment_server.expand(name, frag_id, request['expand'])
+                response = {'root': name, 'id': frag_id, 'expansion': expansion}
+            else:
+                fragment, _, etag = self._fragment_server.get_fragment(name, frag_id)
+                response = {'root': name, 'id': frag_id, 'etag': etag, 'fragment': fragment}
+        except KeyError as e:
+            response = {'root': name, 'id': frag_id, 'error': 'Not found: {}'.format(e.args[0])}
+        except (ValueError, TypeError) as e:
+            response = {'root': name, 'id': frag_id, 'error': str(e)}
+        return json.dumps(response, separators=(',', ':')).encode()
+
+    def _read_exactly(self, n: int) -> Optional[bytes]:
+        data = self.rfile.read(n)
+        return data if len(data) == n else None
+
+    def _read_frame(self) -> Optional[Tuple[bool, int, bytes]]:
+        header = self._read_exactly(2)
+        if header is None:
+            return None
+        fin, opcode = bool(header[0] & 0x80), header[0] & 0x0F
+        masked, length = bool(header[1] & 0x80), header[1] & 0x7F
+        if length == 126:
+            extended = self._read_exactly(2)
+            if extended is None:
+                return None
+            length = struct.unpack('!H', extended)[0]
+        elif length == 127:
+            extended = self._read_exactly(8)
+            if extended is None:
+                return None
+            length = struct.unpack('!Q', extended)[0]
+        mask = self._read_exactly(4) if masked else b'\x00\x00\x00\x00'
+        payload = self._read_exactly(length)
+        if mask is None or payload is None:
+            return None
+        if masked:
+            # XOR the payload with the repeated mask in one big-integer operation, which is far
+            # faster than a per-byte loop.
+            repeated = (mask * (length // 4 + 1))[:length]
+            payload = (int.from_bytes(payload, 'big') ^ int.from_bytes(repeated, 'big')
+                       ).to_bytes(length, 'big')
+        return fin, opcode, payload
+
+    def _write_frame(self, opcode: int, payload: bytes) -> None:
+        length = len(payload)
+        if length < 126:
+            header = struct.pack('!BB', 0x80 | opcode, length)
+        elif length < 2**16:
+            header = struct.pack('!BBH', 0x80 | opcode, 126, length)
+        else:
+            header = struct.pack('!BBQ', 0x80 | opcode, 127, length)
+        self.wfile.write(header + payload)
+        self.wfile.flush()
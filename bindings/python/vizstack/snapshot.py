@@ -0,0 +1,62 @@
+"""Structural snapshots of objects, for assembling them later on another thread.
+
+Assembly reads an object as it is when assembly runs, so an object which is assembled in the
+background may have changed since it was passed in. `snapshot()` copies the built-in containers
+and the mutable buffers, such as NumPy arrays, of an object, down to a given depth, so that later
+changes to them do not affect the `View`. Copying them is much cheaper than assembling them.
+"""
+from typing import Any, cast
+from array import array
+
+__all__ = ['snapshot']
+
+# Immutable values, which are shared rather than copied.
+_ATOMIC_TYPES = frozenset([str, int, float, bool, complex, bytes, frozenset, type(None)])
+
+
+def snapshot(obj: Any, depth: int = 3) -> Any:
+    """Returns a copy of `obj` in which `list`s, `tuple`s, `set`s and `dict`s, as well as
+    `bytearray`s, `array.array`s, `memoryview`s and NumPy arrays, are copied, down to `depth` levels
+    of nesting.
+
+    Other objects, and containers nested more deeply than `depth`, are shared with `obj`, so changes
+    to them, e.g. to the attributes of an instance, are still reflected in the `View`. Since
+    containers are copied as they are found, a container which appears more than once, or within
+    itself, is copied each time it is found, up to `depth`.
+
+    Args:
+        obj: The object to copy.
+        depth: The number of levels of nested containers to copy; 0 returns `obj` itself.
+    """
+    obj_type = type(obj)
+    if depth <= 0 or obj_type in _ATOMIC_TYPES:
+        return obj
+    depth -= 1
+    if obj_type is list:
+        return [snapshot(elem, depth) for elem in obj]
+    if obj_type is dict:
+        return {key: snapshot(value, depth) for key, value in obj.items()}
+    if obj_type is tuple:
+        return tuple(snapshot(elem, depth) for elem in obj)
+    if obj_type is set:
+        # Set elements are hashable, and so usually immutable
+        return set(obj)
+    if obj_type is bytearray:
+        return bytearray(obj)
+    if obj_type is array:
+        return obj[:]
+    if obj_type is memoryview:
+        return _copy_memoryview(obj)
+    if getattr(obj, '__array_interface__', None) is not None and hasattr(obj, 'copy'):
+        # A NumPy array, which is checked for without importing NumPy
+        return obj.copy()
+    return obj
+
+
+def _copy_memoryview(view: memoryview) -> memoryview:
+    copied = memoryview(view.tobytes())
+    try:
+        # Keep the format and shape, which `Buffer` shows
+        return cast(Any, copied).cast(view.format, list(view.shape or ()))
+    except (TypeError, ValueError):
+        return copied
@@ -0,0 +1,251 @@
+"""Assembly of `View`s which are too large to hold in memory.
+
+`assemble()` keeps every `Fragment` in memory until the `View` is returned. `assemble_spilled()`
+instead encodes each `Fragment` as JSON as soon as it is assembled, and once the encoded
+`Fragment`s exceed a memory limit, appends them to a file on disk, one per line. Only the
+`FragmentId`s and the offsets of the spilled `Fragment`s are kept in memory, besides the bookkeeping
+that any assembly needs. The result is a `SpilledView`, which reads `Fragment`s back on demand:
+
+    with assemble_spilled(heap, memory_limit=2**28) as view:
+        root = view['fragments'][view['rootId']]
+        with open('heap.json', 'w') as f:
+            view.write_json(f)
+
+Note that the assembly still references every object it visits until it is discarded, so that
+their ids are not reused while `FragmentId`s are assigned; see `Assembly`.
+"""
+from typing import IO, Any, Dict, Iterator, List, Mapping, Optional, Union, cast
+import json
+import os
+import tempfile
+import threading
+
+from vizstack.instrument import AssemblyHook
+from vizstack.schema import Fragment, FragmentId, View
+from vizstack.view_assembler import Assembly
+
+__all__ = ['assemble_spilled', 'SpilledView', 'SpillingAssembly']
+
+_DEFAULT_MEMORY_LIMIT = 2**26
+
+# A spilled `Fragment` is stored as the offset of its line in the spill file, an encoded but not yet
+# spilled `Fragment` as a `str`, a stub as a `Fragment`, and a pending object as `None`.
+_StoredFragment = Union[int, str, Fragment, None]
+
+
+class _SpillFile:
+    """An append-only file of JSON-encoded `Fragment`s, one per line."""
+
+    def __init__(self, path: Optional[str]) -> None:
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix='vizstack-', suffix='.jsonl')
+            self._file = os.fdopen(fd, 'a+b')
+            self._delete = True
+        else:
+            self._file = open(path, 'a+b')
+            self._delete = False
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, lines: List[str]) -> List[int]:
+        """Appends encoded `Fragment`s to the file and returns their offsets."""
+        offsets = []
+        with self._lock:
+            self._file.seek(0, os.SEEK_END)
+            offset = self._file.tell()
+            for line in lines:
+                data = line.encode()
+                offsets.append(offset)
+                self._file.write(data)
+                self._file.write(b'\n')
+                offset += len(data) + 1
+            self._file.flush()
+        return offsets
+
+    def read(self, offset: int) -> bytes:
+        """Returns the encoded `Fragment` at `offset`, without its line terminator."""
+        with self._lock:
+            self._file.seek(offset)
+            return self._file.readline()[:-1]
+
+    def close(self) -> None:
+        self._file.close()
+        if self._delete:
+            os.remove(self.path)
+
+
+class _SpillingFragments(dict):
+    """The `FragmentId` -> `Fragment` map of a `SpillingAssembly`, which encodes each `Fragment` as
+    it is stored and spills them to a `_SpillFile` once they exceed a memory limit."""
+
+    def __init__(self, spill_file: _SpillFile, memory_limit: int, *args: Any) -> None:
+        super(_SpillingFragments, self).__init__(*args)
+        self._spill_file = spill_file
+        self._memory_limit = memory_limit
+        self._encoded_ids: List[FragmentId] = []
+        self._encoded_bytes = 0
+        self._encode = json.JSONEncoder(separators=(',', ':')).encode
+
+    def __setitem__(self, frag_id: FragmentId, frag: _StoredFragment) -> None:
+        if frag is None:
+            super(_SpillingFragments, self).__setitem__(frag_id, frag)
+            return
+        encoded = self._encode(frag)
+        super(_SpillingFragments, self).__setitem__(frag_id, encoded)
+        self._encoded_ids.append(frag_id)
+        self._encoded_bytes += len(encoded)
+        if self._encoded_bytes > self._memory_limit:
+            self.spill()
+
+    def spill(self) -> None:
+        """Moves all encoded `Fragment`s from memory to the spill file."""
+        if not self._encoded_ids:
+            return
+        ids = self._encoded_ids
+        offsets = self._spill_file.append([dict.__getitem__(self, frag_id) for frag_id in ids])
+        for frag_id, offset in zip(ids, offsets):
+            super(_SpillingFragments, self).__setitem__(frag_id, offset)
+        self._encoded_ids = []
+        self._encoded_bytes = 0
+
+
+class _LazyFragments(Mapping):
+    """A read-only `FragmentId` -> `Fragment` map which decodes each `Fragment` when it is read."""
+
+    def __init__(self, stored: Dict[FragmentId, _StoredFragment], spill_file: _SpillFile) -> None:
+        self._stored = stored
+        self._spill_file = spill_file
+
+    def __getitem__(self, frag_id: FragmentId) -> Fragment:
+        return _decode(self.get_encoded(frag_id))
+
+    def get_encoded(self, frag_id: FragmentId) -> Union[str, bytes]:
+        """Returns the JSON encoding of the `Fragment` with `FragmentId` `frag_id`, without decoding
+        it first."""
+        stored = self._stored[frag_id]
+        if isinstance(stored, int):
+            return self._spill_file.read(stored)
+        elif isinstance(stored, str):
+            return stored
+        return json.dumps(stored)
+
+    def __iter__(self) -> Iterator[FragmentId]:
+        return iter(self._stored)
+
+    def __len__(self) -> int:
+        return len(self._stored)
+
+    def __contains__(self, frag_id: object) -> bool:
+        return frag_id in self._stored
+
+
+def _decode(encoded: Union[str, bytes]) -> Fragment:
+    return json.loads(encoded)
+
+
+class SpilledView(Mapping):
+    """A read-only `View` whose `Fragment`s are read from memory or disk when accessed.
+
+    It can be indexed like a `View` -- `view['rootId']`, `view['fragments'][frag_id]` -- but each
+    access to a `Fragment` decodes a new copy, so callers should keep `Fragment`s they reuse. Call
+    `close()`, or use the `SpilledView` as a context manager, to delete a temporary spill file.
+    """
+
+    def __init__(self, view: Dict[str, Any], spill_file: _SpillFile) -> None:
+        self._view = {**view, 'fragments': _LazyFragments(view['fragments'], spill_file)}
+        self._spill_file = spill_file
+
+    @property
+    def path(self) -> str:
+        """The path of the spill file, which may be empty if nothing was spilled."""
+        return self._spill_file.path
+
+    def __getitem__(self, key: str) -> Any:
+        return self._view[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._view)
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    def write_json(self, fp: IO[str]) -> None:
+        """Writes the `View` as JSON to a text file, without decoding the `Fragment`s or holding
+        more than one of them in memory at once."""
+        fragments = self._view['fragments']
+        fp.write('{')
+        for key, value in self._view.items():
+            if key != 'fragments':
+                fp.write('{}:{},'.format(json.dumps(key), json.dumps(value)))
+        fp.write('"fragments":{')
+        for i, frag_id in enumerate(fragments):
+            encoded = fragments.get_encoded(frag_id)
+            fp.write('{}{}:'.format(',' if i > 0 else '', json.dumps(frag_id)))
+            fp.write(encoded if isinstance(encoded, str) else encoded.decode())
+        fp.write('}}')
+
+    def to_view(self) -> View:
+        """Returns an ordinary in-memory `View` with all `Fragment`s decoded."""
+        view = dict(self._view)
+        view['fragments'] = dict(self._view['fragments'].items())
+        return view  # type: ignore
+
+    def close(self) -> None:
+        self._spill_file.close()
+
+    def __enter__(self) -> 'SpilledView':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+class SpillingAssembly(Assembly):
+    """An `Assembly` whose `Fragment`s are spilled to disk and whose `run()` returns `SpilledView`s.
+
+    The `SpilledView`s returned by successive `run()`s share the same spill file; it is deleted by
+    closing any of them.
+    """
+
+    def __init__(self, obj: Any, hooks: Optional[List[AssemblyHook]] = None,
+                 breadth_first: bool = True, memory_limit: int = _DEFAULT_MEMORY_LIMIT,
+                 path: Optional[str] = None) -> None:
+        """
+        Args:
+            obj: The object to be visualized.
+            hooks: Optional `AssemblyHook`s which observe the assembly of each `Fragment`.
+            breadth_first: See `Assembly`.
+            memory_limit: The number of bytes of encoded `Fragment`s to keep in memory before
+                spilling them to disk.
+            path: The path of the spill file. If `None`, a temporary file is used, which is deleted
+                when the `SpilledView` is closed; otherwise, the file is kept.
+        """
+        super(SpillingAssembly, self).__init__(obj, hooks=hooks, breadth_first=breadth_first)
+        self._spill_file = _SpillFile(path)
+        self._fragments = _SpillingFragments(self._spill_file, memory_limit, self._fragments)
+
+    def _make_view(self, fragments: Dict[FragmentId, Fragment]) -> SpilledView:  # type: ignore
+        view = super(SpillingAssembly, self)._make_view(fragments)
+        return SpilledView(cast(Dict[str, Any], view), self._spill_file)
+
+
+def assemble_spilled(obj: Any, memory_limit: int = _DEFAULT_MEMORY_LIMIT,
+                     path: Optional[str] = None, hooks: Optional[List[AssemblyHook]] = None,
+                     deadline: Optional[float] = None) -> SpilledView:
+    """Returns a `SpilledView` of `obj` and every object it references.
+
+    Args:
+        obj: The object to be visualized.
+        memory_limit: The number of bytes of encoded `Fragment`s to keep in memory before spilling
+            them to disk.
+        path: The path of the spill file; see `SpillingAssembly`.
+        hooks: Optional `AssemblyHook`s which observe the assembly of each `Fragment`.
+        deadline: An optional `time.monotonic()` value after which no more `Fragment`s are
+            assembled; see `assemble()`.
+
+    Returns:
+        A `SpilledView` whose root `Fragment` represents `obj`.
+    """
+    assembly = SpillingAssembly(obj, hooks=hooks, breadth_first=deadline is not None,
+                                memory_limit=memory_limit, path=path)
+    return assembly.run(deadline)  # type: ignore
@@ -0,0 +1,403 @@
+"""Plain-text rendering of `View`s, for terminals and logs where the browser frontend is not
+available.
+
+Example:
+    print(render_text(model, width=100, max_lines=40))
+    for line in iter_text_lines(view):
+        logger.info(line)
+
+Lines are produced as the `View` is walked, depth-first, so rendering stops as soon as `max_lines`
+lines have been produced, without visiting the rest of the `View`, so the cost of rendering a `View`
+depends on the size of the output rather than that of the `View`. When an object rather than a
+`View` is given, its `Fragment`s are assembled on demand as they are reached, so only the objects on
+the rendered part are assembled. The elements of `Sequence`s and `KeyValue`s, such as those of
+`list`s and `dict`s, are likewise visited only as they are rendered; each other container which
+is reached is assembled whole, since a `FragmentAssembler` produces every reference of its
+`Fragment` at once.
+
+Layouts are rendered as indented blocks, except that a layout whose elements are all short
+primitives is rendered on one line if it fits in the width. A `SwitchLayout` shows its first mode. A
+`DagLayout` is rendered as the tree of its nodes' nesting, followed by a list of its edges. Other
+primitives, such as images and tables, are summarized in a single line. Lines longer than the width
+are cut, except those of texts, which are wrapped.
+"""
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Union, cast
+from itertools import islice
+import copy
+
+from vizstack.fragment_assembler import Deferred
+from vizstack.schema import Fragment, FragmentId
+
+__all__ = ['render_text', 'iter_text_lines']
+
+# The indentation of each level of nesting.
+_INDENT = '  '
+# The minimum width in which a nested block is rendered, however deeply it is nested.
+_MIN_WIDTH = 16
+# The number of `Fragment`s of an object kept after being assembled, to be reused while rendering.
+_MAX_RECENT_FRAGMENTS = 256
+
+
+def render_text(view_or_obj: Any, width: int = 80, max_lines: Optional[int] = None) -> str:
+    """Returns a plain-text rendering of a `View`, or of the `View` of an object.
+
+    Args:
+        view_or_obj: A `View`, i.e. a `dict` with "rootId" and "fragments", or any other object,
+            which is assembled as it is rendered.
+        width: The maximum number of characters in each line.
+        max_lines: The maximum number of lines; if the rendering is longer, its last line is
+            replaced by "…".
+    """
+    lines = iter_text_lines(view_or_obj, width)
+    if max_lines is None:
+        return '\n'.join(lines)
+    rendered = list(islice(lines, max_lines + 1))
+    if len(rendered) > max_lines:
+        rendered = rendered[:max_lines - 1] + ['…'] if max_lines > 0 else []
+    return '\n'.join(rendered)
+
+
+def iter_text_lines(view_or_obj: Any, width: int = 80) -> Iterator[str]:
+    """Yields the lines of a plain-text rendering of a `View`, or of the `View` of an object, as
+    they are produced; see `render_text()`."""
+    if isinstance(view_or_obj, dict) and 'rootId' in view_or_obj and 'fragments' in view_or_obj:
+        fragments: Dict[FragmentId, Fragment] = view_or_obj['fragments']
+        root_id = view_or_obj['rootId']
+        get_fragment: Callable[[FragmentId], Fragment] = fragments.__getitem__
+    else:
+        root_id = FragmentId('0')
+        get_fragment = _ObjectFragments(view_or_obj).get
+    return _TextRenderer(get_fragment, width).render(root_id, '')
+
+
+class _ObjectFragments:
+    """Assembles the `Fragment`s of an object on demand, as `Assembly.assemble_fragment()` does, but
+    with `FragmentId`s which are simply counters: the rendering never shows them, so hashing them to
+    make them stable, which dominates the cost of assembling a large container, is not needed."""
+
+    def __init__(self, obj: Any) -> None:
+        # Imported here, so that importing this module does not import the assembly machinery
+        from vizstack.assemblers import KeyValue, Sequence
+        from vizstack.view_assembler import ViewAssembler
+        self._view_assembler = ViewAssembler
+        self._sequence_type = Sequence
+        self._key_value_type = KeyValue
+        self._assigned: Dict[int, FragmentId] = {id(obj): FragmentId('0')}
+        # Holds every object which was assigned a `FragmentId`, so that its `id()` is not reused
+        self._objects: List[Any] = [obj]
+        # The most recently assembled `Fragment`s: a layout's elements are assembled when trying to
+        # render it inline, and are needed again when it is rendered as a block instead
+        self._recent: Dict[FragmentId, Fragment] = {}
+
+    def _get_id(self, obj: Any, slot: str, inline: bool = False) -> FragmentId:
+        frag_id = self._assigned.get(id(obj))
+        if frag_id is None:
+            frag_id = self._assigned[id(obj)] = FragmentId(str(len(self._objects)))
+            self._objects.append(obj)
+        return frag_id
+
+    def get(self, frag_id: FragmentId) -> Fragment:
+        fragment = self._recent.get(frag_id)
+        if fragment is not None:
+            return fragment
+        obj = self._objects[int(frag_id)]
+        if isinstance(obj, Deferred):
+            obj.resolve()
+        assembler = self._view_assembler.get_fragment_assembler(obj)
+        lazy_fragment = self._assemble_lazily(assembler)
+        if lazy_fragment is not None:
+            fragment = lazy_fragment
+        else:
+            fragment, _ = assembler.assemble(self._get_id)
+        if len(self._recent) >= _MAX_RECENT_FRAGMENTS:
+            # Evict the oldest
+            del self._recent[next(iter(self._recent))]
+        self._recent[frag_id] = fragment = self._view_assembler._remove_null_contents(fragment)
+        return fragment
+
+    def _assemble_lazily(self, assembler: Any) -> Optional[Fragment]:
+        """Returns the `Fragment` of a `Sequence` or `KeyValue`, whose elements are assigned
+        `FragmentId`s only as they are rendered, or `None` for any other `FragmentAssembler`."""
+        assembler_type = type(assembler)
+        if assembler_type is self._sequence_type and assembler._stream is None:
+            elements = assembler._elements
+            empty = copy.copy(assembler)
+            empty._elements = []
+            fragment, _ = empty.assemble(self._get_id)
+            fragment['contents']['elements'] = cast(
+                Any, _LazyRefs(elements, lambda elem: self._get_id(elem, ''))
+            )
+            return fragment
+        if assembler_type is self._key_value_type:
+            entries = assembler._entries
+            empty = copy.copy(assembler)
+            empty._entries = []
+            fragment, _ = empty.assemble(self._get_id)
+            fragment['contents']['entries'] = cast(
+                Any,
+                _LazyRefs(
+                    entries, lambda entry: {
+                        'key': self._get_id(entry[0], ''),
+                        'value': self._get_id(entry[1], ''),
+                    }
+                )
+            )
+            return fragment
+        return None
+
+
+class _LazyRefs:
+    """The references to the elements of a layout, made from the elements as they are iterated."""
+
+    def __init__(self, items: List[Any], make_ref: Callable[[Any], Any]) -> None:
+        self._items = items
+        self._make_ref = make_ref
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Any]:
+        return map(self._make_ref, self._items)
+
+
+class _TextRenderer:
+
+    def __init__(self, get_fragment: Callable[[FragmentId], Fragment], width: int) -> None:
+        self._get_fragment = get_fragment
+        self._width = width
+        # The `FragmentId`s of the `Fragment`s being rendered, to cut cycles short
+        self._ancestors: Set[FragmentId] = set()
+
+    def _get(self, ref: Union[FragmentId, Fragment]) -> Fragment:
+        # Inlined `Fragment`s take the place of their `FragmentId`s
+        return ref if isinstance(ref, dict) else self._get_fragment(ref)  # type: ignore
+
+    def _fit(self, line: str) -> str:
+        return line if len(line) <= self._width else line[:self._width - 1] + '…'
+
+    def render(self, ref: Union[FragmentId, Fragment], indent: str) -> Iterator[str]:
+        """Yields the lines of the `Fragment` `ref`, each prefixed by `indent`."""
+        if isinstance(ref, str):
+            if ref in self._ancestors:
+                yield self._fit(indent + '(cycle)')
+                return
+            self._ancestors.add(ref)  # type: ignore
+        try:
+            fragment = self._get(ref)
+            line = self._inline(fragment, self._width - len(indent))
+            if line is not None:
+                yield indent + line
+            else:
+                yield from self._render_block(fragment, indent)
+        finally:
+            if isinstance(ref, str):
+                self._ancestors.discard(ref)  # type: ignore
+
+    def _inline(self, fragment: Fragment, width: int) -> Optional[str]:
+        """Returns `fragment` as a single line of at most `width` characters, or `None` if it does
+        not fit. The cost is bounded by `width`, however many elements a layout has."""
+        frag_type = fragment['type']
+        contents = fragment['contents']
+        if frag_type == 'TextPrimitive':
+            text = cast(str, contents['text'])
+            return text if len(text) <= width and '\n' not in text else None
+        if frag_type == 'TokenPrimitive':
+            text = '[{}]'.format(contents['text'])  # type: ignore
+            return text if len(text) <= width else None
+        if frag_type == 'IconPrimitive':
+            return ':{}:'.format(contents['name'])  # type: ignore
+        if frag_type == 'SequenceLayout' or frag_type == 'FlowLayout':
+            if frag_type == 'SequenceLayout':
+                start = cast(str, contents.get('startMotif', '['))
+                end = cast(str, contents.get('endMotif', ']'))
+                separator = ', '
+            else:
+                start, end, separator = '', '', ' '
+            elements = cast(List[Any], contents['elements'])
+            return self._inline_elements(elements, start, end, separator, width)
+        if frag_type == 'KeyValueLayout':
+            return self._inline_entries(contents, width)  # type: ignore
+        if frag_type in _LAYOUT_RENDERERS:
+            return None
+        return _summarize(fragment)
+
+    def _inline_elements(self, elements: Iterable[Any], start: str, end: str, separator: str,
+                         width: int) -> Optional[str]:
+        return _join_inline(elements, self._inline_ref, start, end, separator, width)
+
+    def _inline_ref(self, ref: Union[FragmentId, Fragment], width: int) -> Optional[str]:
+        """Returns the `Fragment` `ref` as a single line, as `_inline()` does, or `None` if it is
+        part of a cycle, which is then rendered as a block to show where it is cut."""
+        if not isinstance(ref, str):
+            return self._inline(ref, width)
+        if ref in self._ancestors:
+            return None
+        self._ancestors.add(ref)  # type: ignore
+        try:
+            return self._inline(self._get(ref), width)
+        finally:
+            self._ancestors.discard(ref)  # type: ignore
+
+    def _inline_entries(self, contents: Dict[str, Any], width: int) -> Optional[str]:
+        separator = contents.get('separator', ':')
+
+        def inline_entry(entry: Dict[str, Any], remaining: int) -> Optional[str]:
+            return self._inline_entry(entry, separator, remaining)
+
+        return _join_inline(contents['entries'], inline_entry, contents.get('startMotif', '{'),
+                            contents.get('endMotif', '}'), ', ', width)
+
+    def _inline_entry(self, entry: Dict[str, Any], separator: str, width: int) -> Optional[str]:
+        key = self._inline_ref(entry['key'], width)
+        if key is None:
+            return None
+        value = self._inline_ref(entry['value'], width - len(key) - len(separator) - 1)
+        return None if value is None else '{}{} {}'.format(key, separator, value)
+
+    def _render_block(self, fragment: Fragment, indent: str) -> Iterator[str]:
+        render_layout = _LAYOUT_RENDERERS.get(fragment['type'])
+        if render_layout is not None:
+            yield from render_layout(self, fragment['contents'], indent)
+        elif fragment['type'] == 'TextPrimitive' or fragment['type'] == 'TokenPrimitive':
+            text = cast(str, fragment['contents']['text'])
+            for line in _wrap(text, max(self._width - len(indent), _MIN_WIDTH)):
+                yield indent + line
+        else:
+            yield self._fit(indent + (_summarize(fragment) or ''))
+
+    def _render_sequence(self, contents: Dict[str, Any], indent: str) -> Iterator[str]:
+        yield self._fit(indent + contents.get('startMotif', '['))
+        for elem in contents['elements']:
+            yield from self.render(elem, indent + _INDENT)
+        yield self._fit(indent + contents.get('endMotif', ']'))
+
+    def _render_flow(self, contents: Dict[str, Any], indent: str) -> Iterator[str]:
+        for elem in contents['elements']:
+            yield from self.render(elem, indent)
+
+    def _render_key_value(self, contents: Dict[str, Any], indent: str) -> Iterator[str]:
+        separator = contents.get('separator', ':')
+        if 'startMotif' in contents:
+            yield self._fit(indent + contents['startMotif'])
+        entry_indent = indent + _INDENT if 'startMotif' in contents else indent
+        width = self._width - len(entry_indent)
+        for entry in contents['entries']:
+            line = self._inline_entry(entry, separator, width)
+            if line is not None:
+                yield entry_indent + line
+                continue
+            key = self._inline_ref(entry['key'], width - len(separator))
+            if key is not None:
+                yield entry_indent + key + separator
+            else:
+                yield from self.render(entry['key'], entry_indent)
+                yield self._fit(entry_indent + separator)
+            yield from self.render(entry['value'], entry_indent + _INDENT)
+        if 'endMotif' in contents:
+            yield self._fit(indent + contents['endMotif'])
+
+    def _render_grid(self, contents: Dict[str, Any], indent: str) -> Iterator[str]:
+        rows: Dict[int, List[Dict[str, Any]]] = {}
+        for cell in contents['cells']:
+            rows.setdefault(cell['row'], []).append(cell)
+        for row in sorted(rows):
+            cells = sorted(rows[row], key=lambda cell: cell['col'])
+            refs = [
+                cell['fragmentId'] if 'fragmentId' in cell else cell['fragment'] for cell in cells
+            ]
+            line = self._inline_elements(refs, '', '', ' | ', self._width - len(indent))
+            if line is not None:
+                yield indent + line
+                continue
+            for ref in refs:
+                yield from self.render(ref, indent)
+
+    def _render_switch(self, contents: Dict[str, Any], indent: str) -> Iterator[str]:
+        modes = contents['modes']
+        if len(modes) > 1:
+            yield self._fit(indent + '(mode 1 of {})'.format(len(modes)))
+        if modes:
+            yield from self.render(modes[0], indent)
+
+    def _render_dag(self, contents: Dict[str, Any], indent: str) -> Iterator[str]:
+        nodes = contents['nodes']
+        nested = {child_id for node in nodes.values() for child_id in node.get('children', ())}
+        stack = [(node_id, indent) for node_id in reversed(list(nodes)) if node_id not in nested]
+        while stack:
+            node_id, node_indent = stack.pop()
+            node = nodes[node_id]
+            ref = node['fragmentId'] if 'fragmentId' in node else node['fragment']
+            yield self._fit('{}({})'.format(node_indent, node_id))
+            yield from self.render(ref, node_indent + _INDENT)
+            children = reversed(node.get('children', []))
+            stack.extend((child_id, node_indent + _INDENT) for child_id in children)
+        for edge in contents['edges'].values():
+            label = ' {}'.format(edge['label']) if edge.get('label') else ''
+            source, target = edge['source']['id'], edge['target']['id']
+            yield self._fit('{}{} -> {}{}'.format(indent, source, target, label))
+
+
+_LAYOUT_RENDERERS: Dict[str, Callable[[_TextRenderer, Dict[str, Any], str], Iterator[str]]] = {
+    'SequenceLayout': _TextRenderer._render_sequence,
+    'FlowLayout': _TextRenderer._render_flow,
+    'KeyValueLayout': _TextRenderer._render_key_value,
+    'GridLayout': _TextRenderer._render_grid,
+    'SwitchLayout': _TextRenderer._render_switch,
+    'DagLayout': _TextRenderer._render_dag,
+}
+
+
+def _join_inline(items: Iterable[Any], inline_item: Callable[[Any, int], Optional[str]], start: str,
+                 end: str, separator: str, width: int) -> Optional[str]:
+    """Returns `items` on one line of at most `width` characters, or `None` if any item cannot be
+    inlined or the line does not fit. Each item takes at least one character, so at most `width`
+    items are visited, however many there are."""
+    parts = [start]
+    remaining = width - len(start) - len(end)
+    for i, item in enumerate(items):
+        if i > 0:
+            parts.append(separator)
+            remaining -= len(separator)
+        if remaining <= 0:
+            return None
+        text = inline_item(item, remaining)
+        if text is None or len(text) > remaining:
+            return None
+        parts.append(text)
+        remaining -= len(text)
+    parts.append(end)
+    return ''.join(parts)
+
+
+def _summarize(fragment: Fragment) -> Optional[str]:
+    """Returns a one-line summary of a primitive which cannot be rendered as text, or `None` for a
+    text which must be wrapped."""
+    frag_type = fragment['type']
+    contents = fragment['contents']
+    if frag_type == 'TextPrimitive' or frag_type == 'TokenPrimitive':
+        return None
+    if frag_type == 'ImagePrimitive':
+        return '<image>'
+    if frag_type == 'TablePrimitive':
+        return '<table of {} rows>'.format(contents.get('numRows', '?'))  # type: ignore
+    if frag_type == 'BufferPrimitive':
+        return '<buffer of {} bytes>'.format(contents.get('length', '?'))  # type: ignore
+    if frag_type == 'SeriesPrimitive':
+        return '<series>'
+    return '<{}>'.format(frag_type)
+
+
+def _wrap(text: str, width: int) -> Iterator[str]:
+    """Yields the lines of `text`, each split into pieces of at most `width` characters, without
+    splitting the whole text up front."""
+    start = 0
+    while True:
+        end = text.find('\n', start)
+        line = text[start:] if end < 0 else text[start:end]
+        if not line:
+            yield ''
+        for i in range(0, len(line), width):
+            yield line[i:i + width]
+        if end < 0:
+            return
+        start = end + 1
@@ -0,0 +1,368 @@
+"""Transport of assembled `View`s from worker processes to a collector through shared memory.
+
+Sending `View`s through a `multiprocessing.Queue` pickles them, copies them through a pipe, and
+unpickles them in the receiver. Here, each worker instead owns a single-producer, single-consumer
+ring buffer in `multiprocessing.shared_memory`. The worker writes each `View` into its buffer with
+`marshal`, a compact binary encoding of plain Python values, and the collector decodes it straight
+out of shared memory, without first copying it into a `bytes` object.
+
+Each side waits for the other, for a `View` or for space, by blocking on a named pipe beside the
+ring buffer, into which the other side writes a byte whenever it publishes or consumes a record.
+
+Since `marshal`'s format is specific to the Python version, both sides must run the same
+interpreter, which is always the case for `multiprocessing` workers. Requires Python 3.8+ on a POSIX
+system.
+
+Example:
+    def worker(ring_name):
+        publisher = ViewPublisher(ring_name)
+        for batch in loader:
+            publisher.publish(batch)
+        publisher.close()
+
+    with ViewCollector(num_workers=32) as collector:
+        for name in collector.ring_names:
+            multiprocessing.Process(target=worker, args=(name,)).start()
+        for worker_index, view in collector.iter_views(timeout=1.0):
+            ...
+"""
+from typing import Any, Dict, Iterator, List, Optional, Tuple, cast
+from multiprocessing.shared_memory import SharedMemory
+import marshal
+import os
+import select
+import struct
+import tempfile
+import time
+
+from vizstack.schema import View
+from vizstack.traversal import prefix_ids
+from vizstack.view_assembler import ViewAssembler
+
+__all__ = ['RingBuffer', 'ViewPublisher', 'ViewCollector']
+
+# The header holds, as little-endian unsigned 64-bit integers: the total number of bytes ever
+# written ("head"), the total number of bytes ever consumed ("tail"), and the data capacity. Each
+# counter is only ever written by one side, so no locking is needed.
+_HEADER = struct.Struct('<QQQ')
+_HEAD_OFFSET = 0
+_TAIL_OFFSET = 8
+_DATA_OFFSET = 64
+# Each record is a 32-bit length followed by the payload, padded so records stay 8-byte aligned.
+_LENGTH = struct.Struct('<I')
+_COUNTER = struct.Struct('<Q')
+# A length value marking that the rest of the data region is unused and the next record starts at
+# the beginning of the data region.
+_WRAP = 0xFFFFFFFF
+
+_MARSHAL_VERSION = 4
+
+
+
+def _padded(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def _attach(name: str) -> SharedMemory:
+    try:
+        # Python 3.13+: the creating process alone is responsible for unlinking the memory.
+        return SharedMemory(name=name, track=False)  # type: ignore
+    except TypeError:
+        # Processes started by `multiprocessing` share their parent's resource tracker, so the
+        # duplicate registration made here is harmless.
+        return SharedMemory(name=name)
+
+
+def _pipe_path(name: str, kind: str) -> str:
+    return os.path.join(tempfile.gettempdir(), '{}.{}'.format(name.lstrip('/'), kind))
+
+
+def _open_pipe(path: str) -> int:
+    # Opening for reading and writing never blocks, and the pipe stays open while either side lives
+    return os.open(path, os.O_RDWR | os.O_NONBLOCK)
+
+
+def _notify(fd: int) -> None:
+    try:
+        os.write(fd, b'\0')
+    except BlockingIOError:
+        # The pipe is full, so the other side has wakeups pending anyway
+        pass
+
+
+def _wait(fds: List[int], timeout: Optional[float]) -> None:
+    """Blocks until one of the pipes `fds` has been written to, or for at most `timeout` seconds,
+    then empties the pipes which were written to."""
+    readable = select.select(fds, [], [], timeout)[0]
+    for fd in readable:
+        try:
+            while os.read(fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+
+class RingBuffer:
+    """A single-producer, single-consumer queue of byte records in shared memory."""
+
+    def __init__(self, name: Optional[str] = None, capacity: int = 2**22) -> None:
+        """
+        Args:
+            name: The name of an existing ring buffer to attach to. If `None`, a new one is
+                created, and its name is available as `name`.
+            capacity: The number of bytes of record data a new ring buffer holds; records may be at
+                most half this size. Ignored when attaching.
+        """
+        if name is None:
+            capacity = _padded(capacity)
+            self._shm = SharedMemory(create=True, size=_DATA_OFFSET + capacity)
+            self._owner = True
+        else:
+            self._shm = _attach(name)
+            self._owner = False
+        # The producer wakes the consumer through the first pipe, and the consumer the producer
+        # through the second.
+        self._pipe_paths = [_pipe_path(self._shm.name, kind) for kind in ('data', 'space')]
+        if self._owner:
+            for path in self._pipe_paths:
+                os.mkfifo(path, 0o600)
+        self._data_fd, self._space_fd = [_open_pipe(path) for path in self._pipe_paths]
+        buf = self._shm.buf
+        if buf is None:
+            raise ValueError('Shared memory "{}" is closed.'.format(self._shm.name))
+        self._buf: memoryview = buf
+        if self._owner:
+            _HEADER.pack_into(buf, 0, 0, 0, capacity)
+        self.capacity: int = _HEADER.unpack_from(self._buf, 0)[2]
+        self._data = self._buf[_DATA_OFFSET:_DATA_OFFSET + self.capacity]
+        # The size of the record most recently returned by `peek()`, to be consumed by `release()`.
+        self._peeked = 0
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def write(self, payload: bytes, timeout: Optional[float] = None) -> bool:
+        """Appends a record to the ring buffer, waiting for the consumer to make space if needed.
+
+        Args:
+            payload: The bytes of the record.
+            timeout: The maximum number of seconds to wait for space; `None` waits indefinitely,
+                and 0 does not wait at all.
+
+        Returns:
+            Whether the record was written; `False` if the buffer stayed full until `timeout`.
+        """
+        size = _padded(_LENGTH.size + len(payload))
+        # A record never straddles the end of the data region; the remainder is skipped instead. A
+        # record of up to half the capacity is thus guaranteed to fit once the buffer is drained.
+        if size > self.capacity // 2:
+            raise ValueError(
+                'Record of {} bytes is too large for a ring buffer of {} bytes.'.format(
+                    len(payload), self.capacity
+                )
+            )
+        buf = self._buf
+        head = _COUNTER.unpack_from(buf, _HEAD_OFFSET)[0]
+        position = head % self.capacity
+        remaining = self.capacity - position
+        needed = size if size <= remaining else remaining + size
+
+        deadline = None
+        while self.capacity - (head - _COUNTER.unpack_from(buf, _TAIL_OFFSET)[0]) < needed:
+            remaining_time = None
+            if timeout is not None:
+                if deadline is None:
+                    deadline = time.monotonic() + timeout
+                remaining_time = deadline - time.monotonic()
+                if remaining_time <= 0:
+                    return False
+            _wait([self._space_fd], remaining_time)
+
+        data = self._data
+        if size > remaining:
+            _LENGTH.pack_into(data, position, _WRAP)
+            head += remaining
+            position = 0
+        _LENGTH.pack_into(data, position, len(payload))
+        start = position + _LENGTH.size
+        data[start:start + len(payload)] = payload
+        # Publish the record only once it is completely written.
+        _COUNTER.pack_into(buf, _HEAD_OFFSET, head + size)
+        _notify(self._data_fd)
+        return True
+
+    def peek(self) -> Optional[memoryview]:
+        """Returns a view of the oldest unconsumed record in shared memory, or `None` if there is
+        none. The view is only valid until `release()` is called."""
+        buf = self._buf
+        tail = _COUNTER.unpack_from(buf, _TAIL_OFFSET)[0]
+        if tail == _COUNTER.unpack_from(buf, _HEAD_OFFSET)[0]:
+            return None
+        position = tail % self.capacity
+        length = _LENGTH.unpack_from(self._data, position)[0]
+        if length == _WRAP:
+            tail += self.capacity - position
+            _COUNTER.pack_into(buf, _TAIL_OFFSET, tail)
+            position = 0
+            length = _LENGTH.unpack_from(self._data, position)[0]
+        self._peeked = _padded(_LENGTH.size + length)
+        start = position + _LENGTH.size
+        return self._data[start:start + length]
+
+    def release(self) -> None:
+        """Consumes the record returned by the last `peek()`, making its space available."""
+        tail = _COUNTER.unpack_from(self._buf, _TAIL_OFFSET)[0]
+        _COUNTER.pack_into(self._buf, _TAIL_OFFSET, tail + self._peeked)
+        self._peeked = 0
+        _notify(self._space_fd)
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Blocks until a record may have been written since the last `wait()`, or for at most
+        `timeout` seconds."""
+        _wait([self._data_fd], timeout)
+
+    def close(self) -> None:
+        """Detaches from the shared memory, and destroys it if this process created it."""
+        self._data.release()
+        self._buf = None  # type: ignore
+        self._shm.close()
+        os.close(self._data_fd)
+        os.close(self._space_fd)
+        if self._owner:
+            self._shm.unlink()
+            for path in self._pipe_paths:
+                os.unlink(path)
+
+
+class ViewPublisher:
+    """The worker side of the transport, which writes `View`s into one `RingBuffer`."""
+
+    def __init__(self, ring_name: str, block: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Args:
+            ring_name: The name of a `RingBuffer`, from `ViewCollector.ring_names`.
+            block: Whether to wait for space when the ring buffer is full. If `False`, `View`s
+                which do not fit are dropped.
+            timeout: If blocking, the maximum number of seconds to wait before dropping a `View`.
+        """
+        self._ring = RingBuffer(ring_name)
+        self._timeout = timeout if block else 0
+        self.published = 0
+        self.dropped = 0
+
+    def publish(self, obj: Any) -> bool:
+        """Assembles `obj` and publishes its `View`; see `publish_view()`."""
+        return self.publish_view(ViewAssembler.assemble(obj))
+
+    def publish_view(self, view: View) -> bool:
+        """Publishes an assembled `View`.
+
+        Returns:
+            Whether the `View` was written; `False` if it was dropped because the buffer was full.
+        """
+        payload = marshal.dumps(cast(Dict[str, Any], view), _MARSHAL_VERSION)
+        if self._ring.write(payload, timeout=self._timeout):
+            self.published += 1
+            return True
+        self.dropped += 1
+        return False
+
+    def close(self) -> None:
+        self._ring.close()
+
+
+class ViewCollector:
+    """The collector side of the transport, which owns one `RingBuffer` per worker."""
+
+    def __init__(self, num_workers: int, capacity: int = 2**22, remap_ids: bool = True) -> None:
+        """
+        Args:
+            num_workers: The number of ring buffers to create; pass one name from `ring_names` to
+                each worker.
+            capacity: The size in bytes of each ring buffer; encoded `View`s may be at most half
+                this size.
+            remap_ids: Whether to make `FragmentId`s unique across all collected `View`s. Every
+                `View` has the same root `FragmentId`, and `View`s of similar objects share most
+                `FragmentId`s, so they collide when `View`s are merged. If `True`, each
+                `FragmentId` is prefixed with "<worker>.<sequence>:", where <sequence> counts the
+                `View`s received from that worker.
+        """
+        self._rings = [RingBuffer(capacity=capacity) for _ in range(num_workers)]
+        self._sequences = [0] * num_workers
+        self._remap_ids = remap_ids
+        self._next = 0
+
+    @property
+    def ring_names(self) -> List[str]:
+        return [ring.name for ring in self._rings]
+
+    def poll(self, max_views: Optional[int] = None) -> List[Tuple[int, View]]:
+        """Returns the `View`s which are ready, without waiting.
+
+        Workers are visited round-robin, taking at most one `View` from each per round, so that a
+        busy worker cannot starve the others.
+
+        Args:
+            max_views: The maximum number of `View`s to return; `None` for no limit.
+
+        Returns:
+            A `list` of (worker index, `View`) pairs.
+        """
+        views: List[Tuple[int, View]] = []
+        num_rings = len(self._rings)
+        idle = 0
+        while idle < num_rings and (max_views is None or len(views) < max_views):
+            index = self._next
+            self._next = (self._next + 1) % num_rings
+            ring = self._rings[index]
+            record = ring.peek()
+            if record is None:
+                idle += 1
+                continue
+            idle = 0
+            try:
+                view = marshal.loads(record)
+            finally:
+                record.release()
+                ring.release()
+            views.append((index, self._remap(index, view)))
+        return views
+
+    def iter_views(self, timeout: Optional[float] = None) -> Iterator[Tuple[int, View]]:
+        """Yields (worker index, `View`) pairs as they arrive, until none arrives for `timeout`
+        seconds (or forever, if `timeout` is `None`)."""
+        fds = [ring._data_fd for ring in self._rings]
+        last = time.monotonic()
+        while True:
+            # One round at a time, so that a backlog of decoded `View`s does not pile up in memory,
+            # where each would be traversed by every garbage collection until it is yielded
+            views = self.poll(max_views=len(fds))
+            if views:
+                yield from views
+                last = time.monotonic()
+                continue
+            remaining = None
+            if timeout is not None:
+                remaining = timeout - (time.monotonic() - last)
+                if remaining <= 0:
+                    return
+            _wait(fds, remaining)
+
+    def _remap(self, index: int, view: View) -> View:
+        if not self._remap_ids:
+            return view
+        prefix = '{}.{}:'.format(index, self._sequences[index])
+        self._sequences[index] += 1
+        return prefix_ids(view, prefix)
+
+    def close(self) -> None:
+        """Destroys all ring buffers. Workers should have closed their side first."""
+        for ring in self._rings:
+            ring.close()
+
+    def __enter__(self) -> 'ViewCollector':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
@@ -0,0 +1,193 @@
+"""Helpers for following the `FragmentId` references inside `Fragment` contents.
+
+Each layout type stores references to its children in its own fields:
+    SequenceLayout, FlowLayout: contents.elements[]
+    SwitchLayout:               contents.modes[]
+    KeyValueLayout:             contents.entries[].key, contents.entries[].value
+    GridLayout:                 contents.cells[].fragmentId
+    DagLayout:                  contents.nodes{}.fragmentId
+
+Primitives reference no other `Fragment`s.
+
+In a `View` assembled with `inline_primitives`, some children are embedded instead of referenced:
+the `Fragment` itself takes the place of the `FragmentId` in Sequence, Flow and KeyValue contents,
+and is held under "fragment" instead of "fragmentId" in Grid cells and Dag nodes. The helpers here
+only visit references; see `expand_inline_fragments()`.
+"""
+from typing import Any, Callable, Dict, Iterator, List, Union, cast
+from vizstack.schema import Fragment, FragmentId, View
+
+__all__ = [
+    'iter_child_ids', 'get_child_ids', 'map_child_ids', 'prefix_ids', 'expand_inline_fragments',
+    'LAYOUT_TYPES'
+]
+
+LAYOUT_TYPES = frozenset([
+    'SequenceLayout', 'FlowLayout', 'SwitchLayout', 'KeyValueLayout', 'GridLayout', 'DagLayout'
+])
+
+
+def iter_child_ids(fragment: Fragment) -> Iterator[FragmentId]:
+    """Yields the `FragmentId` of every `Fragment` referenced by `fragment`, in order of appearance.
+
+    A `FragmentId` is yielded once per reference, so duplicates are possible. Inlined `Fragment`s
+    are skipped.
+    """
+    frag_type = fragment['type']
+    contents = cast(Dict[str, Any], fragment['contents'])
+    if frag_type == 'SequenceLayout' or frag_type == 'FlowLayout':
+        for elem in contents['elements']:
+            if isinstance(elem, str):
+                yield elem  # type: ignore
+    elif frag_type == 'KeyValueLayout':
+        for entry in contents['entries']:
+            if isinstance(entry['key'], str):
+                yield entry['key']  # type: ignore
+            if isinstance(entry['value'], str):
+                yield entry['value']  # type: ignore
+    elif frag_type == 'SwitchLayout':
+        yield from contents['modes']
+    elif frag_type == 'GridLayout':
+        for cell in contents['cells']:
+            if 'fragmentId' in cell:
+                yield cell['fragmentId']
+    elif frag_type == 'DagLayout':
+        for node in contents['nodes'].values():
+            if 'fragmentId' in node:
+                yield node['fragmentId']
+
+
+def get_child_ids(fragment: Fragment) -> List[FragmentId]:
+    """Returns a `list` of the `FragmentId`s referenced by `fragment`; see `iter_child_ids()`."""
+    return list(iter_child_ids(fragment))
+
+
+def _map_inline(slot: Union[FragmentId, Fragment],
+                fn: Callable[[FragmentId], Any]) -> Union[FragmentId, Fragment]:
+    return fn(slot) if isinstance(slot, str) else slot  # type: ignore
+
+
+def map_child_ids(fragment: Fragment, fn: Callable[[FragmentId], Any]) -> Fragment:
+    """Returns a copy of `fragment` in which every referenced `FragmentId` is replaced by `fn(id)`.
+
+    Only the parts of the `Fragment` which hold references are copied; everything else, including
+    inlined `Fragment`s, is shared with `fragment`.
+    """
+    frag_type = fragment['type']
+    contents = cast(Dict[str, Any], fragment['contents'])
+    if frag_type == 'SequenceLayout' or frag_type == 'FlowLayout':
+        contents = {**contents, 'elements': [_map_inline(i, fn) for i in contents['elements']]}
+    elif frag_type == 'KeyValueLayout':
+        contents = {
+            **contents,
+            'entries': [{
+                **entry, 'key': _map_inline(entry['key'], fn),
+                'value': _map_inline(entry['value'], fn)
+            } for entry in contents['entries']],
+        }
+    elif frag_type == 'SwitchLayout':
+        contents = {**contents, 'modes': [fn(i) for i in contents['modes']]}
+    elif frag_type == 'GridLayout':
+        contents = {
+            **contents,
+            'cells': [
+                {**cell, 'fragmentId': fn(cell['fragmentId'])} if 'fragmentId' in cell else cell
+                for cell in contents['cells']
+            ],
+        }
+    elif frag_type == 'DagLayout':
+        contents = {
+            **contents,
+            'nodes': {
+                node_id: {**node, 'fragmentId': fn(node['fragmentId'])}
+                         if 'fragmentId' in node else node
+                for node_id, node in contents['nodes'].items()
+            },
+        }
+    else:
+        return fragment
+    return {**fragment, 'contents': contents}  # type: ignore
+
+
+def prefix_ids(view: View, prefix: str) -> View:
+    """Returns a copy of `view` in which every `FragmentId` is prefixed with `prefix`, so that it
+    can be merged with other `View`s without their `FragmentId`s colliding."""
+
+    def remap(frag_id: FragmentId) -> FragmentId:
+        return FragmentId(prefix + frag_id)
+
+    remapped: View = {
+        'rootId': remap(view['rootId']),
+        'fragments': {
+            remap(frag_id): map_child_ids(fragment, remap)
+            for frag_id, fragment in view['fragments'].items()
+        },
+    }
+    if 'rootIds' in view:
+        remapped['rootIds'] = {  # type: ignore
+            name: remap(frag_id) for name, frag_id in view['rootIds'].items()  # type: ignore
+        }
+    return remapped
+
+
+def expand_inline_fragments(view: View) -> View:
+    """Returns a copy of `view` in which every inlined `Fragment` is moved into "fragments" and
+    referenced by a new `FragmentId`, for consumers which do not support inlined `Fragment`s.
+
+    The new `FragmentId`s are of the form "<parent FragmentId>~<n>", which cannot collide with the
+    `FragmentId`s created by `assemble()`. `View`s without inlined `Fragment`s are returned
+    unchanged.
+    """
+    fragments: Dict[FragmentId, Fragment] = {}
+    expanded = False
+    for frag_id, fragment in view['fragments'].items():
+        inlined: List[Fragment] = []
+
+        def extract(slot: Union[FragmentId, Fragment]) -> FragmentId:
+            if isinstance(slot, str):
+                return slot  # type: ignore
+            new_id = FragmentId('{}~{}'.format(frag_id, len(inlined)))
+            inlined.append(slot)
+            fragments[new_id] = slot
+            return new_id
+
+        frag_type = fragment['type']
+        contents = cast(Dict[str, Any], fragment['contents'])
+        if frag_type == 'SequenceLayout' or frag_type == 'FlowLayout':
+            contents = {**contents, 'elements': [extract(i) for i in contents['elements']]}
+        elif frag_type == 'KeyValueLayout':
+            contents = {
+                **contents,
+                'entries': [{
+                    **entry, 'key': extract(entry['key']),
+                    'value': extract(entry['value'])
+                } for entry in contents['entries']],
+            }
+        elif frag_type == 'GridLayout':
+            contents = {
+                **contents,
+                'cells': [_expand_slot(cell, extract) for cell in contents['cells']],
+            }
+        elif frag_type == 'DagLayout':
+            contents = {
+                **contents,
+                'nodes': {node_id: _expand_slot(node, extract)
+                          for node_id, node in contents['nodes'].items()},
+            }
+        if inlined:
+            expanded = True
+            fragments[frag_id] = {**fragment, 'contents': contents}  # type: ignore
+        else:
+            fragments[frag_id] = fragment
+    if not expanded:
+        return view
+    return {**view, 'fragments': fragments}  # type: ignore
+
+
+def _expand_slot(holder: Dict[str, Any],
+                 extract: Callable[[Fragment], FragmentId]) -> Dict[str, Any]:
+    if 'fragment' not in holder:
+        return holder
+    expanded = {key: value for key, value in holder.items() if key != 'fragment'}
+    expanded['fragmentId'] = extract(holder['fragment'])
+    return expanded
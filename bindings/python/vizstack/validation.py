@@ -0,0 +1,312 @@
+"""Checks of the integrity of assembled `View`s, including those received or merged from elsewhere.
+
+`validate()` checks, in a single pass over the `Fragment`s:
+    - that every `Fragment` has a known type and contents of the right shape for it;
+    - that every referenced `FragmentId` (and every root) names a `Fragment` of the `View`;
+    - that every `Fragment` is reachable from a root;
+    - that node, edge and port identifiers within each `DagLayout` are consistent: every child,
+      edge endpoint and port exists, and no node has two parents or is listed twice as a child.
+
+Strict validation checks every `Fragment` and is meant for tests. Sampled validation checks a fixed
+number of random `Fragment`s and skips the reachability check, so its cost does not grow with the
+size of the `View` beyond listing its `FragmentId`s; it is cheap enough to leave on in production.
+Pass a `seed` to make the sample reproducible.
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+import random
+
+from vizstack.schema import Fragment, FragmentId, View
+from vizstack.traversal import iter_child_ids
+
+__all__ = ['validate']
+
+# The maximum number of problems listed in the message of the `ValueError` raised by `validate()`.
+_MAX_REPORTED_PROBLEMS = 20
+
+
+def validate(view: View, sample_size: Optional[int] = None, strict: bool = True,
+             seed: Optional[int] = None) -> List[str]:
+    """Checks that `view` is a well-formed `View`.
+
+    Args:
+        view: The `View` to check.
+        sample_size: If given, only this many `Fragment`s, chosen at random, are checked, and
+            reachability from the roots is not checked.
+        strict: Whether to raise an error if any problems are found, rather than return them.
+        seed: If given, the seed of the random choice of `Fragment`s to check, so that the same ones
+            are chosen every time; otherwise, they are chosen with the global `random` state.
+
+    Returns:
+        A `list` of descriptions of the problems found, which is empty if `view` is valid.
+
+    Raises:
+        ValueError: If `strict` is `True` and any problems are found.
+    """
+    problems: List[str] = []
+    fragments = view.get('fragments')
+    if not isinstance(fragments, dict):
+        problems.append('The View has no "fragments" mapping.')
+        fragments = {}
+
+    roots: List[FragmentId] = [view.get('rootId')]  # type: ignore
+    root_ids = view.get('rootIds')
+    if root_ids is not None:
+        roots.extend(root_ids.values())  # type: ignore
+    for root_id in roots:
+        if root_id not in fragments:
+            problems.append('Root "{}" is not a Fragment of the View.'.format(root_id))
+
+    checked: Iterable[FragmentId]
+    if sample_size is None:
+        checked = fragments
+    else:
+        frag_ids = list(fragments)
+        rng = random.Random(seed) if seed is not None else random
+        checked = rng.sample(frag_ids, min(sample_size, len(frag_ids)))
+
+    for frag_id in checked:
+        fragment = fragments[frag_id]
+
+        def report(problem: str) -> None:
+            problems.append('Fragment "{}": {}'.format(frag_id, problem))
+
+        if _check_fragment(fragment, report):
+            for child_id in iter_child_ids(fragment):
+                if child_id not in fragments:
+                    report('references "{}", which is not a Fragment of the View.'.format(child_id))
+
+    if sample_size is None and not problems:
+        # Only a `View` whose references are all valid can be traversed
+        reachable = _get_reachable(fragments, roots)
+        if len(reachable) < len(fragments):
+            for frag_id in fragments:
+                if frag_id not in reachable:
+                    problems.append('Fragment "{}" is not reachable from any root.'.format(frag_id))
+
+    if strict and problems:
+        message = '\n'.join(' - {}'.format(p) for p in problems[:_MAX_REPORTED_PROBLEMS])
+        if len(problems) > _MAX_REPORTED_PROBLEMS:
+            message += '\n ... and {} more'.format(len(problems) - _MAX_REPORTED_PROBLEMS)
+        raise ValueError('Invalid View:\n{}'.format(message))
+    return problems
+
+
+def _get_reachable(fragments: Dict[FragmentId, Fragment],
+                   roots: List[FragmentId]) -> Set[FragmentId]:
+    reachable: Set[FragmentId] = set()
+    stack = [root_id for root_id in roots if root_id in fragments]
+    while stack:
+        frag_id = stack.pop()
+        if frag_id in reachable:
+            continue
+        reachable.add(frag_id)
+        stack.extend(iter_child_ids(fragments[frag_id]))
+    return reachable
+
+
+def _check_fragment(fragment: Any, report: Callable[[str], None]) -> bool:
+    """Reports any problems with the shape of `fragment`, and returns whether its references can be
+    followed."""
+    if not isinstance(fragment, dict) or not isinstance(fragment.get('contents'), dict):
+        report('is not a dict with "type" and "contents".')
+        return False
+    check = _CHECKS.get(fragment.get('type'))  # type: ignore
+    if check is None:
+        report('has unknown type "{}".'.format(fragment.get('type')))
+        return False
+    if not isinstance(fragment.get('meta', {}), dict):
+        report('has "meta" which is not a dict.')
+    return check(fragment['contents'], report)
+
+
+def _check_fields(*fields: str,
+                  types: Any = str) -> Callable[[Dict[str, Any], Callable[[str], None]], bool]:
+    def check(contents: Dict[str, Any], report: Callable[[str], None]) -> bool:
+        for field in fields:
+            if not isinstance(contents.get(field), types):
+                report('has invalid "{}".'.format(field))
+        return True
+
+    return check
+
+
+def _check_ref(ref: Any, report: Callable[[str], None], where: str) -> bool:
+    """Checks a reference which may be a `FragmentId` or an inlined `Fragment`."""
+    if isinstance(ref, str):
+        return True
+    return _check_inline(ref, report, where)
+
+
+def _check_inline(fragment: Any, report: Callable[[str], None], where: str) -> bool:
+    def report_inline(problem: str) -> None:
+        report('inlined Fragment in {} {}'.format(where, problem))
+
+    if not _check_fragment(fragment, report_inline):
+        return False
+    # Only primitives, which reference no other `Fragment`s, are inlined
+    if next(iter_child_ids(fragment), None) is not None:
+        report_inline('references other Fragments.')
+    return True
+
+
+def _check_list(contents: Dict[str, Any], field: str,
+                report: Callable[[str], None]) -> Optional[List[Any]]:
+    value = contents.get(field)
+    if not isinstance(value, list):
+        report('has invalid "{}".'.format(field))
+        return None
+    return value
+
+
+def _check_elements(contents: Dict[str, Any], report: Callable[[str], None]) -> bool:
+    valid = True
+    items = _check_list(contents, 'elements', report)
+    if items is None:
+        return False
+    for i, elem in enumerate(items):
+        if not isinstance(elem, (str, dict)):
+            report('has an invalid element at index {}.'.format(i))
+            valid = False
+        else:
+            valid = _check_ref(elem, report, 'element {}'.format(i)) and valid
+    return valid
+
+
+def _check_switch(contents: Dict[str, Any], report: Callable[[str], None]) -> bool:
+    valid = True
+    items = _check_list(contents, 'modes', report)
+    if items is None:
+        return False
+    for i, mode in enumerate(items):
+        if not isinstance(mode, str):
+            report('has an invalid mode at index {}.'.format(i))
+            valid = False
+    return valid
+
+
+def _check_key_value(contents: Dict[str, Any], report: Callable[[str], None]) -> bool:
+    valid = True
+    items = _check_list(contents, 'entries', report)
+    if items is None:
+        return False
+    for i, entry in enumerate(items):
+        if not isinstance(entry, dict) or not isinstance(entry.get('key'), (str, dict)) \
+                or not isinstance(entry.get('value'), (str, dict)):
+            report('has an invalid entry at index {}.'.format(i))
+            valid = False
+            continue
+        valid = _check_ref(entry['key'], report, 'entry {} key'.format(i)) and valid
+        valid = _check_ref(entry['value'], report, 'entry {} value'.format(i)) and valid
+    return valid
+
+
+def _check_slot(holder: Dict[str, Any], report: Callable[[str], None], where: str) -> bool:
+    """Checks a Grid cell or Dag node, which holds either "fragmentId" or an inlined "fragment"."""
+    if 'fragmentId' in holder:
+        if not isinstance(holder['fragmentId'], str):
+            report('{} has an invalid "fragmentId".'.format(where))
+            return False
+        return True
+    if 'fragment' in holder:
+        return _check_inline(holder['fragment'], report, where)
+    report('{} has neither "fragmentId" nor "fragment".'.format(where))
+    return False
+
+
+def _check_grid(contents: Dict[str, Any], report: Callable[[str], None]) -> bool:
+    valid = True
+    items = _check_list(contents, 'cells', report)
+    if items is None:
+        return False
+    for i, cell in enumerate(items):
+        where = 'cell {}'.format(i)
+        if not isinstance(cell, dict):
+            report('{} is not a dict.'.format(where))
+            valid = False
+            continue
+        for field in ('col', 'row', 'width', 'height'):
+            if not isinstance(cell.get(field), int):
+                report('{} has invalid "{}".'.format(where, field))
+        valid = _check_slot(cell, report, where) and valid
+    return valid
+
+
+def _check_dag(contents: Dict[str, Any], report: Callable[[str], None]) -> bool:
+    nodes = contents.get('nodes')
+    if not isinstance(nodes, dict):
+        report('has invalid "nodes".')
+        return False
+    valid = True
+    parents: Dict[str, str] = {}
+    for node_id, node in nodes.items():
+        where = 'node "{}"'.format(node_id)
+        if not isinstance(node, dict):
+            report('{} is not a dict.'.format(where))
+            valid = False
+            continue
+        valid = _check_slot(node, report, where) and valid
+        children = node.get('children', [])
+        if not isinstance(children, list):
+            report('{} has invalid "children".'.format(where))
+            continue
+        for child_id in children:
+            if child_id not in nodes:
+                report('{} has non-existent child "{}".'.format(where, child_id))
+            elif parents.get(child_id) == node_id:
+                report('{} lists child "{}" more than once.'.format(where, child_id))
+            elif child_id in parents:
+                message = 'node "{}" is a child of both "{}" and "{}".'
+                report(message.format(child_id, parents[child_id], node_id))
+            else:
+                parents[child_id] = node_id
+    edges = contents.get('edges', {})
+    if not isinstance(edges, dict):
+        report('has invalid "edges".')
+        return valid
+    for edge_id, edge in edges.items():
+        for end in ('source', 'target'):
+            endpoint = edge.get(end) if isinstance(edge, dict) else None
+            if not isinstance(endpoint, dict) or endpoint.get('id') not in nodes:
+                report('edge "{}" has a non-existent {} node.'.format(edge_id, end))
+                continue
+            port = endpoint.get('port')
+            if port is not None and port not in (nodes[endpoint['id']].get('ports') or {}):
+                report('edge "{}" has a non-existent {} port "{}" on node "{}".'.format(
+                    edge_id, end, port, endpoint['id']))
+    return valid
+
+
+def _check_table(contents: Dict[str, Any], report: Callable[[str], None]) -> bool:
+    columns = _check_list(contents, 'columns', report)
+    data = _check_list(contents, 'data', report)
+    if columns is not None and data is not None and len(data) != len(columns):
+        report('has {} columns of data, but {} columns.'.format(len(data), len(columns)))
+    return True
+
+
+def _check_buffer(contents: Dict[str, Any], report: Callable[[str], None]) -> bool:
+    if not isinstance(contents.get('length'), int):
+        report('has invalid "length".')
+    for field in ('head', 'tail'):
+        window = contents.get(field)
+        if (window is not None or field == 'head') and not (
+                isinstance(window, dict) and isinstance(window.get('hex'), str)):
+            report('has invalid "{}".'.format(field))
+    return True
+
+
+_CHECKS: Dict[str, Callable[[Dict[str, Any], Callable[[str], None]], bool]] = {
+    'TextPrimitive': _check_fields('text'),
+    'TokenPrimitive': _check_fields('text'),
+    'IconPrimitive': _check_fields('name'),
+    'ImagePrimitive': _check_fields('image'),
+    'SeriesPrimitive': _check_fields('points'),
+    'TablePrimitive': _check_table,
+    'BufferPrimitive': _check_buffer,
+    'SequenceLayout': _check_elements,
+    'FlowLayout': _check_elements,
+    'SwitchLayout': _check_switch,
+    'KeyValueLayout': _check_key_value,
+    'GridLayout': _check_grid,
+    'DagLayout': _check_dag,
+}
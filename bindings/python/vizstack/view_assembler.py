@@ -1,16 +1,54 @@
-from typing import Any, Optional, Dict, List
-from hashlib import md5
-from base64 import b64encode
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional, Deque, Dict, List, Tuple
+from collections import OrderedDict, deque
 from vizstack.schema import FragmentId, View, Fragment
-from vizstack.fragment_assembler import FragmentAssembler
+from vizstack.fragment_assembler import FragmentAssembler, Deferred, _STUB_META_KEY, _stub_fragment
 from vizstack.lang import get_language_default
-import inspect
+from vizstack.assemblers.text import Text
+from vizstack.assemblers.token import Token
+from vizstack.instrument import AssemblyHook, FragmentEvent
+from vizstack.traversal import iter_child_ids
+from time import monotonic, perf_counter
+from hashlib import md5
+from base64 import b64encode
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+__all__ = [
+    'assemble', 'assemble_many', 'assemble_partial', 'assemble_roots', 'view', 'Assembly', 'is_stub'
+]
+
+# Passed as the object of an `Assembly` which starts without an unnamed root.
+_NO_ROOT = object()
 
-__all__ = ['assemble', 'view']
+# The types of values which are shown as a single `TextPrimitive` by default, and so can be inlined.
+_INLINE_VALUE_TYPES = (str, int, float, bool, type(None))
+_INLINE_FRAGMENT_TYPES = ('TextPrimitive', 'TokenPrimitive')
+# The maximum length of the text of an inlined `Fragment`. Longer texts are better kept in separate
+# `Fragment`s, which are only shipped once however often they are referenced.
+_MAX_INLINE_TEXT_LENGTH = 64
+
+
+def _release_stale(assigned: Dict[int, FragmentId], objects: Dict[FragmentId, Any],
+                   frag_id: FragmentId) -> None:
+    """Forgets the object previously assigned `frag_id`, if any, before another object is given it.
+
+    This happens when a parent is assembled again and creates its children anew, e.g. the
+    `FragmentAssembler`s made by language defaults. The old object is released once `objects` no
+    longer holds it, after which its `id()` may be reused by a new object, which must not inherit
+    the old `FragmentId`.
+    """
+    stale = objects.get(frag_id)
+    if stale is not None and assigned.get(id(stale)) == frag_id:
+        del assigned[id(stale)]
 
 
 class ViewAssembler:
     _ROOT_ID = FragmentId('root')
+    # Hashed `FragmentId`s are base64-encoded, so they never contain a "-" and cannot collide with
+    # the `FragmentId`s of named roots.
+    _NAMED_ROOT_ID_FORMAT = 'root-{}'
 
     @staticmethod
     def _hash_fragment_id(fragment_name: str) -> FragmentId:
@@ -27,9 +65,7 @@ class ViewAssembler:
         Returns:
             A `FragmentId` produced by hashing `fragment_name`.
         """
-        m = md5()
-        m.update(fragment_name.encode())
-        return FragmentId(str(b64encode(m.digest()), 'utf-8')[:10])
+        return FragmentId(str(b64encode(md5(fragment_name.encode()).digest()), 'utf-8')[:10])
 
     @staticmethod
     def _get_fragment_id(slot: str, parent_id: FragmentId) -> FragmentId:
@@ -79,60 +115,512 @@ class ViewAssembler:
         if isinstance(obj, FragmentAssembler):
             return obj
         # Do not call `__view__()` if `obj` is a class -- not an instance -- that defines `__view__()`
-        elif not inspect.isclass(obj) and hasattr(obj, '__view__'):
+        elif not isinstance(obj, type) and hasattr(obj, '__view__'):
             return getattr(obj, '__view__')()
         else:
             return get_language_default(obj)
 
     @staticmethod
-    def assemble(obj: Any) -> View:
-        # Since Python `dict`s cannot use unhashable types (e.g., lists) as keys, we have to use the id of the
-        # object instead. This requires us to reference each object in a `list` that will persist throughout the
-        # call to `assemble()` so that the objects do not get garbage collected -- and their ids reused -- in the
-        # middle of the call.
-        assigned: Dict[int, FragmentId] = {id(obj): ViewAssembler._ROOT_ID}
-        used: List[Any] = [obj]
-        fragments: Dict[FragmentId, Optional[Fragment]] = {ViewAssembler._ROOT_ID: None}
-        stack: List[Any] = [obj]
-
-        while len(stack) > 0:
+    def assemble(obj: Any, hooks: Optional[List[AssemblyHook]] = None,
+                 deadline: Optional[float] = None, inline_primitives: bool = False) -> View:
+        """Returns a `View` of `obj` and every object it references.
+
+        Args:
+            obj: The object to be visualized.
+            hooks: Optional `AssemblyHook`s which observe the assembly of each `Fragment`. Timing
+                and bookkeeping are only performed when at least one hook is given.
+            deadline: An optional `time.monotonic()` value after which no more `Fragment`s are
+                assembled. Objects are then assembled shallowest-first, and any left over are
+                replaced by stub `Fragment`s; see `assemble_partial()` to resume the assembly.
+            inline_primitives: Whether to embed short `Text` and `Token` primitives directly in the
+                contents of their parent `Fragment`s, instead of referencing them by `FragmentId`;
+                see `Assembly`. This extends the schema, so it is off by default.
+
+        Returns:
+            A `View` whose root `Fragment` represents `obj`.
+        """
+        return ViewAssembler.assemble_partial(obj, hooks=hooks, deadline=deadline,
+                                              inline_primitives=inline_primitives)[0]
+
+    @staticmethod
+    def assemble_partial(obj: Any, hooks: Optional[List[AssemblyHook]] = None,
+                         deadline: Optional[float] = None,
+                         inline_primitives: bool = False) -> Tuple[View, 'Assembly']:
+        """Returns a `View` of `obj`, assembled until `deadline`, and the `Assembly` that made it.
+
+        Arguments are as for `assemble()`. If the deadline passed, the "pendingId" in the "meta" of
+        each stub is the `FragmentId` it will be replaced under; calling `run()` on the returned
+        `Assembly` assembles the remaining objects, and `resolve()` assembles a `Deferred` one.
+
+        Returns:
+            The `View` and the `Assembly`, whose `done` is `True` if the `View` is complete.
+        """
+        assembly = Assembly(obj, hooks=hooks, breadth_first=deadline is not None,
+                            inline_primitives=inline_primitives)
+        return assembly.run(deadline), assembly
+
+    @staticmethod
+    def assemble_roots(roots: Dict[str, Any], hooks: Optional[List[AssemblyHook]] = None,
+                       deadline: Optional[float] = None, inline_primitives: bool = False) -> View:
+        """Returns a single `View` of several named objects and every object they reference.
+
+        Unlike assembling each object separately, an object reachable from several roots is
+        assembled once, and its `Fragment` is shared by all of them.
+
+        Args:
+            roots: A mapping of root names to the objects to be visualized.
+            hooks: Optional `AssemblyHook`s which observe the assembly of each `Fragment`.
+            deadline: An optional `time.monotonic()` value after which no more `Fragment`s are
+                assembled; see `assemble()`.
+            inline_primitives: Whether to embed short primitives in their parents; see `assemble()`.
+
+        Returns:
+            A `View` whose "rootIds" map each root name to the `FragmentId` of its `Fragment`. Its
+            "rootId" is that of the first root, so the `View` can also be used wherever a
+            single-root `View` is expected.
+
+        Raises:
+            ValueError: If `roots` is empty.
+        """
+        if len(roots) == 0:
+            raise ValueError('At least one root must be given.')
+        assembly = Assembly(_NO_ROOT, hooks=hooks, breadth_first=deadline is not None,
+                            inline_primitives=inline_primitives)
+        for name, obj in roots.items():
+            assembly.add_root(name, obj)
+        return assembly.run(deadline)
+
+    @staticmethod
+    def assemble_many(objs: Iterable[Any], max_workers: Optional[int] = None,
+                      executor: Optional[Executor] = None) -> List[View]:
+        """Returns a `View` of each object in `objs`, assembling them concurrently on a thread pool.
+
+        Each `View` is assembled independently, exactly as by `assemble()`; all per-assembly state
+        is local to its `Assembly`, and the caches shared between assemblies (of the default view
+        for each type, and of parsed `Grid` specifications) are safe to use from multiple threads.
+        Because of the GIL, this is only faster than assembling the objects one after another when
+        the `__view__()` methods involved release it, e.g. to wait on I/O or to run native code.
+
+        The objects must not be modified while they are being assembled.
+
+        Args:
+            objs: The objects to be visualized.
+            max_workers: The number of threads to use if `executor` is not given; see
+                `concurrent.futures.ThreadPoolExecutor`.
+            executor: An optional `concurrent.futures.Executor` to run the assemblies on, so that a
+                long-lived thread pool can be reused across calls. It is not shut down.
+
+        Returns:
+            A `list` of `View`s, in the same order as `objs`.
+        """
+        if executor is not None:
+            return list(executor.map(ViewAssembler.assemble, objs))
+        # `concurrent.futures` is only needed here, so it is imported on first use
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(ViewAssembler.assemble, objs))
+
+
+class Assembly:
+    """The state of a (possibly interrupted) assembly of a `View`.
+
+    `ViewAssembler.assemble()` creates an `Assembly` and runs it to completion. Creating one
+    directly allows an assembly to be bounded by a deadline and resumed later:
+
+        assembly = Assembly(obj)
+        view = assembly.run(deadline=time.monotonic() + 0.05)
+        ...
+        if not assembly.done:
+            view = assembly.run(deadline=time.monotonic() + 0.05)
+
+    Every `View` returned by `run()` is valid. Objects which were assigned a `FragmentId` but not
+    yet assembled are represented by stub `Fragment`s (see `is_stub()`); a later `run()` replaces
+    them with real `Fragment`s under the same `FragmentId`s.
+
+    If `inline_primitives` is set, then layouts which support it (`Sequence`, `Flow`, `KeyValue`,
+    `Grid` and `Dag`) embed the complete `Fragment` of each short `Text` or `Token` primitive -- and
+    of each `str`, number, `bool` or `None` -- in their contents, instead of its `FragmentId`. In
+    `Sequence`, `Flow` and `KeyValue` contents, the `Fragment` takes the place of the `FragmentId`;
+    `Grid` cells and `Dag` nodes hold it under "fragment" instead of "fragmentId". Inlined
+    `Fragment`s are not assigned `FragmentId`s, are not reported to hooks, and are not part of the
+    "fragments" of the `View`. Objects which already have a `FragmentId` are never inlined. Use
+    `vizstack.traversal.expand_inline_fragments()` to convert such a `View` for consumers which do
+    not support inlining.
+    """
+
+    def __init__(self, obj: Any, hooks: Optional[List[AssemblyHook]] = None,
+                 breadth_first: bool = True, inline_primitives: bool = False,
+                 max_expanders: int = 10000, clock: Callable[[], float] = monotonic) -> None:
+        """
+        Args:
+            obj: The object to be visualized.
+            hooks: Optional `AssemblyHook`s which observe the assembly of each `Fragment`.
+            breadth_first: Whether to assemble objects shallowest-first, so that an interrupted
+                assembly contains the outermost `Fragment`s. Otherwise, objects are assembled
+                depth-first, which keeps fewer objects pending at once.
+            inline_primitives: Whether to embed short primitives in their parents' contents.
+            max_expanders: The maximum number of `FragmentAssembler`s kept for `expand()`; the least
+                recently used are dropped first.
+            clock: The function returning the current time, which deadlines are compared with.
+        """
+        # Since Python `dict`s cannot use unhashable types (e.g., lists) as keys, we have to use the
+        # id of the object instead. This requires us to reference each object in a `dict` that will
+        # persist throughout the assembly so that the objects do not get garbage collected -- and
+        # their ids reused -- in the middle of it. The same `dict` allows the object behind any
+        # `FragmentId` to be found again.
+        self._assigned: Dict[int, FragmentId] = {}
+        self._objects: Dict[FragmentId, Any] = {}
+        self._fragments: Dict[FragmentId, Optional[Fragment]] = {}
+        self._pending: Deque[Any] = deque()
+        self._breadth_first = breadth_first
+        self._inline_primitives = inline_primitives
+        self._hooks = hooks
+        # Only populated when there are hooks; maps each `FragmentId` to its parent, slot and depth.
+        self._origins: Dict[FragmentId, Tuple[Optional[FragmentId], Optional[str], int]] = {}
+        # The `FragmentAssembler`s used by `expand()`, which may hold state such as indexes, with
+        # the objects they were made for, in order of use.
+        self._expanders: 'OrderedDict[FragmentId, Tuple[Any, FragmentAssembler]]' = OrderedDict()
+        self._max_expanders = max_expanders
+        self._clock = clock
+        self._root_id: Optional[FragmentId] = None
+        self._named_root_ids: Dict[str, FragmentId] = {}
+        if obj is not _NO_ROOT:
+            self._add_root(ViewAssembler._ROOT_ID, obj)
+
+    def add_root(self, name: str, obj: Any) -> FragmentId:
+        """Adds a named root object to the `View`, to be assembled by the next `run()`.
+
+        Roots share a single assignment of `FragmentId`s, so an object reachable from several roots
+        is only assembled once. The `View`s returned by `run()` list all named roots in "rootIds".
+
+        Args:
+            name: The name of the root, unique within the `View`.
+            obj: The object to be visualized.
+
+        Returns:
+            The `FragmentId` of the `Fragment` for `obj`. If `obj` was already assigned one, e.g. as
+            another root, then that one is reused.
+
+        Raises:
+            ValueError: If a root named `name` already exists.
+        """
+        if name in self._named_root_ids:
+            raise ValueError('A root named "{}" already exists.'.format(name))
+        frag_id = self._assigned.get(id(obj))
+        if frag_id is None:
+            frag_id = FragmentId(ViewAssembler._NAMED_ROOT_ID_FORMAT.format(name))
+            self._add_root(frag_id, obj)
+        elif self._root_id is None:
+            self._root_id = frag_id
+        self._named_root_ids[name] = frag_id
+        return frag_id
+
+    def _add_root(self, frag_id: FragmentId, obj: Any) -> None:
+        self._assigned[id(obj)] = frag_id
+        self._objects[frag_id] = obj
+        self._fragments[frag_id] = None
+        self._pending.append(obj)
+        self._origins[frag_id] = (None, None, 0)
+        if self._root_id is None:
+            self._root_id = frag_id
+
+    @property
+    def done(self) -> bool:
+        """Whether every object in the `View` has been assembled."""
+        return len(self._pending) == 0
+
+    def assemble_fragment(self, frag_id: FragmentId) -> Fragment:
+        """Assembles one `Fragment`, without assembling the objects it references.
+
+        Referenced objects are assigned `FragmentId`s, exactly as in `run()`, so that their
+        `Fragment`s can be assembled by later calls. The returned `Fragment` is not stored, so this
+        can be used to serve `Fragment`s on demand without holding the whole `View` in memory.
+
+        Args:
+            frag_id: The `FragmentId` of the root or of any object referenced by an assembled
+                `Fragment`.
+
+        Returns:
+            The `Fragment` for the object with `FragmentId` `frag_id`.
+
+        Raises:
+            KeyError: If no object has been assigned `frag_id`.
+        """
+        obj = self._objects[frag_id]
+        # A `Fragment` requested on demand is about to be shown, so produce its `Deferred` object
+        if isinstance(obj, Deferred):
+            obj.resolve()
+        return self._assemble_object(frag_id, obj)
+
+    def _assemble_object(self, frag_id: FragmentId, obj: Any) -> Fragment:
+        """Assembles `obj`'s `Fragment`, assigning `FragmentId`s to the objects it references."""
+        if isinstance(obj, Deferred) and not obj.resolved:
+            return _stub_fragment(frag_id, deferred=True)
+        assigned = self._assigned
+        objects = self._objects
+        fragments = self._fragments
+        inline_primitives = self._inline_primitives
+        fasm = ViewAssembler.get_fragment_assembler(obj)
+
+        def get_id(obj: Any, slot: str, inline: bool = False):
+            if id(obj) in assigned:
+                return assigned[id(obj)]
+            if inline and inline_primitives:
+                inline_frag = _get_inline_fragment(obj)
+                if inline_frag is not None:
+                    return inline_frag
+            created_id = ViewAssembler._get_fragment_id(slot, frag_id)
+            _release_stale(assigned, objects, created_id)
+            assigned[id(obj)] = created_id
+            objects[created_id] = obj
+            # Keep the state consistent for a later `run()`, which will assemble `obj`
+            fragments[created_id] = None
+            return created_id
+
+        frag, _ = fasm.assemble(get_id)
+        return ViewAssembler._remove_null_contents(frag)
+
+    def expand(self, frag_id: FragmentId, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Returns more of the data shown by a `Fragment` which shows only part of it, such as
+        another window of a large text; see `FragmentAssembler.expand()`.
+
+        The `FragmentAssembler` of the object is kept, so that any index it builds is reused by
+        later expansions of the same `Fragment`.
+
+        Args:
+            frag_id: The `FragmentId` of the `Fragment` to expand.
+            request: The parameters of the expansion, specific to the `FragmentAssembler`.
+
+        Returns:
+            A JSON-serializable `dict` describing the requested data.
+
+        A `Deferred` object, such as a lazily assembled mode of a `Switch`, is expanded by
+        `resolve()`, returning {"fragments": <the new Fragments>}, whatever the `request`.
+
+        Raises:
+            KeyError: If no object has been assigned `frag_id`.
+            ValueError: If the `Fragment` cannot be expanded, or `request` is invalid.
+        """
+        obj = self._objects[frag_id]
+        if isinstance(obj, Deferred):
+            return {'fragments': self.resolve(frag_id)}
+        expanders = self._expanders
+        cached = expanders.get(frag_id)
+        # The object behind `frag_id` changes if its parent was assembled again since
+        if cached is None or cached[0] is not obj:
+            cached = expanders[frag_id] = (obj, ViewAssembler.get_fragment_assembler(obj))
+            if len(expanders) > self._max_expanders:
+                expanders.popitem(last=False)
+        expanders.move_to_end(frag_id)
+        return cached[1].expand(request)
+
+    def resolve(self, frag_id: FragmentId) -> Dict[FragmentId, Fragment]:
+        """Produces the object of a `Deferred` and assembles it in place of its stub.
+
+        The object is assembled under `frag_id`, along with every object it references, so that the
+        returned `Fragment`s can be merged into a `View` previously returned by `run()`. Other
+        pending objects are left for later calls, and other `Deferred` objects reached stay stubs.
+
+        Args:
+            frag_id: The `FragmentId` of a stub created by a `Deferred`.
+
+        Returns:
+            The `Fragment` of `frag_id` and those it references, directly or indirectly.
+
+        Raises:
+            KeyError: If no object has been assigned `frag_id`.
+            ValueError: If the object with `FragmentId` `frag_id` is not a `Deferred`.
+        """
+        obj = self._objects[frag_id]
+        if not isinstance(obj, Deferred):
+            raise ValueError('Fragment "{}" is not deferred.'.format(frag_id))
+        if not obj.resolved:
+            obj.resolve()
+            self._fragments[frag_id] = None
+        fragments = self._fragments
+        resolved: Dict[FragmentId, Fragment] = {}
+        stack = [frag_id]
+        while stack:
             curr = stack.pop()
-            frag_id = assigned[id(curr)]
+            if curr in resolved:
+                continue
+            frag = fragments.get(curr)
+            if frag is None:
+                frag = fragments[curr] = self._assemble_object(curr, self._objects[curr])
+            resolved[curr] = frag
+            stack.extend(iter_child_ids(frag))
+        return resolved
+
+    def run(self, deadline: Optional[float] = None) -> View:
+        """Assembles pending objects until none remain or `deadline` passes.
+
+        Args:
+            deadline: An optional `time.monotonic()` value after which no more `Fragment`s are
+                assembled. The deadline is checked before each object is assembled, so an
+                already-passed deadline returns the current state immediately.
 
-            assert frag_id, 'Object returned as ref was not assigned a FragmentId: {}'.format(curr)
+        Returns:
+            A `View` of everything assembled so far, with stubs in place of pending objects.
+        """
+        assigned = self._assigned
+        objects = self._objects
+        fragments = self._fragments
+        pending = self._pending
+        pop = pending.popleft if self._breadth_first else pending.pop
+        inline_primitives = self._inline_primitives
+        hooks = self._hooks
+        instrumented = bool(hooks)
+        origins = self._origins
+
+        clock = self._clock
+        while len(pending) > 0:
+            if deadline is not None and clock() >= deadline:
+                break
+
+            curr = pop()
+            frag_id = assigned.get(id(curr))
+
+            if frag_id is None:
+                # Only objects inlined into their parent's contents have no `FragmentId`
+                if not inline_primitives:
+                    raise ValueError(
+                        'Object returned as ref was not assigned a FragmentId: {}'.format(curr)
+                    )
+                continue
 
             if fragments[frag_id] is not None:
                 continue
 
-            fasm = ViewAssembler.get_fragment_assembler(curr)
+            if instrumented:
+                event = FragmentEvent(curr, frag_id, *origins[frag_id],
+                                      stack_length=len(pending) + 1)
+                for hook in hooks:  # type: ignore
+                    hook.pre_fragment(event)
+                start = perf_counter()
+                fasm = ViewAssembler.get_fragment_assembler(curr)
+                event.resolve_seconds = perf_counter() - start
+                if fasm is not curr and not isinstance(curr, type) and hasattr(curr, '__view__'):
+                    event.view_class = type(curr).__qualname__
+            else:
+                fasm = ViewAssembler.get_fragment_assembler(curr)
 
-            def get_id(obj: Any, slot: str):
+            def get_id(obj: Any, slot: str, inline: bool = False):
                 # If `obj` has already been given a `FragmentId`, return that
                 if id(obj) in assigned:
                     return assigned[id(obj)]
+                # If the parent can embed `obj` and it is a short primitive, return its `Fragment`
+                if inline and inline_primitives:
+                    inline_frag = _get_inline_fragment(obj)
+                    if inline_frag is not None:
+                        return inline_frag
                 # Otherwise, create a new `FragmentId` for `obj` using its slot and the `FragmentId` of its parent
-                created_id = ViewAssembler._get_fragment_id(slot, frag_id)
+                if instrumented:
+                    start = perf_counter()
+                    created_id = ViewAssembler._get_fragment_id(slot, frag_id)
+                    event.hash_seconds += perf_counter() - start
+                    origins[created_id] = (frag_id, slot, origins[frag_id][2] + 1)
+                else:
+                    created_id = ViewAssembler._get_fragment_id(slot, frag_id)
+                _release_stale(assigned, objects, created_id)
                 assigned[id(obj)] = created_id
-                # Store a reference to `obj` so it is not garbage collected until this call to `assemble()` terminates
-                used.append(obj)
+                # Store a reference to `obj` so it is not collected until the assembly is discarded
+                objects[created_id] = obj
                 # Indicate that a `Fragment` for `obj` will need to be created in a later iteration
                 fragments[created_id] = None
                 return created_id
 
-            frag, refs = fasm.assemble(get_id)
-            fragments[frag_id] = ViewAssembler._remove_null_contents(frag)
-            stack.extend(refs)
+            if instrumented:
+                start = perf_counter()
+                frag, refs = fasm.assemble(get_id)
+                event.assemble_seconds = perf_counter() - start - event.hash_seconds
+            else:
+                frag, refs = fasm.assemble(get_id)
+            frag = ViewAssembler._remove_null_contents(frag)
+            if isinstance(curr, Deferred) and not curr.resolved:
+                frag = _stub_fragment(frag_id, deferred=True)
+            fragments[frag_id] = frag
+            pending.extend(refs)
+
+            if instrumented:
+                event.fragment = frag
+                for hook in hooks:  # type: ignore
+                    hook.post_fragment(event)
 
-        for frag_id, frag in fragments.items():  # type: ignore
-            assert frag is not None, 'Object assigned a FragmentId was not returned as a ref: {}'.format(frag_id)
+        if len(pending) > 0:
+            return self._make_view({
+                frag_id: frag if frag is not None else _stub_fragment(frag_id)
+                for frag_id, frag in fragments.items()
+            })
 
-        return {
-            'rootId': ViewAssembler._ROOT_ID,
-            'fragments': fragments,  # type: ignore
+        # Membership tests of `dict` values run in C, so checking a complete `View` stays cheap
+        if None in fragments.values():
+            missing_id = next(frag_id for frag_id, frag in fragments.items() if frag is None)
+            raise ValueError(
+                'Object assigned a FragmentId was not returned as a ref: {}'.format(missing_id)
+            )
+
+        # The `View` gets its own mapping, since later calls add to the `Assembly`'s
+        return self._make_view(dict(fragments))  # type: ignore
+
+    def _make_view(self, fragments: Dict[FragmentId, Fragment]) -> View:
+        view: View = {
+            'rootId': self._root_id,  # type: ignore
+            'fragments': fragments,
         }
+        if self._named_root_ids:
+            view['rootIds'] = dict(self._named_root_ids)  # type: ignore
+        return view
+
+
+def _no_references(obj: Any, slot: str, inline: bool = False) -> FragmentId:
+    """The `get_id()` of primitives assembled for inlining, which reference no other objects."""
+    raise ValueError('A primitive cannot reference other objects.')
+
+
+def _get_inline_fragment(obj: Any) -> Optional[Fragment]:
+    """Returns the `Fragment` of `obj` if it can be embedded in its parent's contents, or `None`.
+
+    Only objects whose `Fragment` can be produced without side effects are considered: `Text` and
+    `Token` assemblers, and values shown as `Text` by default. Objects with a `__view__()` method
+    are not, since resolving them here and again in `run()` would call it twice.
+    """
+    if type(obj) in _INLINE_VALUE_TYPES:
+        fasm = get_language_default(obj)
+    elif isinstance(obj, (Text, Token)):
+        fasm = obj
+    else:
+        return None
+    frag, refs = fasm.assemble(_no_references)
+    if (len(refs) > 0 or frag['type'] not in _INLINE_FRAGMENT_TYPES
+            or len(frag['contents']['text']) > _MAX_INLINE_TEXT_LENGTH):  # type: ignore
+        return None
+    return ViewAssembler._remove_null_contents(frag)
+
+
+def is_stub(fragment: Fragment) -> bool:
+    """Returns whether `fragment` stands in for an object which has not been assembled yet."""
+    return bool((fragment.get('meta') or {}).get(_STUB_META_KEY, False))
+
 
 def view(obj: Any) -> FragmentAssembler:
     return ViewAssembler.get_fragment_assembler(obj)
 
-def assemble(obj: Any):
-    return ViewAssembler.assemble(obj)
+def assemble(obj: Any, hooks: Optional[List[AssemblyHook]] = None, deadline: Optional[float] = None,
+             inline_primitives: bool = False):
+    return ViewAssembler.assemble(obj, hooks=hooks, deadline=deadline,
+                                  inline_primitives=inline_primitives)
+
+def assemble_partial(obj: Any, hooks: Optional[List[AssemblyHook]] = None,
+                     deadline: Optional[float] = None,
+                     inline_primitives: bool = False) -> Tuple[View, Assembly]:
+    return ViewAssembler.assemble_partial(obj, hooks=hooks, deadline=deadline,
+                                          inline_primitives=inline_primitives)
+
+def assemble_roots(roots: Dict[str, Any], hooks: Optional[List[AssemblyHook]] = None,
+                   deadline: Optional[float] = None, inline_primitives: bool = False) -> View:
+    return ViewAssembler.assemble_roots(roots, hooks=hooks, deadline=deadline,
+                                        inline_primitives=inline_primitives)
+
+def assemble_many(objs: Iterable[Any], max_workers: Optional[int] = None,
+                  executor: Optional[Executor] = None) -> List[View]:
+    return ViewAssembler.assemble_many(objs, max_workers=max_workers, executor=executor)
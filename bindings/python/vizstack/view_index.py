@@ -0,0 +1,198 @@
+"""An index of the references between the `Fragment`s of a `View`, for repeated queries over it.
+
+Example:
+    index = ViewIndex(view)
+    index.parents(frag_id)              # The `Fragment`s referencing `frag_id`
+    index.path(frag_id)                 # The `FragmentId`s from the root down to `frag_id`
+    index.of_type('DagLayout')          # Every `DagLayout`
+    index.set(frag_id, new_fragment)    # Replaces a `Fragment`, updating the index
+
+A `View` only records references from parents to children, in fields which depend on the layout type
+(see `vizstack.traversal`), so finding a `Fragment`'s parents, or every `Fragment` of a type,
+otherwise means scanning the whole `View`. `ViewIndex` scans it once, and keeps its maps up to date
+as `Fragment`s are set and removed, at a cost proportional to the references they change.
+"""
+from typing import Dict, Iterable, List, Optional, Set
+
+from vizstack.schema import Fragment, FragmentId, View
+from vizstack.traversal import get_child_ids
+
+__all__ = ['ViewIndex']
+
+
+class ViewIndex:
+    """Parent and child maps, type lookup and reachability over the `Fragment`s of a `View`.
+
+    The index shares the `View`'s "fragments" mapping, which `set()` and `remove()` modify. The
+    `Fragment`s must not be changed in any other way while the index is in use.
+    """
+
+    def __init__(self, view: View) -> None:
+        self.view = view
+        self._fragments: Dict[FragmentId, Fragment] = view['fragments']
+        self._children: Dict[FragmentId, List[FragmentId]] = {}
+        # For each `FragmentId`, the number of references to it from each parent, in indexing order
+        self._parents: Dict[FragmentId, Dict[FragmentId, int]] = {}
+        self._by_type: Dict[str, Dict[FragmentId, None]] = {}
+        # Caches which are invalidated by any change
+        self._reachable: Optional[Set[FragmentId]] = None
+        self._subtree_sizes: Dict[FragmentId, int] = {}
+        for frag_id, fragment in self._fragments.items():
+            self._add(frag_id, fragment)
+
+    def _add(self, frag_id: FragmentId, fragment: Fragment) -> None:
+        child_ids = get_child_ids(fragment)
+        self._children[frag_id] = child_ids
+        for child_id in child_ids:
+            parents = self._parents.setdefault(child_id, {})
+            parents[frag_id] = parents.get(frag_id, 0) + 1
+        self._by_type.setdefault(fragment['type'], {})[frag_id] = None
+
+    def _discard(self, frag_id: FragmentId) -> None:
+        fragment = self._fragments[frag_id]
+        for child_id in self._children.pop(frag_id):
+            parents = self._parents[child_id]
+            parents[frag_id] -= 1
+            if not parents[frag_id]:
+                del parents[frag_id]
+                if not parents:
+                    del self._parents[child_id]
+        of_type = self._by_type[fragment['type']]
+        del of_type[frag_id]
+        if not of_type:
+            del self._by_type[fragment['type']]
+
+    def _invalidate(self) -> None:
+        self._reachable = None
+        self._subtree_sizes.clear()
+
+    def set(self, frag_id: FragmentId, fragment: Fragment) -> None:
+        """Adds `fragment` to the `View`, replacing any `Fragment` with the same `FragmentId`."""
+        if frag_id in self._fragments:
+            self._discard(frag_id)
+        self._fragments[frag_id] = fragment
+        self._add(frag_id, fragment)
+        self._invalidate()
+
+    def update(self, fragments: Dict[FragmentId, Fragment]) -> None:
+        """Sets each of `fragments`, e.g., those returned by `Assembly.resolve()`."""
+        for frag_id, fragment in fragments.items():
+            self.set(frag_id, fragment)
+
+    def remove(self, frag_id: FragmentId) -> Fragment:
+        """Removes a `Fragment` from the `View`. References to it from other `Fragment`s are kept.
+
+        Returns:
+            The removed `Fragment`.
+
+        Raises:
+            KeyError: If there is no `Fragment` with `FragmentId` `frag_id`.
+        """
+        self._discard(frag_id)
+        self._invalidate()
+        return self._fragments.pop(frag_id)
+
+    def __contains__(self, frag_id: object) -> bool:
+        return frag_id in self._fragments
+
+    def __len__(self) -> int:
+        return len(self._fragments)
+
+    def __getitem__(self, frag_id: FragmentId) -> Fragment:
+        return self._fragments[frag_id]
+
+    @property
+    def roots(self) -> List[FragmentId]:
+        """The root `FragmentId`s: "rootId", followed by the values of "rootIds", if any."""
+        roots = [self.view['rootId']]
+        roots.extend(self.view.get('rootIds', {}).values())  # type: ignore
+        return roots
+
+    def children(self, frag_id: FragmentId) -> List[FragmentId]:
+        """Returns the `FragmentId`s referenced by a `Fragment`, once per reference, in order.
+
+        Raises:
+            KeyError: If there is no `Fragment` with `FragmentId` `frag_id`.
+        """
+        return list(self._children[frag_id])
+
+    def parents(self, frag_id: FragmentId) -> List[FragmentId]:
+        """Returns the `FragmentId`s of the `Fragment`s which reference `frag_id`, each once."""
+        return list(self._parents.get(frag_id, ()))
+
+    def parent(self, frag_id: FragmentId) -> Optional[FragmentId]:
+        """Returns the `FragmentId` of the first `Fragment` indexed which references `frag_id`, or
+        `None` if there is none."""
+        return next(iter(self._parents.get(frag_id, ())), None)
+
+    def of_type(self, frag_type: str) -> List[FragmentId]:
+        """Returns the `FragmentId`s of the `Fragment`s of type `frag_type`, e.g. "DagLayout"."""
+        return list(self._by_type.get(frag_type, ()))
+
+    def types(self) -> Dict[str, int]:
+        """Returns the number of `Fragment`s of each type."""
+        return {frag_type: len(frag_ids) for frag_type, frag_ids in self._by_type.items()}
+
+    def path(self, frag_id: FragmentId) -> Optional[List[FragmentId]]:
+        """Returns a shortest path of `FragmentId`s from a root down to `frag_id`, including both.
+
+        The search runs upwards through parents, so its cost depends on the number of ancestors of
+        `frag_id` rather than on the size of the `View`.
+
+        Returns:
+            The path, or `None` if `frag_id` is not reachable from any root.
+        """
+        roots = set(self.roots)
+        # The next `FragmentId` towards `frag_id` from each ancestor found so far
+        towards: Dict[FragmentId, Optional[FragmentId]] = {frag_id: None}
+        frontier = [frag_id]
+        while frontier:
+            found = next((ancestor for ancestor in frontier if ancestor in roots), None)
+            if found is not None:
+                path = [found]
+                while towards[path[-1]] is not None:
+                    path.append(towards[path[-1]])  # type: ignore
+                return path
+            next_frontier = []
+            for ancestor in frontier:
+                for parent in self._parents.get(ancestor, ()):
+                    if parent not in towards and parent in self._fragments:
+                        towards[parent] = ancestor
+                        next_frontier.append(parent)
+            frontier = next_frontier
+        return None
+
+    def descendants(self, frag_id: FragmentId) -> Set[FragmentId]:
+        """Returns the `FragmentId`s of the `Fragment`s reachable from `frag_id`, including itself.
+        References to missing `Fragment`s are not followed."""
+        return self._get_reachable([frag_id])
+
+    def subtree_size(self, frag_id: FragmentId) -> int:
+        """Returns the number of `Fragment`s reachable from `frag_id`, including itself. Sizes are
+        cached until the index is next changed."""
+        size = self._subtree_sizes.get(frag_id)
+        if size is None:
+            size = self._subtree_sizes[frag_id] = len(self.descendants(frag_id))
+        return size
+
+    def is_reachable(self, frag_id: FragmentId) -> bool:
+        """Returns whether `frag_id` is reachable from a root. The reachable set is computed once
+        and cached until the index is next changed."""
+        if self._reachable is None:
+            self._reachable = self._get_reachable(self.roots)
+        return frag_id in self._reachable
+
+    def unreachable(self) -> List[FragmentId]:
+        """Returns the `FragmentId`s of the `Fragment`s which are not reachable from any root."""
+        return [frag_id for frag_id in self._fragments if not self.is_reachable(frag_id)]
+
+    def _get_reachable(self, start: Iterable[FragmentId]) -> Set[FragmentId]:
+        reachable: Set[FragmentId] = set()
+        stack = [frag_id for frag_id in start if frag_id in self._fragments]
+        reachable.update(stack)
+        while stack:
+            for child_id in self._children[stack.pop()]:
+                if child_id not in reachable and child_id in self._fragments:
+                    reachable.add(child_id)
+                    stack.append(child_id)
+        return reachable
@@ -0,0 +1,351 @@
+"""Streaming reading and writing of `View` files, which may be too large to load into memory.
+
+Three formats are supported:
+    "json":    A `View` as an ordinary JSON object.
+    "compact": The same, without whitespace and with every `FragmentId` renamed to a short one.
+    "ndjson":  One JSON object per line: {"id": <FragmentId>, "fragment": <Fragment>} for each
+               `Fragment`, and any other object, such as {"rootId": <FragmentId>}, for the other
+               fields of the `View`.
+
+Files are read as a stream of items, each ("header", <key>, <value>, <size>) for a field of the
+`View` other than "fragments", or ("fragment", <FragmentId>, <Fragment>, <size>) for a `Fragment`,
+where <size> is the length of its JSON. Only one item is held in memory at a time.
+"""
+from typing import IO, Any, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from collections import Counter, deque
+import heapq
+import json
+import re
+
+from vizstack.schema import Fragment, FragmentId
+from vizstack.traversal import iter_child_ids, map_child_ids
+
+__all__ = [
+    'FORMATS', 'guess_format', 'iter_view_items', 'ViewFileWriter', 'compute_stats',
+    'get_subtree_ids'
+]
+
+FORMATS = ('json', 'compact', 'ndjson')
+
+Item = Tuple[str, Any, Any, int]
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_CHUNK_SIZE = 2**20
+
+
+def guess_format(path: str) -> str:
+    """Returns the format of a file from its extension: "ndjson" for ".ndjson" and ".jsonl",
+    otherwise "json", which also reads "compact" files."""
+    return 'ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'json'
+
+
+def iter_view_items(fp: IO[str], fmt: str = 'json') -> Iterator[Item]:
+    """Yields the items of a `View` file; see the module documentation.
+
+    Raises:
+        ValueError: If the file is not a valid `View` file of the format.
+    """
+    if fmt == 'ndjson':
+        return _iter_ndjson(fp)
+    if fmt in ('json', 'compact'):
+        return _JsonReader(fp).iter_items()
+    raise ValueError('Unknown format: {}'.format(fmt))
+
+
+def _iter_ndjson(fp: IO[str]) -> Iterator[Item]:
+    for line in fp:
+        if not line.strip():
+            continue
+        obj = json.loads(line)
+        if 'fragment' in obj:
+            yield 'fragment', obj['id'], obj['fragment'], len(line)
+        else:
+            for key, value in obj.items():
+                yield 'header', key, value, len(line)
+
+
+class _JsonReader:
+    """Reads a JSON `View` object incrementally, decoding one `Fragment` at a time."""
+
+    def __init__(self, fp: IO[str]) -> None:
+        self._fp = fp
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, min_size: int = _CHUNK_SIZE) -> bool:
+        if self._eof:
+            return False
+        chunk = self._fp.read(max(min_size, _CHUNK_SIZE))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Returns the next non-whitespace character, without consuming it, or '' at the end."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()  # type: ignore
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, char: str) -> None:
+        found = self._peek()
+        if found != char:
+            raise ValueError('Expected "{}" in View file, found "{}".'.format(char, found))
+        self._pos += 1
+
+    def _value(self) -> Tuple[Any, int]:
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # The value may continue past the buffer; read at least as much again, so that a
+                # large value is decoded in time proportional to its size
+                if not self._fill(len(self._buf) - self._pos):
+                    raise ValueError('Truncated or invalid View file.')
+                continue
+            if end == len(self._buf) and not self._eof and self._fill(len(self._buf) - self._pos):
+                # A number may continue past the buffer
+                continue
+            size = end - self._pos
+            self._pos = end
+            return value, size
+
+    def iter_items(self) -> Iterator[Item]:
+        self._expect('{')
+        if self._peek() == '}':
+            return
+        while True:
+            key, _ = self._value()
+            self._expect(':')
+            if key == 'fragments':
+                yield from self._iter_fragments()
+            else:
+                value, size = self._value()
+                yield 'header', key, value, size
+            if self._peek() == ',':
+                self._pos += 1
+                continue
+            self._expect('}')
+            return
+
+    def _iter_fragments(self) -> Iterator[Item]:
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            frag_id, _ = self._value()
+            self._expect(':')
+            fragment, size = self._value()
+            yield 'fragment', frag_id, fragment, size
+            if self._peek() == ',':
+                self._pos += 1
+                continue
+            self._expect('}')
+            return
+
+
+class ViewFileWriter:
+    """Writes the items of a `View` to a file as they arrive; see `iter_view_items()`."""
+
+    def __init__(self, fp: IO[str], fmt: str = 'json') -> None:
+        if fmt not in FORMATS:
+            raise ValueError('Unknown format: {}'.format(fmt))
+        self._fp = fp
+        self._fmt = fmt
+        # For "json" and "compact": whether the object, and the "fragments" object in it, are open
+        self._started = False
+        self._in_fragments = False
+        self._fragments_written = False
+        self._separators = (',', ':') if fmt != 'json' else None
+        self._short_ids: Dict[FragmentId, FragmentId] = {}
+
+    def _rename(self, frag_id: FragmentId) -> FragmentId:
+        if self._fmt != 'compact':
+            return frag_id
+        short_id = self._short_ids.get(frag_id)
+        if short_id is None:
+            short_id = self._short_ids[frag_id] = FragmentId(_base36(len(self._short_ids)))
+        return short_id
+
+    def _dumps(self, value: Any) -> str:
+        return json.dumps(value, separators=self._separators)
+
+    def write_item(self, item: Item) -> None:
+        kind, key, value = item[:3]
+        if kind == 'fragment':
+            self.write_fragment(key, value)
+        else:
+            self.write_header(key, value)
+
+    def write_header(self, key: str, value: Any) -> None:
+        """Writes a field of the `View` other than "fragments"."""
+        if key == 'rootId':
+            value = self._rename(value)
+        elif key == 'rootIds':
+            value = {name: self._rename(frag_id) for name, frag_id in value.items()}
+        if self._fmt == 'ndjson':
+            self._fp.write(self._dumps({key: value}) + '\n')
+            return
+        self._close_fragments()
+        self._fp.write(',' if self._started else '{')
+        self._started = True
+        self._fp.write('{}:{}'.format(self._dumps(key), self._dumps(value)))
+
+    def write_fragment(self, frag_id: FragmentId, fragment: Fragment) -> None:
+        """Writes a `Fragment`. In "json" and "compact" files, they must all be written together."""
+        if self._fmt == 'compact':
+            fragment = map_child_ids(fragment, self._rename)
+        frag_id = self._rename(frag_id)
+        if self._fmt == 'ndjson':
+            self._fp.write(self._dumps({'id': frag_id, 'fragment': fragment}) + '\n')
+            return
+        if not self._in_fragments:
+            if self._fragments_written:
+                raise ValueError('All Fragments of a JSON View must be written together.')
+            self._fp.write(',' if self._started else '{')
+            self._started = True
+            self._fp.write('"fragments":{')
+            self._in_fragments = True
+            self._fragments_written = True
+        else:
+            self._fp.write(',')
+        self._fp.write('{}:{}'.format(self._dumps(frag_id), self._dumps(fragment)))
+
+    def _close_fragments(self) -> None:
+        if self._in_fragments:
+            self._fp.write('}')
+            self._in_fragments = False
+
+    def close(self) -> None:
+        """Finishes the `View`; the file itself is not closed."""
+        if self._fmt == 'ndjson':
+            return
+        if not self._fragments_written:
+            self._write_empty_fragments()
+        self._close_fragments()
+        self._fp.write('}\n' if self._started else '{}\n')
+
+    def _write_empty_fragments(self) -> None:
+        # For a `View` without `Fragment`s
+        self._fp.write(',' if self._started else '{')
+        self._started = True
+        self._fp.write('"fragments":{}')
+        self._fragments_written = True
+
+
+def _base36(n: int) -> str:
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    text = digits[n % 36]
+    n //= 36
+    while n:
+        text = digits[n % 36] + text
+        n //= 36
+    return text
+
+
+def compute_stats(items: Iterable[Item], top: int = 10) -> Dict[str, Any]:
+    """Returns statistics of a `View` from its items, holding only the `FragmentId`s, sizes and
+    references of its `Fragment`s in memory.
+
+    Returns:
+        {"numFragments", "bytes", "types": {<type>: {"count", "bytes"}},
+        "depths": {<depth>: <count>}, "unreachable": <count>,
+        "largestSubtrees": [{"id", "type", "fragments", "bytes"}]}, where
+        depths are measured from the roots, and subtrees are those of a spanning tree found
+        breadth-first from the roots, so that a `Fragment` referenced from several places is counted
+        in only one subtree.
+    """
+    types: Dict[str, Dict[str, int]] = {}
+    sizes: Dict[FragmentId, int] = {}
+    frag_types: Dict[FragmentId, str] = {}
+    children: Dict[FragmentId, List[FragmentId]] = {}
+    roots: List[FragmentId] = []
+    for kind, key, value, size in items:
+        if kind == 'header':
+            if key == 'rootId':
+                roots.insert(0, value)
+            elif key == 'rootIds':
+                roots.extend(value.values())
+            continue
+        frag_type = value.get('type', '?')
+        entry = types.setdefault(frag_type, {'count': 0, 'bytes': 0})
+        entry['count'] += 1
+        entry['bytes'] += size
+        sizes[key] = size
+        frag_types[key] = frag_type
+        child_ids = list(iter_child_ids(value))
+        if child_ids:
+            children[key] = child_ids
+
+    # Breadth-first from the roots: each `Fragment`'s depth, and its parent in the spanning tree
+    depths: Counter = Counter()
+    parents: Dict[FragmentId, Optional[FragmentId]] = {}
+    order: List[FragmentId] = []
+    queue: Deque[Tuple[FragmentId, int]] = deque()
+    for root_id in roots:
+        if root_id in sizes and root_id not in parents:
+            parents[root_id] = None
+            queue.append((root_id, 0))
+    while queue:
+        frag_id, depth = queue.popleft()
+        depths[depth] += 1
+        order.append(frag_id)
+        for child_id in children.get(frag_id, ()):
+            if child_id in sizes and child_id not in parents:
+                parents[child_id] = frag_id
+                queue.append((child_id, depth + 1))
+
+    # Accumulate subtree sizes from the deepest `Fragment`s up
+    subtree_bytes = {frag_id: sizes[frag_id] for frag_id in order}
+    subtree_counts = dict.fromkeys(order, 1)
+    for frag_id in reversed(order):
+        parent = parents[frag_id]
+        if parent is not None:
+            subtree_bytes[parent] += subtree_bytes[frag_id]
+            subtree_counts[parent] += subtree_counts[frag_id]
+    largest = heapq.nlargest(top, subtree_bytes, key=subtree_bytes.__getitem__)
+    return {
+        'numFragments': len(sizes),
+        'bytes': sum(sizes.values()),
+        'types': types,
+        'depths': dict(sorted(depths.items())),
+        'unreachable': len(sizes) - len(order),
+        'largestSubtrees': [{
+            'id': frag_id,
+            'type': frag_types[frag_id],
+            'fragments': subtree_counts[frag_id],
+            'bytes': subtree_bytes[frag_id],
+        } for frag_id in largest],
+    }
+
+
+def get_subtree_ids(items: Iterable[Item], root_id: FragmentId) -> Set[FragmentId]:
+    """Returns the `FragmentId`s of the `Fragment`s reachable from `root_id`, including itself,
+    holding only the references between `Fragment`s in memory.
+
+    Raises:
+        KeyError: If there is no `Fragment` with `FragmentId` `root_id`.
+    """
+    children: Dict[FragmentId, List[FragmentId]] = {}
+    for kind, key, value, _ in items:
+        if kind == 'fragment':
+            children[key] = list(iter_child_ids(value))
+    if root_id not in children:
+        raise KeyError(root_id)
+    reachable = {root_id}
+    stack = [root_id]
+    while stack:
+        for child_id in children.get(stack.pop(), ()):
+            if child_id not in reachable:
+                reachable.add(child_id)
+                stack.append(child_id)
+    return reachable
@@ -0,0 +1,213 @@
+"""Sampled watching of how a variable evolves, e.g., inside a hot loop.
+
+Example:
+    for step in range(1000000):
+        ...
+        watch('weights', weights, every=1000, max_rate=10)
+    flush()
+    view = timeline('weights')
+
+`watch()` is cheap enough to call on every iteration: a call which is not sampled only increments a
+counter. A sampled call takes a structural `snapshot()` of the object, so that later changes do not
+affect it, and hands it to a background thread, which assembles it. `timeline()` merges the
+assembled samples into a single `View`, whose root is a `SwitchLayout` with one mode per sample.
+
+Samples wait for the background thread on a bounded queue. When it is full, a sample is dropped
+rather than making `watch()` wait; `stats()` counts the dropped samples and those which failed.
+
+Watchers are shared by all threads. Calls from several threads may race when counting, which only
+makes sampling approximate.
+"""
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from collections import deque
+from threading import Lock, Thread
+from queue import Full, Queue
+import time
+
+from vizstack.schema import Fragment, FragmentId, JsonType, View
+from vizstack.snapshot import snapshot
+from vizstack.traversal import prefix_ids
+from vizstack.view_assembler import ViewAssembler
+
+__all__ = ['watch', 'unwatch', 'timeline', 'flush', 'stats']
+
+# The maximum number of samples waiting to be assembled, over all watchers.
+_MAX_QUEUE = 1000
+
+
+class _Watcher:
+    __slots__ = (
+        'name', 'every', 'min_interval', 'depth', 'calls', 'next_call', 'last_sample', 'history',
+        'dropped', 'failed'
+    )
+
+    def __init__(self, name: str, every: int, max_rate: Optional[float], max_history: int,
+                 depth: int) -> None:
+        self.name = name
+        self.every = every
+        self.min_interval = 1 / max_rate if max_rate else 0.0
+        self.depth = depth
+        self.calls = 0
+        # The number of calls at which the next sample is due; the first call is always sampled
+        self.next_call = 1
+        self.last_sample = float('-inf')
+        # The assembled samples, as (call number, seconds since the first sample, `View`)
+        self.history: Deque[Tuple[int, float, View]] = deque(maxlen=max_history)
+        # The number of samples dropped because the queue was full, and which failed to be assembled
+        self.dropped = 0
+        self.failed = 0
+
+
+_watchers: Dict[str, _Watcher] = {}
+_watchers_lock = Lock()
+_queue: 'Queue[Tuple[_Watcher, int, float, Any]]' = Queue(maxsize=_MAX_QUEUE)
+_counters_lock = Lock()
+_consumer: Optional[Thread] = None
+_start_time: Optional[float] = None
+
+
+def watch(name: str, obj: Any, every: int = 1, max_rate: Optional[float] = None,
+          max_history: int = 100, depth: int = 3) -> None:
+    """Records `obj` as the current value of the watched variable `name`, if a sample is due.
+
+    The options of the first call for a `name` apply until `unwatch(name)` is called.
+
+    Args:
+        name: The name of the watched variable.
+        obj: Its current value.
+        every: Sample one call in every `every` calls.
+        max_rate: The maximum number of samples per second, if any; calls which are due to be
+            sampled are skipped until enough time has passed.
+        max_history: The number of most recent samples to keep.
+        depth: The depth to which containers are copied when sampling; see `snapshot()`.
+    """
+    watcher = _watchers.get(name)
+    if watcher is None:
+        watcher = _add_watcher(name, every, max_rate, max_history, depth)
+    watcher.calls += 1
+    if watcher.calls < watcher.next_call:
+        return
+    _sample(watcher, obj)
+
+
+def _add_watcher(name: str, every: int, max_rate: Optional[float], max_history: int,
+                 depth: int) -> _Watcher:
+    if every < 1:
+        raise ValueError('Expected every >= 1, got {}.'.format(every))
+    with _watchers_lock:
+        watcher = _watchers.get(name)
+        if watcher is None:
+            watcher = _watchers[name] = _Watcher(name, every, max_rate, max_history, depth)
+    return watcher
+
+
+def _sample(watcher: _Watcher, obj: Any) -> None:
+    global _start_time
+    watcher.next_call = watcher.calls + watcher.every
+    now = time.monotonic()
+    if now - watcher.last_sample < watcher.min_interval:
+        return
+    watcher.last_sample = now
+    if _start_time is None:
+        _start_time = now
+    _ensure_consumer()
+    try:
+        # Check first, to avoid copying an object which will be dropped anyway
+        if _queue.full():
+            raise Full
+        _queue.put_nowait((watcher, watcher.calls, now - _start_time, snapshot(obj, watcher.depth)))
+    except Full:
+        with _counters_lock:
+            watcher.dropped += 1
+
+
+def _ensure_consumer() -> None:
+    global _consumer
+    if _consumer is None:
+        with _watchers_lock:
+            if _consumer is None:
+                _consumer = Thread(target=_consume, name='vizstack-watch', daemon=True)
+                _consumer.start()
+
+
+def _consume() -> None:
+    queue = _queue
+    while True:
+        watcher, call, seconds, obj = queue.get()
+        try:
+            watcher.history.append((call, seconds, ViewAssembler.assemble(obj)))
+        except Exception:
+            # A value which cannot be assembled is skipped, rather than stopping all watchers
+            with _counters_lock:
+                watcher.failed += 1
+        finally:
+            queue.task_done()
+
+
+def flush() -> None:
+    """Waits until every sample taken so far has been assembled."""
+    if _consumer is not None:
+        _queue.join()
+
+
+def unwatch(name: str) -> None:
+    """Stops watching `name` and discards its history."""
+    with _watchers_lock:
+        _watchers.pop(name, None)
+
+
+def stats(name: str) -> Dict[str, int]:
+    """Returns the counters of the watched variable `name`: "calls", "samples" (currently kept in
+    its history), "dropped" (because too many samples were waiting to be assembled) and "failed"
+    (to be assembled).
+
+    Raises:
+        KeyError: If `name` is not watched.
+    """
+    watcher = _watchers[name]
+    with _counters_lock:
+        return {
+            'calls': watcher.calls,
+            'samples': len(watcher.history),
+            'dropped': watcher.dropped,
+            'failed': watcher.failed,
+        }
+
+
+def timeline(name: str) -> View:
+    """Returns a `View` of the assembled samples of `name`, oldest first.
+
+    The root is a `SwitchLayout` with one mode per sample. Each mode is a `FlowLayout` of a caption,
+    giving the call number and time of the sample, and the sample's own `View`, whose `FragmentId`s
+    are prefixed with "<mode>:".
+
+    Raises:
+        KeyError: If `name` is not watched.
+    """
+    history = list(_watchers[name].history)
+    fragments: Dict[FragmentId, Fragment] = {}
+    modes: List[JsonType] = []
+    for i, (call, seconds, view) in enumerate(history):
+        sample = prefix_ids(view, '{}:'.format(i))
+        fragments.update(sample['fragments'])
+        mode_id = FragmentId('{}:sample'.format(i))
+        caption_id = FragmentId('{}:caption'.format(i))
+        fragments[caption_id] = {
+            'type': 'TextPrimitive',
+            'contents': {
+                'text': '{} #{} at {:.3f}s'.format(name, call, seconds), 'variant': 'caption'
+            },
+            'meta': {},
+        }
+        fragments[mode_id] = {
+            'type': 'FlowLayout',
+            'contents': {'elements': [caption_id, sample['rootId']]},
+            'meta': {},
+        }
+        modes.append(mode_id)
+    fragments[FragmentId('root')] = {
+        'type': 'SwitchLayout',
+        'contents': {'modes': modes, 'showLabels': True},
+        'meta': {},
+    }
+    return {'rootId': FragmentId('root'), 'fragments': fragments}
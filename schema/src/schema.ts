@@ -16,6 +16,11 @@
  * the aid of an "Assembler" and is ultimately used for rendering by a "Viewer". */
 export type View = {
     rootId: FragmentId;
+    /** For a `View` of several named objects, the `FragmentId` of each; `rootId` is that of the
+     * first. `Fragment`s reachable from several roots are shared between them. */
+    rootIds?: {
+        [name: string]: FragmentId;
+    };
     fragments: {
         [fragmentId: string]: Fragment; // fragmentId: FragmentId
     };
@@ -29,6 +34,10 @@ export type Fragment = PrimitiveFragment | LayoutFragment;
  * Github #123: Change ViewIds to use hash (top-down, position-based key). */
 export type FragmentId = string & { readonly brand?: unique symbol };
 
+/** A reference to a child `Fragment` in the contents of a layout which supports inlining: either
+ * its `FragmentId`, or, in a `View` assembled with inlined primitives, the `Fragment` itself. */
+export type FragmentRef = FragmentId | Fragment;
+
 /** Metadata of arbitrary values attached to a particular `Fragment`. */
 export type FragmentMeta = Record<string, any>;
 
@@ -40,7 +49,10 @@ export type PrimitiveFragment =
     | TextPrimitiveFragment
     | TokenPrimitiveFragment
     | IconPrimitiveFragment
-    | ImagePrimitiveFragment;
+    | ImagePrimitiveFragment
+    | SeriesPrimitiveFragment
+    | TablePrimitiveFragment
+    | BufferPrimitiveFragment;
 
 /** `TextPrimitive` is a single line or multiple lines of plain text. */
 export type TextPrimitiveFragment = {
@@ -49,6 +61,14 @@ export type TextPrimitiveFragment = {
         text: string;
         variant?: 'caption' | 'body' | 'subheading' | 'heading';
         emphasis?: 'normal' | 'less' | 'more';
+        /** For a large text, `text` holds only lines [start, end) of `totalLines`; further windows
+         * are fetched through the expand endpoint of the fragment server. */
+        window?: {
+            start: number;
+            end: number;
+            totalLines: number;
+            truncated: boolean;
+        };
     };
     meta: FragmentMeta;
 };
@@ -92,6 +112,68 @@ export type ImagePrimitiveFragment = {
 };
 // TODO: Is this best? What about URL? Constructed plot/matrix?
 
+/** `SeriesPrimitive` is a line chart of a numeric series, downsampled to a bounded number of
+ * points. `points` is a base64 string of little-endian float64 (x, y) pairs for the indices
+ * [start, end) of a series of `length` values; `method` is set if the points were downsampled.
+ * Other windows are fetched through the expand endpoint of the fragment server. */
+export type SeriesPrimitiveFragment = {
+    type: 'SeriesPrimitive';
+    contents: {
+        points: string;
+        numPoints: number;
+        start: number;
+        end: number;
+        length: number;
+        method?: 'lttb' | 'minmax';
+    };
+    meta: FragmentMeta;
+};
+
+/** `TablePrimitive` is a table of `length` rows, of which only rows [start, end) are included.
+ * `data` holds one array of formatted values per column. Other windows, optionally sorted and
+ * filtered, are fetched through the expand endpoint of the fragment server; their `numRows` counts
+ * the filtered rows and `rows` holds the original index of each row. */
+export type TablePrimitiveFragment = {
+    type: 'TablePrimitive';
+    contents: {
+        columns: {
+            name: string;
+            type: 'number' | 'string' | 'boolean' | 'other';
+        }[];
+        data: string[][];
+        start: number;
+        end: number;
+        numRows: number;
+        length: number;
+        rows?: number[];
+    };
+    meta: FragmentMeta;
+};
+
+/** `BufferPrimitive` is a hexdump of a binary buffer of `length` bytes, of which only a window at
+ * the start and, for long buffers, one at the end are included. Each window covers bytes
+ * [start, end) as a hex string; buffers of typed items (e.g. `format` "d" for float64) also include
+ * the items' values, or null if they cannot be decoded. Other windows are fetched through the
+ * expand endpoint of the fragment server. */
+export type BufferPrimitiveFragment = {
+    type: 'BufferPrimitive';
+    contents: {
+        length: number;
+        format: string;
+        itemSize: number;
+        head: BufferWindow;
+        tail?: BufferWindow;
+    };
+    meta: FragmentMeta;
+};
+
+export type BufferWindow = {
+    start: number;
+    end: number;
+    hex: string;
+    values?: (number | boolean | string)[] | null;
+};
+
 // =================================================================================================
 // Layouts (i.e. configurations with slots).
 
@@ -109,7 +191,8 @@ export type LayoutFragment =
 export type FlowLayoutFragment = {
     type: 'FlowLayout';
     contents: {
-        elements: FragmentId[];
+        elements: FragmentRef[];
+        stream?: StreamInfo;
     };
     meta: FragmentMeta;
 };
@@ -130,7 +213,8 @@ export type GridLayoutFragment = {
     type: 'GridLayout';
     contents: {
         cells: {
-            fragmentId: FragmentId;
+            fragmentId?: FragmentId;
+            fragment?: Fragment; // Inlined instead of `fragmentId`.
             col: number;
             row: number;
             width: number;
@@ -147,20 +231,32 @@ export type GridLayoutFragment = {
 export type SequenceLayoutFragment = {
     type: 'SequenceLayout';
     contents: {
-        elements: FragmentId[];
+        elements: FragmentRef[];
         orientation?: 'horizontal' | 'vertical';
         startMotif?: string;
         endMotif?: string;
         showLabels?: boolean;
+        stream?: StreamInfo;
     };
     meta: FragmentMeta;
 };
 
+/** How the elements of a layout built from an iterator were chosen. */
+export type StreamInfo = {
+    sampling: 'head' | 'head_tail' | 'reservoir';
+    /** The number of elements pulled from the iterator. */
+    consumed: number;
+    /** Whether the iterator ended; if not, it has more elements than were pulled. */
+    exhausted: boolean;
+    /** The original positions of the elements, when they are not simply the first ones. */
+    indices?: number[];
+};
+
 /** `KeyValueLayout` shows an ordered sequence of key-value pairs. */
 export type KeyValueLayoutFragment = {
     type: 'KeyValueLayout';
     contents: {
-        entries: { key: FragmentId; value: FragmentId }[];
+        entries: { key: FragmentRef; value: FragmentRef }[];
         separator?: string;
         startMotif?: string;
         endMotif?: string;
@@ -173,7 +269,8 @@ export type KeyValueLayoutFragment = {
 /** `DagLayout` arranges its elements in a directed acyclic graph. */
 export type DagNodeId = string & { readonly brand?: unique symbol };
 export type DagNode = {
-    fragmentId: FragmentId;
+    fragmentId?: FragmentId;
+    fragment?: Fragment; // Inlined instead of `fragmentId`.
     children: DagNodeId[];
     label?: string;
     flowDirection?: 'north' | 'south' | 'east' | 'west';